@@ -0,0 +1,42 @@
+"""add_leave_balance_ledger
+
+Revision ID: 3f9a1c7e2b40
+Revises: 6b0e7abdc55b
+Create Date: 2026-10-18 09:12:41.318204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3f9a1c7e2b40'
+down_revision: Union[str, Sequence[str], None] = '6b0e7abdc55b'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('leave_balances',
+    sa.Column('employeeId', sa.Uuid(), nullable=False),
+    sa.Column('financialYearId', sa.Integer(), nullable=False),
+    sa.Column('leaveTypeId', sa.Integer(), nullable=False),
+    sa.Column('allotted', sa.Numeric(precision=6, scale=1), nullable=False),
+    sa.Column('used', sa.Numeric(precision=6, scale=1), nullable=False),
+    sa.Column('pending', sa.Numeric(precision=6, scale=1), nullable=False),
+    sa.Column('available', sa.Numeric(precision=6, scale=1), nullable=False),
+    sa.ForeignKeyConstraint(['employeeId'], ['employees.employeeId'], ),
+    sa.PrimaryKeyConstraint('employeeId', 'financialYearId', 'leaveTypeId')
+    )
+    op.add_column('leaves', sa.Column('leaveDays', sa.Numeric(precision=5, scale=1), nullable=True))
+    # Filled from the leave history (costing leaveDays on the way) by
+    # `python -m app.commands.rebuild_leave_balances --if-empty` in prestart.sh
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('leaves', 'leaveDays')
+    op.drop_table('leave_balances')
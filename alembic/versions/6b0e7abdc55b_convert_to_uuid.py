@@ -4,6 +4,9 @@ Revision ID: 6b0e7abdc55b
 Revises: 
 Create Date: 2026-02-09 15:15:07.923417
 
+Replaces the pre-UUID employees and leaves tables (their rows are not
+carried over) and creates employees, leaves and holidays.
+
 """
 from typing import Sequence, Union
 
@@ -20,16 +23,77 @@ depends_on: Union[str, Sequence[str], None] = None
 
 def upgrade() -> None:
     """Upgrade schema."""
-    # ### commands auto generated by Alembic - please adjust! ###
-    op.drop_index(op.f('ix_leaves_id'), table_name='leaves')
-    op.drop_table('leaves')
-    op.drop_index(op.f('ix_employees_employeeId'), table_name='employees')
-    op.drop_table('employees')
-    # ### end Alembic commands ###
+    # Drop the tables of the schema before this revision, where they exist,
+    # and create the core tables the later revisions build on: an empty
+    # database comes out of `alembic upgrade head` complete.
+    existing = set(sa.inspect(op.get_bind()).get_table_names())
+    if 'leaves' in existing:
+        op.drop_index(op.f('ix_leaves_id'), table_name='leaves')
+        op.drop_table('leaves')
+    if 'employees' in existing:
+        op.drop_index(op.f('ix_employees_employeeId'), table_name='employees')
+        op.drop_table('employees')
+    if 'holidays' in existing:
+        op.drop_index(op.f('ix_holidays_hrholidayId'), table_name='holidays')
+        op.drop_table('holidays')
+
+    op.create_table('employees',
+    sa.Column('employeeId', sa.Uuid(), nullable=False),
+    sa.Column('email', sa.String(length=255), nullable=False),
+    sa.Column('hashed_password', sa.String(length=255), nullable=False),
+    sa.Column('firstName', sa.String(length=100), nullable=True),
+    sa.Column('lastName', sa.String(length=100), nullable=True),
+    sa.Column('mobileNo', sa.String(length=20), nullable=True),
+    sa.Column('centerId', sa.Integer(), nullable=True),
+    sa.Column('department', sa.String(length=100), nullable=True),
+    sa.Column('designation', sa.String(length=100), nullable=True),
+    sa.Column('onBoardingStatus', sa.String(length=50), nullable=True),
+    sa.Column('roles', sa.JSON(), nullable=True),
+    sa.Column('reportingOfficerId', sa.Uuid(), nullable=True),
+    sa.ForeignKeyConstraint(['reportingOfficerId'], ['employees.employeeId'], ),
+    sa.PrimaryKeyConstraint('employeeId')
+    )
+    op.create_index(op.f('ix_employees_email'), 'employees', ['email'], unique=True)
+    op.create_index(op.f('ix_employees_employeeId'), 'employees', ['employeeId'], unique=False)
+    op.create_table('leaves',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('employeeId', sa.Uuid(), nullable=True),
+    sa.Column('leaveTypeId', sa.Integer(), nullable=True),
+    sa.Column('fromDate', sa.Date(), nullable=False),
+    sa.Column('toDate', sa.Date(), nullable=True),
+    sa.Column('leaveSession', sa.String(length=20), nullable=True),
+    sa.Column('reason', sa.Text(), nullable=True),
+    sa.Column('status', sa.String(length=20), nullable=True),
+    sa.Column('financialYearId', sa.Integer(), nullable=True),
+    sa.Column('approvedBy', sa.Uuid(), nullable=True),
+    sa.Column('approvalComments', sa.String(length=255), nullable=True),
+    sa.ForeignKeyConstraint(['approvedBy'], ['employees.employeeId'], ),
+    sa.ForeignKeyConstraint(['employeeId'], ['employees.employeeId'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_leaves_id'), 'leaves', ['id'], unique=False)
+    op.create_table('holidays',
+    sa.Column('hrholidayId', sa.Integer(), nullable=False),
+    sa.Column('holidayName', sa.String(length=100), nullable=False),
+    sa.Column('holidayDate', sa.Date(), nullable=False),
+    sa.Column('holidayType', sa.String(length=50), nullable=True),
+    sa.Column('isActive', sa.Boolean(), nullable=True),
+    sa.Column('centerId', sa.Integer(), nullable=True),
+    sa.Column('stateId', sa.Integer(), nullable=True),
+    sa.PrimaryKeyConstraint('hrholidayId')
+    )
+    op.create_index(op.f('ix_holidays_hrholidayId'), 'holidays', ['hrholidayId'], unique=False)
 
 
 def downgrade() -> None:
     """Downgrade schema."""
+    op.drop_index(op.f('ix_holidays_hrholidayId'), table_name='holidays')
+    op.drop_table('holidays')
+    op.drop_index(op.f('ix_leaves_id'), table_name='leaves')
+    op.drop_table('leaves')
+    op.drop_index(op.f('ix_employees_employeeId'), table_name='employees')
+    op.drop_index(op.f('ix_employees_email'), table_name='employees')
+    op.drop_table('employees')
     # ### commands auto generated by Alembic - please adjust! ###
     op.create_table('employees',
     sa.Column('employeeId', mssql.UNIQUEIDENTIFIER(), autoincrement=False, nullable=False),
@@ -0,0 +1,51 @@
+"""add_hot_query_indexes
+
+Revision ID: a4d27e5b9c13
+Revises: 3f9a1c7e2b40
+Create Date: 2026-10-18 10:03:17.552871
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a4d27e5b9c13'
+down_revision: Union[str, Sequence[str], None] = '3f9a1c7e2b40'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # get_pending_by_manager / cancel_leave; covering on SQL Server
+    op.create_index(
+        'ix_leaves_employeeId_status',
+        'leaves',
+        ['employeeId', 'status'],
+        unique=False,
+        mssql_include=['leaveTypeId', 'fromDate', 'toDate', 'leaveDays'],
+    )
+    # dashboard overall status
+    op.create_index(
+        'ix_leaves_status_fromDate_toDate',
+        'leaves',
+        ['status', 'fromDate', 'toDate'],
+        unique=False,
+    )
+    # manager -> direct reports
+    op.create_index(
+        op.f('ix_employees_reportingOfficerId'),
+        'employees',
+        ['reportingOfficerId'],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_employees_reportingOfficerId'), table_name='employees')
+    op.drop_index('ix_leaves_status_fromDate_toDate', table_name='leaves')
+    op.drop_index('ix_leaves_employeeId_status', table_name='leaves')
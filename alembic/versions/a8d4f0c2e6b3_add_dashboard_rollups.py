@@ -0,0 +1,66 @@
+"""add_dashboard_rollups
+
+Revision ID: a8d4f0c2e6b3
+Revises: f2c6a8e4b1d7
+Create Date: 2026-10-18 17:41:52.308417
+
+The rollup tables start empty: prestart.sh fills them from existing data
+with `python -m app.commands.reconcile_rollups --if-empty` after upgrading.
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a8d4f0c2e6b3'
+down_revision: Union[str, Sequence[str], None] = 'f2c6a8e4b1d7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('leaves', sa.Column('submittedAt', sa.DateTime(), nullable=True))
+    op.add_column('leaves', sa.Column('decidedAt', sa.DateTime(), nullable=True))
+    op.create_table('leave_daily_rollups',
+    sa.Column('month', sa.Integer(), nullable=False),
+    sa.Column('department', sa.String(length=100), nullable=False),
+    sa.Column('leaveTypeId', sa.Integer(), nullable=False),
+    sa.Column('day', sa.Date(), nullable=False),
+    sa.Column('pending', sa.Integer(), nullable=False),
+    sa.Column('approved', sa.Integer(), nullable=False),
+    sa.Column('rejected', sa.Integer(), nullable=False),
+    sa.Column('cancelled', sa.Integer(), nullable=False),
+    sa.Column('approvedDays', sa.Numeric(precision=9, scale=1), nullable=False),
+    sa.PrimaryKeyConstraint('month', 'department', 'leaveTypeId', 'day'),
+    sqlite_with_rowid=False
+    )
+    op.create_table('approval_daily_rollups',
+    sa.Column('month', sa.Integer(), nullable=False),
+    sa.Column('department', sa.String(length=100), nullable=False),
+    sa.Column('day', sa.Date(), nullable=False),
+    sa.Column('decisions', sa.Integer(), nullable=False),
+    sa.Column('approvals', sa.Integer(), nullable=False),
+    sa.Column('timedDecisions', sa.Integer(), nullable=False),
+    sa.Column('turnaroundMinutes', sa.Integer(), nullable=False),
+    sa.Column('decidedWithinDay', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('month', 'department', 'day'),
+    sqlite_with_rowid=False
+    )
+    op.create_table('department_headcounts',
+    sa.Column('department', sa.String(length=100), nullable=False),
+    sa.Column('employees', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('department')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('department_headcounts')
+    op.drop_table('approval_daily_rollups')
+    op.drop_table('leave_daily_rollups')
+    op.drop_column('leaves', 'decidedAt')
+    op.drop_column('leaves', 'submittedAt')
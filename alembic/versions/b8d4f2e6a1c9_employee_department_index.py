@@ -0,0 +1,31 @@
+"""employee_department_index
+
+Revision ID: b8d4f2e6a1c9
+Revises: e5b2d8f1a6c4
+Create Date: 2026-10-18 13:05:42.118204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b8d4f2e6a1c9'
+down_revision: Union[str, Sequence[str], None] = 'e5b2d8f1a6c4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Team availability by department seeks the department's members first
+    op.create_index(
+        op.f('ix_employees_department'), 'employees', ['department'], unique=False
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_employees_department'), table_name='employees')
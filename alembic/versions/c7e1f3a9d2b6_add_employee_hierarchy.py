@@ -0,0 +1,44 @@
+"""add_employee_hierarchy
+
+Revision ID: c7e1f3a9d2b6
+Revises: a4d27e5b9c13
+Create Date: 2026-10-18 11:02:45.190337
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c7e1f3a9d2b6'
+down_revision: Union[str, Sequence[str], None] = 'a4d27e5b9c13'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('employee_hierarchy',
+    sa.Column('ancestorId', sa.Uuid(), nullable=False),
+    sa.Column('descendantId', sa.Uuid(), nullable=False),
+    sa.Column('depth', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['ancestorId'], ['employees.employeeId'], ),
+    sa.ForeignKeyConstraint(['descendantId'], ['employees.employeeId'], ),
+    sa.PrimaryKeyConstraint('ancestorId', 'descendantId')
+    )
+    op.create_index(
+        'ix_employee_hierarchy_descendantId',
+        'employee_hierarchy',
+        ['descendantId', 'ancestorId', 'depth'],
+        unique=False,
+    )
+    # Filled from reportingOfficerId by
+    # `python -m app.commands.rebuild_employee_hierarchy --if-empty` in prestart.sh
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_employee_hierarchy_descendantId', table_name='employee_hierarchy')
+    op.drop_table('employee_hierarchy')
@@ -0,0 +1,47 @@
+"""add_outbox_events
+
+Revision ID: d3a7c9e1f5b2
+Revises: b8d4f2e6a1c9
+Create Date: 2026-10-18 14:22:05.530917
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd3a7c9e1f5b2'
+down_revision: Union[str, Sequence[str], None] = 'b8d4f2e6a1c9'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('outbox_events',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('eventType', sa.String(length=50), nullable=False),
+    sa.Column('aggregateId', sa.Integer(), nullable=False),
+    sa.Column('payload', sa.JSON(), nullable=False),
+    sa.Column('createdAt', sa.DateTime(), nullable=False),
+    sa.Column('status', sa.String(length=20), nullable=False),
+    sa.Column('availableAt', sa.DateTime(), nullable=False),
+    sa.Column('attempts', sa.Integer(), nullable=False),
+    sa.Column('lastError', sa.Text(), nullable=True),
+    sa.Column('sentAt', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(
+        'ix_outbox_events_status_availableAt',
+        'outbox_events',
+        ['status', 'availableAt'],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_outbox_events_status_availableAt', table_name='outbox_events')
+    op.drop_table('outbox_events')
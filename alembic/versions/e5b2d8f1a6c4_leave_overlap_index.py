@@ -0,0 +1,43 @@
+"""leave_overlap_index
+
+Revision ID: e5b2d8f1a6c4
+Revises: c7e1f3a9d2b6
+Create Date: 2026-10-18 11:41:09.627315
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e5b2d8f1a6c4'
+down_revision: Union[str, Sequence[str], None] = 'c7e1f3a9d2b6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Same leading columns, plus fromDate for the overlap check on submission
+    op.drop_index('ix_leaves_employeeId_status', table_name='leaves')
+    op.create_index(
+        'ix_leaves_employeeId_status_fromDate',
+        'leaves',
+        ['employeeId', 'status', 'fromDate'],
+        unique=False,
+        mssql_include=['leaveTypeId', 'toDate', 'leaveSession', 'leaveDays'],
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_leaves_employeeId_status_fromDate', table_name='leaves')
+    op.create_index(
+        'ix_leaves_employeeId_status',
+        'leaves',
+        ['employeeId', 'status'],
+        unique=False,
+        mssql_include=['leaveTypeId', 'fromDate', 'toDate', 'leaveDays'],
+    )
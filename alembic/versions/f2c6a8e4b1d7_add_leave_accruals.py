@@ -0,0 +1,57 @@
+"""add_leave_accruals
+
+Revision ID: f2c6a8e4b1d7
+Revises: d3a7c9e1f5b2
+Create Date: 2026-10-18 15:03:27.114862
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f2c6a8e4b1d7'
+down_revision: Union[str, Sequence[str], None] = 'd3a7c9e1f5b2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('leave_accruals',
+    sa.Column('kind', sa.String(length=20), nullable=False),
+    sa.Column('period', sa.Integer(), nullable=False),
+    sa.Column('employeeId', sa.Uuid(), nullable=False),
+    sa.Column('leaveTypeId', sa.Integer(), nullable=False),
+    sa.Column('financialYearId', sa.Integer(), nullable=False),
+    sa.Column('days', sa.Numeric(precision=6, scale=1), nullable=False),
+    sa.Column('runId', sa.String(length=32), nullable=False),
+    sa.Column('postedAt', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['employeeId'], ['employees.employeeId'], ),
+    sa.PrimaryKeyConstraint('kind', 'period', 'employeeId', 'leaveTypeId')
+    )
+    op.create_index(
+        'ix_leave_accruals_employeeId_financialYearId',
+        'leave_accruals',
+        ['employeeId', 'financialYearId', 'leaveTypeId'],
+        unique=False,
+    )
+    op.create_table('batch_checkpoints',
+    sa.Column('job', sa.String(length=100), nullable=False),
+    sa.Column('lastEmployeeId', sa.Uuid(), nullable=True),
+    sa.Column('employees', sa.Integer(), nullable=False),
+    sa.Column('postings', sa.Integer(), nullable=False),
+    sa.Column('startedAt', sa.DateTime(), nullable=False),
+    sa.Column('updatedAt', sa.DateTime(), nullable=False),
+    sa.Column('finishedAt', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('job')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('batch_checkpoints')
+    op.drop_index('ix_leave_accruals_employeeId_financialYearId', table_name='leave_accruals')
+    op.drop_table('leave_accruals')
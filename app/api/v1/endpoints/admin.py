@@ -0,0 +1,55 @@
+from typing import Optional
+from fastapi import APIRouter, Depends, Query
+from app.core.export import export_response
+from app.crud.crud_employee import employee_crud
+from app.crud.crud_leave import crud_leave
+from app.db.session import pool_stats
+from app.schemas.auth import ApiResponse
+from app.api.v1.endpoints.auth import get_current_admin, get_streaming_admin
+from app.models.employee import Employee
+from app.models.leave import LeaveRequest
+
+router = APIRouter()
+
+
+@router.get("/Pool", response_model=ApiResponse)
+def get_pool_stats(current_admin: Employee = Depends(get_current_admin)):
+    """
+    Connection pool telemetry of this worker process: live checked-out and
+    idle connections, checkout wait histogram, overflow connects and timeouts.
+    """
+    return ApiResponse(succeeded=True, data=pool_stats())
+
+
+@router.get("/Export/Leaves")
+def export_leaves(
+    format: str = Query("csv", pattern="^(csv|ndjson)$"),
+    financialYearId: Optional[int] = None,
+    department: Optional[str] = None,
+    centerId: Optional[int] = None,
+    gzip: bool = False,
+    current_admin: Employee = Depends(get_streaming_admin),
+):
+    """
+    Every leave request matching the filters, with the employee's name,
+    department and center, streamed as a CSV or NDJSON download (see
+    app.core.export). gzip=true compresses it on the fly.
+    """
+    statement = crud_leave.export_query(
+        financial_year=financialYearId, department=department, center_id=centerId
+    )
+    filename = f"leaves-{financialYearId}" if financialYearId is not None else "leaves"
+    return export_response(statement, LeaveRequest.id, format, filename, compress=gzip)
+
+
+@router.get("/Export/Employees")
+def export_employees(
+    format: str = Query("csv", pattern="^(csv|ndjson)$"),
+    department: Optional[str] = None,
+    centerId: Optional[int] = None,
+    gzip: bool = False,
+    current_admin: Employee = Depends(get_streaming_admin),
+):
+    """The employee roster (without credentials), as /Export/Leaves."""
+    statement = employee_crud.export_query(department=department, center_id=centerId)
+    return export_response(statement, Employee.employeeId, format, "employees", compress=gzip)
@@ -1,10 +1,22 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from typing import Optional, Tuple
+from uuid import UUID
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
+from starlette.concurrency import run_in_threadpool
 from jose import jwt, JWTError
-from app.db.session import get_db
+from app.db.session import get_async_db, get_db
 from app.models.employee import Employee
-from app.core.security import create_access_token, verify_password, get_password_hash
+from app.core.security import (
+    create_access_token,
+    get_password_hash_async,
+    password_needs_rehash,
+    verify_password_async,
+)
+from app.core.rate_limit import check_login
+from app.core.token_cache import EmployeeSnapshot, token_cache
 from app.schemas.auth import ApiResponse, LoginRequest, TokenData
 from app.schemas.employee import EmployeeCreate
 from app.core.config import settings
@@ -16,14 +28,30 @@ oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/v1.0/Account/login")
 router = APIRouter()
 
 
-def get_current_user(
-    db: Session = Depends(get_db), token: str = Depends(oauth2_scheme)
-) -> Employee:
-    credentials_exception = HTTPException(
+def _credentials_exception() -> HTTPException:
+    return HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
+
+
+def _get_cached_user(token: str) -> Tuple[Optional[EmployeeSnapshot], Optional[str]]:
+    """Return (cached user or None, jti) for a bearer token."""
+    try:
+        # Reading the jti is only base64 + JSON; the signature is checked on a miss.
+        jti = jwt.get_unverified_claims(token).get("jti")
+    except JWTError as exc:
+        raise _credentials_exception() from exc
+
+    if jti:
+        cached = token_cache.get(jti, token)
+        if cached is not None:
+            return cached.user, jti
+    return None, jti
+
+
+def _decode_token(token: str) -> Tuple[dict, TokenData, UUID]:
     try:
         payload = jwt.decode(
             token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM]
@@ -32,37 +60,82 @@ def get_current_user(
         uid = payload.get("uid")
         roles = payload.get("roles", [])
 
-        print("gcu: payload:", payload)  # Debugging line to check the decoded token
-        print("gcu: email:", email)  # Debugging line to check the email claim
-        print("gcu: uid:", uid)  # Debugging line to check the uid claim
-
         if (email is None) or (uid is None):
-            raise credentials_exception
+            raise _credentials_exception()
 
         token_data = TokenData(email=email, uid=uid, roles=roles)
-        print(
-            "gcu: token_data:", token_data
-        )  # Debugging line to check the TokenData object
-    except JWTError as exc:
-        raise credentials_exception from exc
+        return payload, token_data, UUID(token_data.uid)
+    except (JWTError, ValueError) as exc:
+        raise _credentials_exception() from exc
 
-    user = db.query(Employee).filter(Employee.employeeId == token_data.uid).first()
-    print(
-        "gcu: user from DB:", user
-    )  # Debugging line to check the user fetched from DB
+
+def _remember_user(
+    jti: Optional[str],
+    token: str,
+    payload: dict,
+    token_data: TokenData,
+    user: Employee,
+    generation: int,
+) -> EmployeeSnapshot:
     if user is None:
-        raise credentials_exception
+        raise _credentials_exception()
 
-    # We attach the roles from the token to the user object temporarily
-    # so downstream routes can check them without another DB query.
-    user.current_roles = token_data.roles
-    return user
+    # We attach the roles from the token to the snapshot so downstream
+    # routes can check them without another DB query.
+    snapshot = EmployeeSnapshot.from_employee(user, current_roles=token_data.roles)
+    if jti:
+        token_cache.put(jti, token, payload, snapshot, generation=generation)
+    return snapshot
 
 
-def get_current_admin(current_user: Employee = Depends(get_current_user)) -> Employee:
-    """
-    Ensures the authenticated user has HR Admin or SuperAdmin roles.
-    """
+def get_current_user(
+    db: Session = Depends(get_db), token: str = Depends(oauth2_scheme)
+) -> EmployeeSnapshot:
+    cached, jti = _get_cached_user(token)
+    if cached is not None:
+        return cached
+
+    payload, token_data, employee_id = _decode_token(token)
+    # Read before the employee: an update committed after the load is not cached
+    generation = token_cache.generation(employee_id)
+    user = db.query(Employee).filter(Employee.employeeId == employee_id).first()
+    return _remember_user(jti, token, payload, token_data, user, generation)
+
+
+async def get_current_user_async(
+    db: AsyncSession = Depends(get_async_db), token: str = Depends(oauth2_scheme)
+) -> EmployeeSnapshot:
+    """Same as get_current_user, for routers served by the async engine."""
+    cached, jti = _get_cached_user(token)
+    if cached is not None:
+        return cached
+
+    payload, token_data, employee_id = _decode_token(token)
+    generation = token_cache.generation(employee_id)
+    user = await db.scalar(select(Employee).where(Employee.employeeId == employee_id))
+    return _remember_user(jti, token, payload, token_data, user, generation)
+
+
+# A streamed response is sent after the endpoint function returns, and the
+# request-scoped get_db session would keep its pooled connection until the
+# last byte. Endpoints that may stream authenticate on a session closed when
+# the function returns; the stream opens its own (app.core.pagination).
+def get_streaming_user(
+    db: Session = Depends(get_db, scope="function"), token: str = Depends(oauth2_scheme)
+) -> EmployeeSnapshot:
+    """get_current_user for endpoints that may return a StreamingResponse."""
+    return get_current_user(db, token)
+
+
+async def get_streaming_user_async(
+    db: AsyncSession = Depends(get_async_db, scope="function"),
+    token: str = Depends(oauth2_scheme),
+) -> EmployeeSnapshot:
+    """get_streaming_user for routers served by the async engine."""
+    return await get_current_user_async(db, token)
+
+
+def _require_admin(current_user: EmployeeSnapshot) -> EmployeeSnapshot:
     admin_roles = {"SuperAdmin"}
     user_roles = set(getattr(current_user, "current_roles", []))
 
@@ -74,22 +147,69 @@ def get_current_admin(current_user: Employee = Depends(get_current_user)) -> Emp
     return current_user
 
 
+def get_current_admin(
+    current_user: EmployeeSnapshot = Depends(get_current_user),
+) -> EmployeeSnapshot:
+    """
+    Ensures the authenticated user has HR Admin or SuperAdmin roles.
+    """
+    return _require_admin(current_user)
+
+
+def get_streaming_admin(
+    current_user: EmployeeSnapshot = Depends(get_streaming_user),
+) -> EmployeeSnapshot:
+    """get_current_admin for endpoints that return a StreamingResponse."""
+    return _require_admin(current_user)
+
+
+async def get_current_admin_async(
+    current_user: EmployeeSnapshot = Depends(get_current_user_async),
+) -> EmployeeSnapshot:
+    """get_current_admin for routers served by the async engine."""
+    return _require_admin(current_user)
+
+
 @router.post("/login")
-def login(
+async def login(
     # Use OAuth2PasswordRequestForm to support the Swagger "Authorize" box
     # It will extract 'username' (email) and 'password' from the form data
+    request: Request,
     form_data: OAuth2PasswordRequestForm = Depends(),
     db: Session = Depends(get_db),
 ):
-    # 1. Look up user by email (OAuth2 uses 'username' field for the email)
-    user = db.query(Employee).filter(Employee.email == form_data.username).first()
+    # 1. Admission (429 via RateLimited), then look up user by email (OAuth2
+    # uses 'username' field for the email); one threadpool hop for both, as
+    # a file-backed limiter does blocking I/O
+    def _admit_and_lookup():
+        check_login(request.client.host if request.client else None, form_data.username)
+        user = db.query(Employee).filter(Employee.email == form_data.username).first()
+        # Return the connection to the pool before the bcrypt wait: a login
+        # storm would otherwise hold every pooled connection while queued
+        db.close()
+        return user
+
+    user = await run_in_threadpool(_admit_and_lookup)
 
-    # 2. Verify password
-    if not user or not verify_password(form_data.password, user.hashed_password):
+    # 2. Verify password on the bcrypt pool (503 via PasswordHashingBusy if saturated)
+    if not user or not await verify_password_async(
+        form_data.password, user.hashed_password
+    ):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid email or password"
         )
 
+    # Bulk-imported temporary passwords may use a cheaper bcrypt cost
+    if password_needs_rehash(user.hashed_password):
+        user.hashed_password = await get_password_hash_async(form_data.password)
+
+        def _store_rehash():
+            db.add(user)
+            db.commit()
+            db.refresh(user)
+
+        await run_in_threadpool(_store_rehash)
+
     # 3. Create Token Payload
     token_payload = {
         "email": user.email,  # 'sub' is the standard JWT field for subject
@@ -127,6 +247,12 @@ def login(
     }
 
 
+@router.get("/TokenCacheStats", response_model=ApiResponse)
+def get_token_cache_stats(current_admin: Employee = Depends(get_current_admin)):
+    """Admin-only: hit/miss counters of the verified-token cache."""
+    return ApiResponse(succeeded=True, data=token_cache.stats())
+
+
 @router.post("/superAdmin/setup", response_model=ApiResponse)
 def admin_signup(payload: EmployeeCreate, db: Session = Depends(get_db)):
     # 1. Check if ANY SuperAdmin already exists
@@ -0,0 +1,53 @@
+from fastapi import APIRouter, Depends
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.db.session import get_async_db
+from app.api.v1.endpoints.auth import get_current_user_async
+from app.crud.crud_dashboard import async_crud_dashboard
+from app.models.employee import Employee
+
+# Async twin of dashboard.py, mounted instead of it when DB_ASYNC_MODE is on.
+router = APIRouter()
+
+
+# 3.9.1 Get HR Dashboard Overall Status
+@router.get("/overallstatus", response_model=dict)
+async def get_overall_status(
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Employee = Depends(get_current_user_async),
+):
+    """Get high-level HR metrics for dashboard display."""
+    # One aggregated round trip, shared between pollers for a few seconds
+    status = await async_crud_dashboard.get_overall_status(db)
+
+    return {
+        "data": {
+            "totalEmployees": status["totalEmployees"],
+            "activeEmployees": status["activeEmployees"],
+            "onLeaveToday": status["onLeaveToday"],
+            "pendingLeaveRequests": status["pendingLeaveRequests"],
+            "pendingWFHRequests": 10,  # Placeholder for WFH module logic
+            "pendingTravelClaims": 8,  # Placeholder for Travel module logic
+            "newApplications": 5,  # Placeholder for Recruitment module logic
+            "pendingOnboarding": 3,  # Placeholder
+            "asOf": status["asOf"],  # When the counts were read
+        },
+        "succeeded": True,
+    }
+
+
+# 3.9.2 Get HR Dashboard Summary
+@router.get("/summary", response_model=dict)
+async def get_dashboard_summary(
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Employee = Depends(get_current_user_async),
+):
+    """Get detailed HR analytics including trends and statistics."""
+    summary = await async_crud_dashboard.get_summary(db)
+
+    return {
+        "data": {
+            **summary,
+            "message": "Comprehensive analytics retrieved",
+        },
+        "succeeded": True,
+    }
@@ -1,8 +1,23 @@
-from fastapi import APIRouter, Depends, HTTPException
+import uuid
+from typing import List, Set, Tuple, Union
+from uuid import UUID
+from fastapi import APIRouter, Depends, HTTPException, Request
+from pydantic import ValidationError
 from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+from app.core.config import settings
+from app.core.record_stream import format_for_content_type, iter_records
+from app.core.security import PasswordHashingBusy, hash_passwords_async
 from app.db.session import get_db
 from app.crud.crud_employee import employee_crud
-from app.schemas.employee import EmployeeCreate, EmployeeUpdate
+from app.crud.crud_hierarchy import ReportingCycleError, crud_hierarchy
+from app.schemas.employee import (
+    BulkImportReport,
+    BulkImportRow,
+    EmployeeBase,
+    EmployeeCreate,
+    EmployeeUpdate,
+)
 from app.schemas.auth import ApiResponse
 from app.api.v1.endpoints.auth import get_current_user, get_current_admin
 from app.models.employee import Employee
@@ -34,9 +49,140 @@ def create_new_employee(
     )
 
 
+@router.post("/BulkImport", response_model=ApiResponse[BulkImportReport])
+async def bulk_import_employees(
+    request: Request,
+    db: Session = Depends(get_db),
+    current_admin: Employee = Depends(get_current_admin)
+):
+    """
+    Admin-only: create employees from a streamed CSV (text/csv, header row,
+    roles separated by ';') or NDJSON (application/x-ndjson) body.
+
+    Rows are validated with EmployeeCreate and committed in batches of
+    BULK_IMPORT_BATCH_SIZE, so a failed row never blocks the others. The
+    report lists the outcome of every line. When password hashing is
+    saturated, the rows of the batch it refused are reported "retryable"
+    rather than failing the import after earlier batches were committed.
+    """
+    fmt = format_for_content_type(request.headers.get("content-type"))
+    if fmt is None:
+        raise HTTPException(
+            status_code=415,
+            detail="Send text/csv or application/x-ndjson",
+        )
+
+    report = BulkImportReport()
+    seen: Set[str] = set()
+    batch = []
+    async for line, record in iter_records(request.stream(), fmt):
+        batch.append((line, record))
+        if len(batch) >= settings.BULK_IMPORT_BATCH_SIZE:
+            await _import_batch(db, batch, seen, report)
+            batch = []
+    await _import_batch(db, batch, seen, report)
+
+    return ApiResponse(
+        succeeded=True,
+        message=(
+            f"{report.created} created, {report.duplicates} duplicates, "
+            f"{report.invalid} invalid, {report.retryable} to retry."
+        ),
+        data=report,
+    )
+
+
+async def _import_batch(
+    db: Session,
+    batch: List[Tuple[int, Union[dict, str]]],
+    seen: Set[str],
+    report: BulkImportReport,
+):
+    results = []
+    valid = []
+    for line, record in batch:
+        if isinstance(record, str):
+            results.append(BulkImportRow(line=line, status="invalid", errors=[record]))
+            continue
+        try:
+            employee_in = EmployeeCreate.model_validate(record)
+        except ValidationError as exc:
+            errors = [
+                f"{'.'.join(str(p) for p in err['loc'])}: {err['msg']}"
+                for err in exc.errors()
+            ]
+            results.append(
+                BulkImportRow(
+                    line=line, email=record.get("email"), status="invalid", errors=errors
+                )
+            )
+            continue
+        row = BulkImportRow(line=line, email=employee_in.email, status="created")
+        if employee_in.email in seen:
+            row.status = "duplicate"
+            row.errors = ["email appears earlier in this import"]
+        else:
+            seen.add(employee_in.email)
+            valid.append((row, employee_in))
+        results.append(row)
+
+    existing = await run_in_threadpool(
+        employee_crud.get_existing_emails, db, [e.email for _, e in valid]
+    )
+    officer_ids = {e.reportingOfficerId for _, e in valid if e.reportingOfficerId}
+    known_officers = await run_in_threadpool(
+        employee_crud.get_existing_ids, db, officer_ids
+    )
+    for row, e in valid:
+        if e.reportingOfficerId and e.reportingOfficerId not in known_officers:
+            row.status = "invalid"
+            row.errors = ["reportingOfficerId: no such employee"]
+    new = [
+        (row, e) for row, e in valid
+        if e.email not in existing and row.status == "created"
+    ]
+    try:
+        hashes = await hash_passwords_async(
+            [e.password for _, e in new], rounds=settings.BULK_IMPORT_BCRYPT_ROUNDS
+        )
+    except PasswordHashingBusy:
+        # Nothing of this batch was written: the client resubmits these rows
+        for row, _ in new:
+            row.status = "retryable"
+            row.errors = ["password hashing is busy, import this row again"]
+        new, hashes = [], []
+    rows = []
+    for (row, employee_in), hashed in zip(new, hashes):
+        row.employeeId = uuid.uuid4()
+        rows.append(
+            {
+                **employee_in.model_dump(exclude={"password"}),
+                "employeeId": row.employeeId,
+                "hashed_password": hashed,
+                "onBoardingStatus": "Pending",  # Employees must change password later
+            }
+        )
+    skipped = existing | await run_in_threadpool(employee_crud.bulk_insert, db, rows)
+
+    for row in results:
+        if row.status == "created" and row.email in skipped:
+            row.status = "duplicate"
+            row.employeeId = None
+            row.errors = ["an employee with this email already exists"]
+        if row.status == "created":
+            report.created += 1
+        elif row.status == "duplicate":
+            report.duplicates += 1
+        elif row.status == "retryable":
+            report.retryable += 1
+        else:
+            report.invalid += 1
+    report.rows.extend(results)
+
+
 @router.put("/UpdateEmployeeBasic/{employeeId}", response_model=ApiResponse)
 def update_employee(
-    employeeId: int,
+    employeeId: UUID,
     employee_in: EmployeeUpdate,
     db: Session = Depends(get_db),
     current_user: Employee = Depends(get_current_user),
@@ -54,6 +200,15 @@ def update_employee(
         raise HTTPException(
             status_code=403, detail="Unauthorized to update this profile"
         )
+    # Reporting lines are maintained by admins only
+    if "reportingOfficerId" in employee_in.model_fields_set and not is_admin:
+        raise HTTPException(
+            status_code=403, detail="Only admins can change the reporting officer"
+        )
+    if employee_in.reportingOfficerId and not employee_crud.get_by_id(
+        db, emp_id=employee_in.reportingOfficerId
+    ):
+        raise HTTPException(status_code=400, detail="Reporting officer not found")
 
     # Fetch the employee record first
     db_obj = employee_crud.get_by_id(db, emp_id=employeeId)
@@ -61,14 +216,37 @@ def update_employee(
         raise HTTPException(status_code=404, detail="Employee not found")
 
     # Use a standard update method in your CRUD class
-    updated_user = employee_crud.update(db, db_obj=db_obj, obj_in=employee_in)
+    try:
+        updated_user = employee_crud.update(db, db_obj=db_obj, obj_in=employee_in)
+    except ReportingCycleError:
+        db.rollback()
+        raise HTTPException(
+            status_code=400,
+            detail="An employee cannot report to themselves or to one of their reports",
+        )
 
-    return ApiResponse(succeeded=True, data=updated_user)
+    return ApiResponse(succeeded=True, data=EmployeeBase.model_validate(updated_user))
+
+
+@router.get("/SubtreeHeadcount/{employeeId}", response_model=ApiResponse)
+def get_subtree_headcount(
+    employeeId: UUID,
+    db: Session = Depends(get_db),
+    current_user: Employee = Depends(get_current_user),
+):
+    """Everyone reporting to the employee, directly or through others."""
+    is_admin = any(role in ["HR Admin", "SuperAdmin"] for role in current_user.roles)
+    if employeeId != current_user.employeeId and not is_admin:
+        raise HTTPException(status_code=403, detail="Unauthorized to view this subtree")
+
+    return ApiResponse(
+        succeeded=True, data=crud_hierarchy.subtree_headcount(db, manager_id=employeeId)
+    )
 
 
 @router.delete("/DeactivateEmployee/{employeeId}", response_model=ApiResponse)
 def deactivate_employee(
-    employeeId: int,
+    employeeId: UUID,
     db: Session = Depends(get_db),
     current_admin: Employee = Depends(get_current_admin),
 ):
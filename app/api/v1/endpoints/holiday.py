@@ -1,45 +1,117 @@
-from fastapi import APIRouter, Depends
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
-from datetime import datetime
+from datetime import date, datetime
 from app.db.session import get_db
-from app.api.deps import get_current_user
-from app.models.holiday import Holiday
+from app.api.v1.endpoints.auth import get_current_admin, get_streaming_user
+from app.api.v1.endpoints.deps import get_current_user
+from app.core.etag import HOLIDAYS, etag, etag_headers, not_modified
+from app.core.pagination import (
+    NDJSON_MEDIA_TYPE,
+    InvalidCursor,
+    decode_cursor,
+    iter_ndjson,
+    page_size,
+    split_page,
+)
+from app.crud.crud_holiday import crud_holiday, holiday_calendar
 from app.models.employee import Employee
+from app.schemas.auth import ApiPage, ApiResponse
+from app.schemas.holiday import HolidayBase, HolidayCreate, HolidayResponse, HolidayUpdate
 
 router = APIRouter()
 
 # 3.8.1 Get All Holidays [cite: 389]
-@router.get("/hrholiday/GetAll", response_model=dict)
+@router.get("/hrholiday/GetAll", response_model=ApiPage[HolidayBase])
 def get_all_holidays(
-    db: Session = Depends(get_db),
-    current_user: Employee = Depends(get_current_user) #
+    request: Request,
+    response: Response,
+    limit: Optional[int] = Query(None, ge=1),
+    cursor: Optional[str] = None,
+    format: str = Query("json", pattern="^(json|ndjson)$"),
+    db: Session = Depends(get_db, scope="function"),
+    current_user: Employee = Depends(get_streaming_user) #
 ):
     """Get list of all holidays in the system[cite: 394]."""
-    holidays = db.query(Holiday).filter(Holiday.isActive == True).all()
-    return {
-        "data": holidays,
-        "succeeded": True
-    }
+    tag = etag(HOLIDAYS, variant=("all", limit, cursor, format))
+    cached = not_modified(request, tag)
+    if cached:
+        return cached
+    # Served from the in-memory calendar; the DB is only read after a change
+    holiday_calendar.ensure_loaded(db)
+    return holiday_list_response(limit, cursor, format, response, tag)
+
+
+def holiday_list_response(
+    limit: Optional[int], cursor: Optional[str], format: str, response: Response, tag: str
+):
+    """Keyset page on (holidayDate, hrholidayId), or every remaining row as NDJSON."""
+    try:
+        after = decode_cursor(cursor, [date.fromisoformat, int]) if cursor else None
+    except InvalidCursor:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+    if format == "ndjson":
+        holidays = holiday_calendar.all_active(after=after)
+        return StreamingResponse(
+            iter_ndjson(holidays, lambda h: h.model_dump_json().encode()),
+            media_type=NDJSON_MEDIA_TYPE,
+            headers=etag_headers(tag),
+        )
+
+    response.headers.update(etag_headers(tag))
+    size = page_size(limit)
+    holidays = holiday_calendar.all_active(after=after, limit=size + 1)
+    holidays, next_cursor = split_page(
+        holidays, size, key=lambda h: [h.holidayDate, h.hrholidayId]
+    )
+    return ApiPage[HolidayBase](data=holidays, nextCursor=next_cursor)
+
 
 # 3.8.2 Get Upcoming Holidays by Employee [cite: 397]
-@router.get("/Employee/GetUpComingHoliday/{id}", response_model=dict)
+@router.get("/Employee/GetUpComingHoliday/{id}", response_model=HolidayResponse)
 def get_upcoming_holidays(
     id: int,
+    request: Request,
+    response: Response,
     db: Session = Depends(get_db),
     current_user: Employee = Depends(get_current_user)
 ):
     """Returns upcoming holidays applicable to the employee based on center/state[cite: 402, 403]."""
     # Fetch holidays occurring today or in the future
     today = datetime.now().date()
+    tag = etag(HOLIDAYS, variant=("upcoming", current_user.centerId, today))
+    cached = not_modified(request, tag)
+    if cached:
+        return cached
+    response.headers.update(etag_headers(tag))
 
-    # Logic to filter holidays by the employee's centerId or National holidays
-    upcoming = db.query(Holiday).filter(
-        Holiday.holidayDate >= today,
-        Holiday.isActive == True,
-        (Holiday.centerId == current_user.centerId) | (Holiday.holidayType == "National")
-    ).order_by(Holiday.holidayDate).all()
-
-    return {
-        "data": upcoming,
-        "succeeded": True
-    }
\ No newline at end of file
+    # Holidays of the employee's centerId or National holidays
+    holiday_calendar.ensure_loaded(db)
+    upcoming = holiday_calendar.upcoming_for_employee(current_user.centerId, today)
+
+    return HolidayResponse(data=upcoming, succeeded=True)
+
+# Admin-only: maintain the holiday table (reloads the calendar)
+@router.post("/hrholiday/Create", response_model=ApiResponse)
+def create_holiday(
+    holiday_in: HolidayCreate,
+    db: Session = Depends(get_db),
+    current_admin: Employee = Depends(get_current_admin)
+):
+    holiday = crud_holiday.create(db, obj_in=holiday_in)
+    return ApiResponse(succeeded=True, data=HolidayBase.model_validate(holiday))
+
+@router.put("/hrholiday/Update/{hrholidayId}", response_model=ApiResponse)
+def update_holiday(
+    hrholidayId: int,
+    holiday_in: HolidayUpdate,
+    db: Session = Depends(get_db),
+    current_admin: Employee = Depends(get_current_admin)
+):
+    db_obj = crud_holiday.get_by_id(db, holiday_id=hrholidayId)
+    if not db_obj:
+        raise HTTPException(status_code=404, detail="Holiday not found")
+    holiday = crud_holiday.update(db, db_obj=db_obj, obj_in=holiday_in)
+    return ApiResponse(succeeded=True, data=HolidayBase.model_validate(holiday))
@@ -0,0 +1,90 @@
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+from datetime import datetime
+from app.db.session import get_async_db
+from app.api.v1.endpoints.auth import (
+    get_current_admin_async,
+    get_current_user_async,
+    get_streaming_user_async,
+)
+from app.api.v1.endpoints.holiday import holiday_list_response
+from app.core.etag import HOLIDAYS, etag, etag_headers, not_modified
+from app.crud.crud_holiday import crud_holiday, holiday_calendar
+from app.models.employee import Employee
+from app.models.holiday import Holiday
+from app.schemas.auth import ApiPage, ApiResponse
+from app.schemas.holiday import HolidayBase, HolidayCreate, HolidayResponse, HolidayUpdate
+
+# Async twin of holiday.py, mounted instead of it when DB_ASYNC_MODE is on.
+router = APIRouter()
+
+
+async def _ensure_calendar(db: AsyncSession) -> None:
+    if holiday_calendar.is_stale():
+        await db.run_sync(holiday_calendar.ensure_loaded)
+
+
+# 3.8.1 Get All Holidays
+@router.get("/hrholiday/GetAll", response_model=ApiPage[HolidayBase])
+async def get_all_holidays(
+    request: Request,
+    response: Response,
+    limit: Optional[int] = Query(None, ge=1),
+    cursor: Optional[str] = None,
+    format: str = Query("json", pattern="^(json|ndjson)$"),
+    db: AsyncSession = Depends(get_async_db, scope="function"),
+    current_user: Employee = Depends(get_streaming_user_async),
+):
+    """Get list of all holidays in the system."""
+    tag = etag(HOLIDAYS, variant=("all", limit, cursor, format))
+    cached = not_modified(request, tag)
+    if cached:
+        return cached
+    await _ensure_calendar(db)
+    return holiday_list_response(limit, cursor, format, response, tag)
+
+
+# 3.8.2 Get Upcoming Holidays by Employee
+@router.get("/Employee/GetUpComingHoliday/{id}", response_model=HolidayResponse)
+async def get_upcoming_holidays(
+    id: int,
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Employee = Depends(get_current_user_async),
+):
+    """Returns upcoming holidays applicable to the employee based on center/state."""
+    today = datetime.now().date()
+    tag = etag(HOLIDAYS, variant=("upcoming", current_user.centerId, today))
+    cached = not_modified(request, tag)
+    if cached:
+        return cached
+    response.headers.update(etag_headers(tag))
+    await _ensure_calendar(db)
+    upcoming = holiday_calendar.upcoming_for_employee(current_user.centerId, today)
+    return HolidayResponse(data=upcoming, succeeded=True)
+
+
+@router.post("/hrholiday/Create", response_model=ApiResponse)
+async def create_holiday(
+    holiday_in: HolidayCreate,
+    db: AsyncSession = Depends(get_async_db),
+    current_admin: Employee = Depends(get_current_admin_async),
+):
+    holiday = await db.run_sync(crud_holiday.create, obj_in=holiday_in)
+    return ApiResponse(succeeded=True, data=HolidayBase.model_validate(holiday))
+
+
+@router.put("/hrholiday/Update/{hrholidayId}", response_model=ApiResponse)
+async def update_holiday(
+    hrholidayId: int,
+    holiday_in: HolidayUpdate,
+    db: AsyncSession = Depends(get_async_db),
+    current_admin: Employee = Depends(get_current_admin_async),
+):
+    db_obj = await db.get(Holiday, hrholidayId)
+    if not db_obj:
+        raise HTTPException(status_code=404, detail="Holiday not found")
+    holiday = await db.run_sync(crud_holiday.update, db_obj=db_obj, obj_in=holiday_in)
+    return ApiResponse(succeeded=True, data=HolidayBase.model_validate(holiday))
@@ -1,16 +1,36 @@
+from datetime import date
+from typing import List, Optional
 from uuid import UUID
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.core.etag import etag_headers, not_modified
+from app.core.pagination import (
+    NDJSON_MEDIA_TYPE,
+    InvalidCursor,
+    decode_cursor,
+    page_size,
+    split_page,
+    stream_ndjson,
+)
 from app.db.session import get_db
-from app.crud.crud_leave import crud_leave
+from app.crud.crud_leave import LeaveOverlap, LeaveStatusConflict, crud_leave
+from app.api.v1.endpoints.auth import get_streaming_user
 from app.api.v1.endpoints.deps import get_current_user
 from app.models.employee import Employee
 from app.schemas.leave import (
     LeaveCreate,
     HalfDayLeaveCreate,
     LeaveApproval,
+    LeaveBatchApproval,
+    LeaveApprovalResult,
     LeaveSummaryResponse,
+    LeaveRequestRead,
+    TeamAvailabilityDay,
+    leave_request_list,
 )
+from app.schemas.auth import ApiPage, ApiResponse
 
 router = APIRouter()
 
@@ -29,7 +49,10 @@ def apply_full_day_leave(
             status_code=403, detail="You can only apply leave for yourself"
         )
 
-    leave = crud_leave.create_full_day_leave(db, obj_in=leave_in)
+    try:
+        leave = crud_leave.create_full_day_leave(db, obj_in=leave_in)
+    except LeaveOverlap as exc:
+        raise _overlap_error(exc)
     return {
         "data": {
             "hrEmployeeFullDayLeaveDetailsId": leave.id,
@@ -53,7 +76,10 @@ def apply_half_day_leave(
             status_code=403, detail="You can only apply leave for yourself"
         )
 
-    leave = crud_leave.create_half_day_leave(db, obj_in=leave_in)
+    try:
+        leave = crud_leave.create_half_day_leave(db, obj_in=leave_in)
+    except LeaveOverlap as exc:
+        raise _overlap_error(exc)
     return {
         "data": {
             "hrEmployeeHalfDayLeaveDetailsId": leave.id,
@@ -80,7 +106,10 @@ def approve_leave(
             status_code=403, detail="Unauthorized to approve this request"
         )
 
-    leave = crud_leave.approve_or_reject_leave(db, obj_in=approval_in)
+    try:
+        leave = crud_leave.approve_or_reject_leave(db, obj_in=approval_in)
+    except LeaveStatusConflict:
+        raise HTTPException(status_code=409, detail="Leave request is no longer pending")
     if not leave:
         raise HTTPException(status_code=404, detail="Leave request not found")
     return {
@@ -91,6 +120,32 @@ def approve_leave(
     }
 
 
+# Approve/reject many requests in one transaction (same access rule per item:
+# the caller must be the employee's reporting officer, or an Admin)
+@router.post(
+    "/LeaveDetails/approveBatch", response_model=ApiResponse[List[LeaveApprovalResult]]
+)
+def approve_leave_batch(
+    batch_in: LeaveBatchApproval,
+    db: Session = Depends(get_db),
+    current_user: Employee = Depends(get_current_user),
+):
+    is_admin = "Admin" in getattr(current_user, "roles", [])
+    try:
+        results = crud_leave.approve_or_reject_batch(
+            db,
+            items=batch_in.items,
+            approver_id=current_user.employeeId,
+            is_admin=is_admin,
+        )
+    except LeaveStatusConflict:
+        raise HTTPException(
+            status_code=409,
+            detail="Some requests changed status while the batch was applied; retry",
+        )
+    return ApiResponse(succeeded=all(r.succeeded for r in results), data=results)
+
+
 # 3.2.6 Get Leave Summary
 # Access Control: Employees view own, Managers view team [cite: 75, 177]
 @router.get(
@@ -98,7 +153,10 @@ def approve_leave(
     response_model=LeaveSummaryResponse,
 )
 def get_leave_summary(
-    HREmployeeId: int,
+    HREmployeeId: UUID,
+    request: Request,
+    response: Response,
+    financialYearId: Optional[int] = None,
     db: Session = Depends(get_db),
     current_user: Employee = Depends(get_current_user),
 ):
@@ -113,7 +171,16 @@ def get_leave_summary(
                 status_code=403, detail="Access denied to other employee summaries"
             )
 
-    summary = crud_leave.get_leave_summary(db, employee_id=HREmployeeId)
+    # Unchanged since the client's copy: 304 without touching the database
+    tag = crud_leave.summary_etag(HREmployeeId, financialYearId)
+    cached = not_modified(request, tag)
+    if cached:
+        return cached
+    response.headers.update(etag_headers(tag))
+
+    summary = crud_leave.get_leave_summary(
+        db, employee_id=HREmployeeId, financial_year=financialYearId
+    )
     return {"data": summary, "succeeded": True}
 
     # 3.2.8 Get Leave Requests by Reporting Officer
@@ -121,12 +188,16 @@ def get_leave_summary(
 
 # Access Control: Reporting Officer only [cite: 187, 193]
 @router.get(
-    "/LeaveDetails/GetByReportingOfficerId/{ReportingOfficerId}", response_model=dict
+    "/LeaveDetails/GetByReportingOfficerId/{ReportingOfficerId}",
+    response_model=ApiPage[LeaveRequestRead],
 )
 def get_manager_pending_leaves(
     ReportingOfficerId: UUID,
-    db: Session = Depends(get_db),
-    current_user: Employee = Depends(get_current_user),
+    limit: Optional[int] = Query(None, ge=1),
+    cursor: Optional[str] = None,
+    format: str = Query("json", pattern="^(json|ndjson)$"),
+    db: Session = Depends(get_db, scope="function"),
+    current_user: Employee = Depends(get_streaming_user),
 ):
     # Ensure the manager is viewing their own team [cite: 193]
     if ReportingOfficerId != current_user.employeeId:
@@ -134,8 +205,125 @@ def get_manager_pending_leaves(
             status_code=403, detail="Unauthorized to view this manager's team"
         )
 
-    requests = crud_leave.get_pending_by_manager(db, manager_id=ReportingOfficerId)
-    return {"data": requests, "succeeded": True}
+    # Keyset pages in id order; pass nextCursor back to get the next page
+    try:
+        after_id = decode_cursor(cursor, [int])[0] if cursor else None
+    except InvalidCursor:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+    if format == "ndjson":
+        # Every remaining row, streamed with flat memory
+        statement = crud_leave.pending_by_manager_query(ReportingOfficerId, after_id)
+        return StreamingResponse(
+            stream_ndjson(statement, _leave_line, scalars=True),
+            media_type=NDJSON_MEDIA_TYPE,
+        )
+
+    size = page_size(limit)
+    requests = crud_leave.get_pending_by_manager(
+        db, manager_id=ReportingOfficerId, after_id=after_id, limit=size
+    )
+    requests, next_cursor = split_page(requests, size, key=lambda r: [r.id])
+    return ApiPage[LeaveRequestRead](
+        data=leave_request_list.validate_python(requests, from_attributes=True),
+        nextCursor=next_cursor,
+    )
+
+
+# Pending requests of everyone below the caller, at any depth (closure table)
+@router.get(
+    "/LeaveDetails/GetBySubtree/{ReportingOfficerId}",
+    response_model=ApiPage[LeaveRequestRead],
+)
+def get_subtree_pending_leaves(
+    ReportingOfficerId: UUID,
+    limit: Optional[int] = Query(None, ge=1),
+    cursor: Optional[str] = None,
+    format: str = Query("json", pattern="^(json|ndjson)$"),
+    db: Session = Depends(get_db, scope="function"),
+    current_user: Employee = Depends(get_streaming_user),
+):
+    if ReportingOfficerId != current_user.employeeId:
+        raise HTTPException(
+            status_code=403, detail="Unauthorized to view this manager's team"
+        )
+
+    try:
+        after_id = decode_cursor(cursor, [int])[0] if cursor else None
+    except InvalidCursor:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+    if format == "ndjson":
+        statement = crud_leave.pending_in_subtree_query(ReportingOfficerId, after_id)
+        return StreamingResponse(
+            stream_ndjson(statement, _leave_line, scalars=True),
+            media_type=NDJSON_MEDIA_TYPE,
+        )
+
+    size = page_size(limit)
+    requests = crud_leave.get_pending_in_subtree(
+        db, manager_id=ReportingOfficerId, after_id=after_id, limit=size
+    )
+    requests, next_cursor = split_page(requests, size, key=lambda r: [r.id])
+    return ApiPage[LeaveRequestRead](
+        data=leave_request_list.validate_python(requests, from_attributes=True),
+        nextCursor=next_cursor,
+    )
+
+
+# Who is out on each day of a window: a reporting officer's direct reports,
+# or a department. Officers see their own team, employees their own
+# department; admins see any.
+@router.get(
+    "/LeaveDetails/TeamAvailability",
+    response_model=ApiResponse[List[TeamAvailabilityDay]],
+)
+def get_team_availability(
+    fromDate: date,
+    toDate: date,
+    reportingOfficerId: Optional[UUID] = None,
+    department: Optional[str] = None,
+    db: Session = Depends(get_db),
+    current_user: Employee = Depends(get_current_user),
+):
+    if (reportingOfficerId is None) == (department is None):
+        raise HTTPException(
+            status_code=400, detail="Pass exactly one of reportingOfficerId or department"
+        )
+    if toDate < fromDate:
+        raise HTTPException(status_code=400, detail="toDate is before fromDate")
+    if (toDate - fromDate).days >= settings.TEAM_AVAILABILITY_MAX_DAYS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Window is limited to {settings.TEAM_AVAILABILITY_MAX_DAYS} days",
+        )
+
+    is_admin = any(role in ["Admin", "HR Admin", "SuperAdmin"] for role in current_user.roles)
+    if not is_admin and (
+        (reportingOfficerId is not None and reportingOfficerId != current_user.employeeId)
+        or (department is not None and department != current_user.department)
+    ):
+        raise HTTPException(status_code=403, detail="Unauthorized to view this team")
+
+    days = crud_leave.get_team_availability(
+        db,
+        from_date=fromDate,
+        to_date=toDate,
+        reporting_officer_id=reportingOfficerId,
+        department=department,
+    )
+    return ApiResponse(succeeded=True, data=days)
+
+
+def _overlap_error(exc: LeaveOverlap) -> HTTPException:
+    ids = ", ".join(str(i) for i in exc.leave_ids)
+    return HTTPException(
+        status_code=409, detail=f"Overlaps existing leave request(s): {ids}"
+    )
+
+
+def _leave_line(leave) -> bytes:
+    return LeaveRequestRead.model_validate(leave).model_dump_json().encode()
 
 
 # Cancel Leave Request (New Functionality)
@@ -0,0 +1,323 @@
+from datetime import date
+from typing import List, Optional
+from uuid import UUID
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.config import settings
+from app.core.etag import etag_headers, not_modified
+from app.core.pagination import (
+    NDJSON_MEDIA_TYPE,
+    InvalidCursor,
+    astream_ndjson,
+    decode_cursor,
+    page_size,
+    split_page,
+)
+from app.db.session import get_async_db
+from app.crud.crud_leave import LeaveOverlap, LeaveStatusConflict, async_crud_leave, crud_leave
+from app.api.v1.endpoints.auth import get_current_user_async, get_streaming_user_async
+from app.api.v1.endpoints.leaves import _leave_line, _overlap_error
+from app.models.employee import Employee
+from app.schemas.leave import (
+    LeaveCreate,
+    HalfDayLeaveCreate,
+    LeaveApproval,
+    LeaveBatchApproval,
+    LeaveApprovalResult,
+    LeaveSummaryResponse,
+    LeaveRequestRead,
+    TeamAvailabilityDay,
+    leave_request_list,
+)
+from app.schemas.auth import ApiPage, ApiResponse
+
+# Async twin of leaves.py, mounted instead of it when DB_ASYNC_MODE is on.
+# Paths, access rules and payloads must stay identical to the sync router.
+router = APIRouter()
+
+
+# 3.2.1 Apply Full-Day Leave
+@router.post("/LeaveDetails", response_model=dict)
+async def apply_full_day_leave(
+    leave_in: LeaveCreate,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Employee = Depends(get_current_user_async),
+):
+    if leave_in.employeeId != current_user.employeeId:
+        raise HTTPException(
+            status_code=403, detail="You can only apply leave for yourself"
+        )
+
+    try:
+        leave = await async_crud_leave.create_full_day_leave(db, obj_in=leave_in)
+    except LeaveOverlap as exc:
+        raise _overlap_error(exc)
+    return {
+        "data": {
+            "hrEmployeeFullDayLeaveDetailsId": leave.id,
+            "status": leave.status,
+            "message": "Leave request submitted successfully",
+        },
+        "succeeded": True,
+    }
+
+
+# 3.2.5 Apply Half-Day Leave
+@router.post("/HalfDayLeaveDetails", response_model=dict)
+async def apply_half_day_leave(
+    leave_in: HalfDayLeaveCreate,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Employee = Depends(get_current_user_async),
+):
+    if leave_in.employeeId != current_user.employeeId:
+        raise HTTPException(
+            status_code=403, detail="You can only apply leave for yourself"
+        )
+
+    try:
+        leave = await async_crud_leave.create_half_day_leave(db, obj_in=leave_in)
+    except LeaveOverlap as exc:
+        raise _overlap_error(exc)
+    return {
+        "data": {
+            "hrEmployeeHalfDayLeaveDetailsId": leave.id,
+            "status": leave.status,
+            "message": "Half-day leave request submitted successfully",
+        },
+        "succeeded": True,
+    }
+
+
+# 3.2.3 Approve Leave Request
+@router.post("/LeaveDetails/approve", response_model=dict)
+async def approve_leave(
+    approval_in: LeaveApproval,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Employee = Depends(get_current_user_async),
+):
+    is_admin = "Admin" in getattr(current_user, "roles", [])
+    if approval_in.approvedBy != current_user.employeeId and not is_admin:
+        raise HTTPException(
+            status_code=403, detail="Unauthorized to approve this request"
+        )
+
+    try:
+        leave = await async_crud_leave.approve_or_reject_leave(db, obj_in=approval_in)
+    except LeaveStatusConflict:
+        raise HTTPException(status_code=409, detail="Leave request is no longer pending")
+    if not leave:
+        raise HTTPException(status_code=404, detail="Leave request not found")
+    return {
+        "data": {
+            "message": f"Leave request {'approved' if approval_in.isApproved else 'rejected'} successfully"
+        },
+        "succeeded": True,
+    }
+
+
+# Approve/reject many requests in one transaction (same access rule per item:
+# the caller must be the employee's reporting officer, or an Admin)
+@router.post(
+    "/LeaveDetails/approveBatch", response_model=ApiResponse[List[LeaveApprovalResult]]
+)
+async def approve_leave_batch(
+    batch_in: LeaveBatchApproval,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Employee = Depends(get_current_user_async),
+):
+    is_admin = "Admin" in getattr(current_user, "roles", [])
+    try:
+        results = await async_crud_leave.approve_or_reject_batch(
+            db,
+            items=batch_in.items,
+            approver_id=current_user.employeeId,
+            is_admin=is_admin,
+        )
+    except LeaveStatusConflict:
+        raise HTTPException(
+            status_code=409,
+            detail="Some requests changed status while the batch was applied; retry",
+        )
+    return ApiResponse(succeeded=all(r.succeeded for r in results), data=results)
+
+
+# 3.2.6 Get Leave Summary
+@router.get(
+    "/LeaveAccounts/GetLeaveSummarybyEmployeeId/{HREmployeeId}",
+    response_model=LeaveSummaryResponse,
+)
+async def get_leave_summary(
+    HREmployeeId: UUID,
+    request: Request,
+    response: Response,
+    financialYearId: Optional[int] = None,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Employee = Depends(get_current_user_async),
+):
+    is_own_profile = HREmployeeId == current_user.employeeId
+
+    if not is_own_profile:
+        if "Admin" not in getattr(current_user, "roles", []):
+            raise HTTPException(
+                status_code=403, detail="Access denied to other employee summaries"
+            )
+
+    # Unchanged since the client's copy: 304 without touching the database
+    tag = crud_leave.summary_etag(HREmployeeId, financialYearId)
+    cached = not_modified(request, tag)
+    if cached:
+        return cached
+    response.headers.update(etag_headers(tag))
+
+    summary = await async_crud_leave.get_leave_summary(
+        db, employee_id=HREmployeeId, financial_year=financialYearId
+    )
+    return {"data": summary, "succeeded": True}
+
+
+# 3.2.8 Get Leave Requests by Reporting Officer
+@router.get(
+    "/LeaveDetails/GetByReportingOfficerId/{ReportingOfficerId}",
+    response_model=ApiPage[LeaveRequestRead],
+)
+async def get_manager_pending_leaves(
+    ReportingOfficerId: UUID,
+    limit: Optional[int] = Query(None, ge=1),
+    cursor: Optional[str] = None,
+    format: str = Query("json", pattern="^(json|ndjson)$"),
+    db: AsyncSession = Depends(get_async_db, scope="function"),
+    current_user: Employee = Depends(get_streaming_user_async),
+):
+    if ReportingOfficerId != current_user.employeeId:
+        raise HTTPException(
+            status_code=403, detail="Unauthorized to view this manager's team"
+        )
+
+    try:
+        after_id = decode_cursor(cursor, [int])[0] if cursor else None
+    except InvalidCursor:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+    if format == "ndjson":
+        statement = crud_leave.pending_by_manager_query(ReportingOfficerId, after_id)
+        return StreamingResponse(
+            astream_ndjson(statement, _leave_line, scalars=True),
+            media_type=NDJSON_MEDIA_TYPE,
+        )
+
+    size = page_size(limit)
+    requests = await async_crud_leave.get_pending_by_manager(
+        db, manager_id=ReportingOfficerId, after_id=after_id, limit=size
+    )
+    requests, next_cursor = split_page(requests, size, key=lambda r: [r.id])
+    return ApiPage[LeaveRequestRead](
+        data=leave_request_list.validate_python(requests, from_attributes=True),
+        nextCursor=next_cursor,
+    )
+
+
+# Pending requests of everyone below the caller, at any depth (closure table)
+@router.get(
+    "/LeaveDetails/GetBySubtree/{ReportingOfficerId}",
+    response_model=ApiPage[LeaveRequestRead],
+)
+async def get_subtree_pending_leaves(
+    ReportingOfficerId: UUID,
+    limit: Optional[int] = Query(None, ge=1),
+    cursor: Optional[str] = None,
+    format: str = Query("json", pattern="^(json|ndjson)$"),
+    db: AsyncSession = Depends(get_async_db, scope="function"),
+    current_user: Employee = Depends(get_streaming_user_async),
+):
+    if ReportingOfficerId != current_user.employeeId:
+        raise HTTPException(
+            status_code=403, detail="Unauthorized to view this manager's team"
+        )
+
+    try:
+        after_id = decode_cursor(cursor, [int])[0] if cursor else None
+    except InvalidCursor:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+    if format == "ndjson":
+        statement = crud_leave.pending_in_subtree_query(ReportingOfficerId, after_id)
+        return StreamingResponse(
+            astream_ndjson(statement, _leave_line, scalars=True),
+            media_type=NDJSON_MEDIA_TYPE,
+        )
+
+    size = page_size(limit)
+    requests = await async_crud_leave.get_pending_in_subtree(
+        db, manager_id=ReportingOfficerId, after_id=after_id, limit=size
+    )
+    requests, next_cursor = split_page(requests, size, key=lambda r: [r.id])
+    return ApiPage[LeaveRequestRead](
+        data=leave_request_list.validate_python(requests, from_attributes=True),
+        nextCursor=next_cursor,
+    )
+
+
+# Who is out on each day of a window: a reporting officer's direct reports,
+# or a department. Officers see their own team, employees their own
+# department; admins see any.
+@router.get(
+    "/LeaveDetails/TeamAvailability",
+    response_model=ApiResponse[List[TeamAvailabilityDay]],
+)
+async def get_team_availability(
+    fromDate: date,
+    toDate: date,
+    reportingOfficerId: Optional[UUID] = None,
+    department: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Employee = Depends(get_current_user_async),
+):
+    if (reportingOfficerId is None) == (department is None):
+        raise HTTPException(
+            status_code=400, detail="Pass exactly one of reportingOfficerId or department"
+        )
+    if toDate < fromDate:
+        raise HTTPException(status_code=400, detail="toDate is before fromDate")
+    if (toDate - fromDate).days >= settings.TEAM_AVAILABILITY_MAX_DAYS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Window is limited to {settings.TEAM_AVAILABILITY_MAX_DAYS} days",
+        )
+
+    is_admin = any(role in ["Admin", "HR Admin", "SuperAdmin"] for role in current_user.roles)
+    if not is_admin and (
+        (reportingOfficerId is not None and reportingOfficerId != current_user.employeeId)
+        or (department is not None and department != current_user.department)
+    ):
+        raise HTTPException(status_code=403, detail="Unauthorized to view this team")
+
+    days = await async_crud_leave.get_team_availability(
+        db,
+        from_date=fromDate,
+        to_date=toDate,
+        reporting_officer_id=reportingOfficerId,
+        department=department,
+    )
+    return ApiResponse(succeeded=True, data=days)
+
+
+# Cancel Leave Request
+@router.delete("/LeaveDetails/Cancel/{LeaveId}", response_model=dict)
+async def cancel_leave_request(
+    LeaveId: int,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Employee = Depends(get_current_user_async),
+):
+    leave = await async_crud_leave.cancel_leave(
+        db, leave_id=LeaveId, employee_id=current_user.employeeId
+    )
+    if not leave:
+        raise HTTPException(
+            status_code=400,
+            detail="Leave request not found or cannot be cancelled (already processed)",
+        )
+    return {
+        "data": {"message": "Leave request cancelled successfully"},
+        "succeeded": True,
+    }
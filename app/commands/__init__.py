@@ -0,0 +1,31 @@
+from sqlalchemy import exists, select
+
+from app.core.config import settings
+from app.core.shared_state import get_shared_state
+
+
+def is_unfilled(db, table, source) -> bool:
+    """
+    True when `table` has no rows while `source` has some: how the migration
+    that adds a derived table leaves it. prestart.sh runs the rebuild
+    commands with --if-empty, which fill such a table once and are a no-op
+    afterwards.
+    """
+
+    def has_rows(model):
+        return db.scalar(select(exists().select_from(model)))
+
+    return not has_rows(table) and has_rows(source)
+
+
+def require_shared_state(parser) -> None:
+    """
+    Refuse to run a job that changes leave summaries when SHARED_STATE_URL is
+    process-local: the ETag versions it bumps would never reach the API
+    process, which would keep answering 304 with the old summaries.
+    """
+    if not get_shared_state().cross_process:
+        parser.error(
+            f"SHARED_STATE_URL is {settings.SHARED_STATE_URL!r}, which the API "
+            "process does not see: point it at the API's shared store"
+        )
@@ -0,0 +1,55 @@
+"""
+Report overlapping Pending/Approved leave requests.
+
+    python -m app.commands.audit_leave_overlaps [--limit 50] [--json]
+
+New submissions are checked on the way in; this finds the overlaps that
+were stored before that check existed, or written by imports that bypass
+CRUDLeave. Read-only: resolve the pairs by cancelling or rejecting one side.
+"""
+import argparse
+import json
+import time
+
+from app.crud.crud_leave import crud_leave
+from app.db.session import SessionLocal
+
+
+def _describe(leave) -> str:
+    text = f"#{leave.id} {leave.status} {leave.fromDate}..{leave.toDate or leave.fromDate}"
+    return f"{text} {leave.leaveSession}" if leave.leaveSession else text
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Find overlapping leave requests")
+    parser.add_argument(
+        "--limit", type=int, default=50, help="pairs to print (all are counted)"
+    )
+    parser.add_argument("--json", action="store_true", help="one JSON object per pair")
+    args = parser.parse_args(argv)
+
+    started = time.perf_counter()
+    found = 0
+    with SessionLocal() as db:
+        for earlier, later in crud_leave.audit_overlaps(db):
+            found += 1
+            if found > args.limit:
+                continue
+            if args.json:
+                print(json.dumps({
+                    "employeeId": str(earlier.employeeId),
+                    "leaveIds": [earlier.id, later.id],
+                    "statuses": [earlier.status, later.status],
+                    "dates": [
+                        [str(earlier.fromDate), str(earlier.toDate or earlier.fromDate)],
+                        [str(later.fromDate), str(later.toDate or later.fromDate)],
+                    ],
+                }))
+            else:
+                print(f"{earlier.employeeId}: {_describe(earlier)} overlaps {_describe(later)}")
+    if not args.json:
+        print(f"Found {found} overlapping pairs in {time.perf_counter() - started:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
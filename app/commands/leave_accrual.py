@@ -0,0 +1,79 @@
+"""
+Leave accrual and year-end jobs.
+
+    python -m app.commands.leave_accrual accrue [--month 2026-05]
+    python -m app.commands.leave_accrual close --financial-year 2025
+
+accrue credits the month's LEAVE_TYPE_MONTHLY_ACCRUALS to every employee
+(LEAVE_ALLOTMENT_MODE=monthly); close carries unused balances into the next
+year up to LEAVE_TYPE_CARRY_FORWARD_CAPS and lapses the rest. Both commit in
+chunks of --chunk-size employees and can be stopped at any time: running the
+same command again resumes after the last committed chunk, and a period that
+is done is not posted twice.
+
+Both change leave summaries behind the API's ETags, so they refuse to run
+unless SHARED_STATE_URL points at the store the API uses (a memory:// store
+is private to this process).
+"""
+import argparse
+import sys
+from datetime import date, datetime
+
+from app.commands import require_shared_state
+from app.crud.crud_leave_accrual import crud_leave_accrual
+from app.db.session import SessionLocal
+
+
+def _month(value: str) -> date:
+    try:
+        return datetime.strptime(value, "%Y-%m").date()
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected YYYY-MM, got {value!r}")
+
+
+def _report(state: dict) -> None:
+    print(
+        f"{state['job']}: {state['employees']}/{state['total']} employees, "
+        f"{state['postings']} postings, {state['elapsedSeconds']:.2f}s",
+        file=sys.stderr,
+    )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run the leave accrual jobs")
+    jobs = parser.add_subparsers(dest="job", required=True)
+    accrue = jobs.add_parser("accrue", help="credit one month's accrual")
+    accrue.add_argument(
+        "--month", type=_month, default=date.today(), help="YYYY-MM (default: this month)"
+    )
+    close = jobs.add_parser("close", help="carry forward and lapse a financial year")
+    close.add_argument("--financial-year", type=int, required=True)
+    for job in (accrue, close):
+        job.add_argument("--chunk-size", type=int, help="employees per transaction")
+        job.add_argument("--quiet", action="store_true", help="no per-chunk progress")
+    args = parser.parse_args(argv)
+    require_shared_state(parser)
+
+    progress = None if args.quiet else _report
+    with SessionLocal() as db:
+        try:
+            if args.job == "accrue":
+                summary = crud_leave_accrual.accrue_month(
+                    db, args.month, chunk_size=args.chunk_size, progress=progress
+                )
+            else:
+                summary = crud_leave_accrual.close_year(
+                    db, args.financial_year, chunk_size=args.chunk_size, progress=progress
+                )
+        except ValueError as exc:
+            parser.error(str(exc))
+    resumed = " (resumed)" if summary["resumed"] else ""
+    print(
+        f"{summary['job']}{resumed}: {summary['employees']} employees, "
+        f"{summary['postings']} postings, finished {summary['finishedAt']}, "
+        f"{summary['elapsedSeconds']:.2f}s this run"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+"""
+Drain the leave event outbox from a separate process.
+
+    python -m app.commands.outbox_worker [--once] [--batch-size 100]
+    python -m app.commands.outbox_worker --purge-days 30
+
+Use it when the API runs with OUTBOX_WORKER_ENABLED=false, or alongside the
+in-process workers: claims are leased, so several workers can drain the same
+table. Sinks come from OUTBOX_SINKS.
+"""
+import argparse
+import time
+from datetime import timedelta
+
+from app.core import outbox
+from app.core.config import settings
+from app.db.session import SessionLocal
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Deliver pending outbox events")
+    parser.add_argument("--once", action="store_true", help="drain what is due, then exit")
+    parser.add_argument("--batch-size", type=int, default=settings.OUTBOX_BATCH_SIZE)
+    parser.add_argument(
+        "--purge-days",
+        type=int,
+        help="delete events sent more than this many days ago, then exit",
+    )
+    args = parser.parse_args(argv)
+
+    if args.purge_days is not None:
+        with SessionLocal() as db:
+            deleted = outbox.purge_sent(db, timedelta(days=args.purge_days))
+        print(f"Deleted {deleted} sent events")
+        return
+
+    sinks = outbox.open_sinks(settings.OUTBOX_SINKS)
+    delivered = 0
+    started = time.perf_counter()
+    try:
+        while True:
+            claimed = outbox.drain_once(SessionLocal, sinks, args.batch_size)
+            delivered += claimed
+            if claimed < args.batch_size:
+                if args.once:
+                    break
+                time.sleep(settings.OUTBOX_POLL_SECONDS)
+    except KeyboardInterrupt:
+        pass
+    print(f"Processed {delivered} events in {time.perf_counter() - started:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,39 @@
+"""
+Regenerate the employee_hierarchy closure table from reportingOfficerId.
+
+    python -m app.commands.rebuild_employee_hierarchy [--if-empty]
+
+Run it after imports or data fixes that change reportingOfficerId without
+going through CRUDEmployee. prestart.sh runs it with --if-empty, which fills
+the table on the first start after the migration that adds it.
+"""
+import argparse
+import time
+
+from app.commands import is_unfilled
+from app.crud.crud_hierarchy import crud_hierarchy
+from app.db.session import SessionLocal
+from app.models.employee import Employee
+from app.models.employee_hierarchy import EmployeeHierarchy
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Rebuild the employee hierarchy closure table")
+    parser.add_argument(
+        "--if-empty",
+        action="store_true",
+        help="only when the table is empty and there are employees",
+    )
+    args = parser.parse_args(argv)
+
+    started = time.perf_counter()
+    with SessionLocal() as db:
+        if args.if_empty and not is_unfilled(db, EmployeeHierarchy, Employee):
+            print("Hierarchy already filled, nothing to do")
+            return
+        written = crud_hierarchy.rebuild(db)
+    print(f"Rebuilt {written} hierarchy rows in {time.perf_counter() - started:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""
+Recompute the leave_balances ledger from leave history.
+
+    python -m app.commands.rebuild_leave_balances [--financial-year 2026] [--recost]
+
+Run it after data fixes or imports that bypass CRUDLeave, and with --recost
+after holiday changes so stored leaveDays follow the new calendars. Submissions made
+while it runs may be lost from the ledger, so use a quiet window.
+prestart.sh runs it with --if-empty, which fills the ledger (and costs
+leaveDays) on the first start after the migration that adds it.
+
+A rebuild changes leave summaries behind the API's ETags, so it refuses to
+run unless SHARED_STATE_URL points at the store the API uses (a memory://
+store is private to this process). --if-empty is exempt: prestart.sh runs
+it before the API has served anything.
+"""
+import argparse
+import time
+
+from app.commands import is_unfilled, require_shared_state
+from app.crud.crud_leave import crud_leave
+from app.db.session import SessionLocal
+from app.models.leave import LeaveRequest
+from app.models.leave_balance import LeaveBalance
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Rebuild the leave balance ledger")
+    parser.add_argument(
+        "--financial-year",
+        type=int,
+        default=None,
+        help="only rebuild this financialYearId (default: all years)",
+    )
+    parser.add_argument(
+        "--recost",
+        action="store_true",
+        help="recompute leaveDays of every Pending/Approved request first",
+    )
+    parser.add_argument(
+        "--if-empty",
+        action="store_true",
+        help="only when the ledger is empty and there are leave requests",
+    )
+    args = parser.parse_args(argv)
+    if not args.if_empty:
+        require_shared_state(parser)
+
+    started = time.perf_counter()
+    with SessionLocal() as db:
+        if args.if_empty and not is_unfilled(db, LeaveBalance, LeaveRequest):
+            print("Ledger already filled, nothing to do")
+            return
+        written = crud_leave.rebuild_balances(
+            db, financial_year=args.financial_year, recost=args.recost
+        )
+    print(f"Rebuilt {written} ledger rows in {time.perf_counter() - started:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
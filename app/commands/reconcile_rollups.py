@@ -0,0 +1,61 @@
+"""
+Reconcile the dashboard rollups with the leave and employee tables.
+
+    python -m app.commands.reconcile_rollups               # everything
+    python -m app.commands.reconcile_rollups --days 45     # the last 45 days
+    python -m app.commands.reconcile_rollups --if-empty    # fill after the migration
+
+Run nightly in a quiet window. prestart.sh runs it with --if-empty, which
+fills the rollup tables on the first start after the migration that adds
+them, before the API serves requests. The write paths keep the rollups
+current between runs; this repairs what they cannot see (rows changed
+outside the API, employees who moved department) by adding the
+differences. It reads the raw tables before the stored rollups, so a
+leave written between the two reads is subtracted out again: changes made
+while it runs may be lost from the rollups until the next run. --days
+limits leave and decision days to the recent window, which is where the
+write paths' drift is.
+
+The dashboard cache lives in each API process, so this command cannot clear
+it: the API serves the corrected figures once its cached entries expire,
+within DASHBOARD_CACHE_TTL_SECONDS.
+"""
+import argparse
+import time
+from datetime import date, timedelta
+
+from app.commands import is_unfilled
+from app.crud.crud_rollup import crud_rollup
+from app.db.session import SessionLocal
+from app.models.employee import Employee
+from app.models.rollup import DepartmentHeadcount
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Reconcile the dashboard rollups")
+    parser.add_argument(
+        "--days", type=int, help="only leave and decision days this recent (default: all)"
+    )
+    parser.add_argument(
+        "--if-empty",
+        action="store_true",
+        help="only when the rollups are empty and there are employees",
+    )
+    args = parser.parse_args(argv)
+
+    since = None if args.days is None else date.today() - timedelta(days=args.days)
+    started = time.perf_counter()
+    with SessionLocal() as db:
+        # Any employee is counted in department_headcounts
+        if args.if_empty and not is_unfilled(db, DepartmentHeadcount, Employee):
+            print("Rollups already filled, nothing to do")
+            return
+        corrected = crud_rollup.reconcile(db, since=since)
+    print(
+        ", ".join(f"{table}: {n} rows corrected" for table, n in corrected.items())
+        + f" in {time.perf_counter() - started:.2f}s"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+
+
+class CoalescingTTLCache:
+    """
+    Small keyed TTL cache whose misses are coalesced: callers that miss the
+    same key while a load is running wait for that load instead of starting
+    their own. Works from threadpool (sync) and event-loop (async) callers.
+
+    invalidate() bumps a generation counter, so a load that started before the
+    invalidation still answers its waiters but is not stored.
+    """
+
+    def __init__(self, ttl_seconds: float):
+        self.ttl_seconds = ttl_seconds
+        self._values: Dict[Hashable, Tuple[Any, float]] = {}
+        self._inflight: Dict[Hashable, Future] = {}
+        self._generation = 0
+        self._lock = threading.Lock()
+
+    def get_or_load(self, key: Hashable, loader: Callable[[], Any]) -> Any:
+        found, value, future, generation = self._lookup(key)
+        if found:
+            return value
+        if generation is None:
+            return future.result()
+        try:
+            value = loader()
+        except BaseException as exc:
+            self._finish(key, future, generation, exc=exc)
+            raise
+        self._finish(key, future, generation, value=value)
+        return value
+
+    async def aget_or_load(
+        self, key: Hashable, loader: Callable[[], Awaitable[Any]]
+    ) -> Any:
+        found, value, future, generation = self._lookup(key)
+        if found:
+            return value
+        if generation is None:
+            return await asyncio.wrap_future(future)
+        try:
+            value = await loader()
+        except BaseException as exc:
+            self._finish(key, future, generation, exc=exc)
+            raise
+        self._finish(key, future, generation, value=value)
+        return value
+
+    def invalidate(self, key: Optional[Hashable] = None) -> None:
+        """Drop one key, or everything when no key is given."""
+        with self._lock:
+            self._generation += 1
+            if key is None:
+                self._values.clear()
+            else:
+                self._values.pop(key, None)
+
+    def _lookup(self, key):
+        """(found, value, future, generation); generation is set for the loader."""
+        with self._lock:
+            cached = self._values.get(key)
+            if cached is not None and cached[1] > time.monotonic():
+                return True, cached[0], None, None
+            future = self._inflight.get(key)
+            if future is not None:
+                return False, None, future, None
+            future = Future()
+            self._inflight[key] = future
+            return False, None, future, self._generation
+
+    def _finish(self, key, future: Future, generation: int, value=None, exc=None):
+        with self._lock:
+            self._inflight.pop(key, None)
+            if exc is None and generation == self._generation:
+                self._values[key] = (value, time.monotonic() + self.ttl_seconds)
+        if exc is None:
+            future.set_result(value)
+        else:
+            future.set_exception(exc)
@@ -1,5 +1,5 @@
 from pydantic_settings import BaseSettings, SettingsConfigDict
-from typing import List
+from typing import Dict, List, Optional
 
 class Settings(BaseSettings):
     # API Metadata
@@ -10,12 +10,124 @@ class Settings(BaseSettings):
     # Defaulting to the structure required for local SQL Server testing
     DATABASE_URL:str
 
+    # Async mode serves the leave, dashboard and holiday routers from an
+    # AsyncEngine. The async URL is derived from DATABASE_URL when not set
+    # (sqlite -> sqlite+aiosqlite, mssql+pyodbc -> mssql+aioodbc).
+    DB_ASYNC_MODE: bool = False
+    ASYNC_DATABASE_URL: Optional[str] = None
+
+    # Engines are created at startup; this many pooled connections are opened
+    # before the first request is served. DB_ECHO logs every SQL statement.
+    DB_POOL_WARMUP_CONNECTIONS: int = 2
+    DB_ECHO: bool = False
+
+    # Connection pool (per engine, per worker process). DB_POOL_PRE_PING tests
+    # every checkout with a round trip; with it off, liveness relies on
+    # DB_POOL_RECYCLE, which must stay below the server/firewall idle timeout.
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT_SECONDS: float = 30
+    DB_POOL_RECYCLE_SECONDS: int = 1800
+    DB_POOL_PRE_PING: bool = True
+
+    # Per-request SQL counts and timings (Server-Timing header and one log line
+    # per request); a statement shape run more than SQL_REPEAT_THRESHOLD times
+    # in one request is reported as a likely N+1
+    SQL_METRICS_ENABLED: bool = True
+    SQL_REPEAT_THRESHOLD: int = 3
+
     # JWT & Security
     # Default DurationInMinutes is 1440 (24 hours) as per documentation
     SECRET_KEY: str
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 1440
 
+    # Verified-token cache used by get_current_user (0 disables it)
+    TOKEN_CACHE_MAX_SIZE: int = 10000
+    TOKEN_CACHE_TTL_SECONDS: int = 300
+
+    # bcrypt process pool (0 workers runs bcrypt in the request threadpool)
+    PASSWORD_HASH_WORKERS: int = 2
+    PASSWORD_HASH_MAX_PENDING: int = 16
+    PASSWORD_HASH_RETRY_AFTER_SECONDS: int = 1
+
+    # Login admission: token buckets per client IP and per account, checked
+    # before the user lookup and bcrypt. BURST attempts pass straight away,
+    # then PER_MINUTE are refilled; rejected attempts get 429 + Retry-After.
+    LOGIN_RATE_LIMIT_ENABLED: bool = True
+    LOGIN_IP_BURST: int = 20
+    LOGIN_IP_PER_MINUTE: float = 30
+    LOGIN_ACCOUNT_BURST: int = 5
+    LOGIN_ACCOUNT_PER_MINUTE: float = 3
+
+    # State shared by the workers of a host (rate-limit buckets, counters):
+    # memory:// keeps it per process, sqlite:///path/state.db in a local file
+    SHARED_STATE_URL: str = "memory://"
+
+    # Employee bulk import: rows per INSERT batch (the duplicate check binds
+    # one parameter per row, so stay well below SQL Server's 2100 limit).
+    # BULK_IMPORT_BCRYPT_ROUNDS lowers the bcrypt cost of imported temporary
+    # passwords; they are re-hashed at the normal cost on first login.
+    BULK_IMPORT_BATCH_SIZE: int = 500
+    BULK_IMPORT_BCRYPT_ROUNDS: Optional[int] = None
+
+    # HR dashboard headline counts are shared for this long (write paths invalidate)
+    DASHBOARD_CACHE_TTL_SECONDS: int = 30
+    # Months of leave trends and approval turnaround in the dashboard summary
+    DASHBOARD_TREND_MONTHS: int = 12
+
+    # In-memory holiday calendar; holiday writes reload it immediately, the TTL
+    # bounds how long other workers keep serving an older copy
+    HOLIDAY_CALENDAR_TTL_SECONDS: int = 3600
+
+    # Items per /LeaveDetails/approveBatch call. Each item binds about five
+    # parameters, so this keeps the UPDATEs under SQL Server's 2100 limit.
+    LEAVE_APPROVAL_BATCH_MAX_ITEMS: int = 200
+
+    # Longest date window /LeaveDetails/TeamAvailability serves, in days
+    TEAM_AVAILABILITY_MAX_DAYS: int = 366
+
+    # Transactional outbox for leave lifecycle events (app.core.outbox).
+    # Sinks: "log" (the app.outbox logger), "file:///path/events.jsonl".
+    # With OUTBOX_WORKER_ENABLED off, run python -m app.commands.outbox_worker.
+    # Failed batches are retried after RETRY_BASE * 2^(attempt-1) seconds.
+    OUTBOX_SINKS: List[str] = ["log"]
+    OUTBOX_WORKER_ENABLED: bool = True
+    OUTBOX_BATCH_SIZE: int = 100
+    OUTBOX_POLL_SECONDS: float = 1.0
+    OUTBOX_LEASE_SECONDS: int = 60
+    OUTBOX_MAX_ATTEMPTS: int = 10
+    OUTBOX_RETRY_BASE_SECONDS: float = 2
+    OUTBOX_RETRY_MAX_SECONDS: float = 600
+
+    # List endpoints: keyset page sizes, and rows per chunk in NDJSON mode
+    PAGE_SIZE_DEFAULT: int = 100
+    PAGE_SIZE_MAX: int = 1000
+    STREAM_BATCH_SIZE: int = 1000
+    # Exports (app.core.export): rows per read transaction, and gzip level
+    EXPORT_CHUNK_ROWS: int = 20000
+    EXPORT_GZIP_LEVEL: int = 6
+
+    # Working days for leave durations, Monday first (numpy weekmask)
+    WORKING_WEEKMASK: str = "1111100"
+
+    # Leave types and their yearly allotment in days
+    LEAVE_TYPES: Dict[int, str] = {1: "Sick Leave", 2: "Casual Leave"}
+    LEAVE_TYPE_ALLOTMENTS: Dict[int, float] = {1: 6, 2: 6}
+    # "upfront": the yearly allotment is available from the first day of the
+    # year; "monthly": ledger rows open at 0 and
+    # `python -m app.commands.leave_accrual accrue` credits the monthly
+    # accrual (in steps of 0.1 days)
+    LEAVE_ALLOTMENT_MODE: str = "upfront"
+    LEAVE_TYPE_MONTHLY_ACCRUALS: Dict[int, float] = {1: 0.5, 2: 0.5}
+    # Unused days carried into the next year by `leave_accrual close`; the
+    # rest of the balance lapses
+    LEAVE_TYPE_CARRY_FORWARD_CAPS: Dict[int, float] = {1: 0, 2: 3}
+    # Employees per transaction in the accrual and year-end jobs
+    LEAVE_ACCRUAL_CHUNK_SIZE: int = 5000
+    # financialYearId is the calendar year in which the financial year starts
+    FINANCIAL_YEAR_START_MONTH: int = 4
+
     # Documentation Settings
     # This reflects the functional areas in the HR Module [cite: 9]
     TAGS_METADATA: List[dict] = [
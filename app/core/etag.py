@@ -0,0 +1,75 @@
+"""
+Strong ETags from per-resource version counters.
+
+Write paths bump a resource's counter in the shared state (see
+app.core.shared_state) after they commit; read endpoints derive the ETag
+from the counter and the request's variant (query parameters and the like)
+and answer a matching If-None-Match with 304 before loading or serializing
+anything:
+
+    tag = etag(LEAVE_SUMMARY, employee_id, variant=(financial_year,))
+    cached = not_modified(request, tag)
+    if cached:
+        return cached
+    response.headers.update(etag_headers(tag))
+
+Bumping after the commit means a reader may briefly tag new data with the
+old version, which only costs one more 200 later, never a stale 304. With
+the per-process memory:// backend counters are not shared, so more than one
+worker, or running the ledger jobs in app.commands against a live API, needs
+SHARED_STATE_URL pointing at a shared store.
+"""
+import hashlib
+from typing import Dict, Hashable, Optional, Tuple
+
+from fastapi import Request, Response
+
+from app.core.shared_state import get_shared_state
+
+# Resources with version counters
+LEAVE_SUMMARY = "leave-summary"
+HOLIDAYS = "holidays"
+# Bumped by bulk rebuilds: changes every ETag at once
+_GENERATION = "etag-generation"
+
+
+def _key(resource: str, ids: Tuple[Hashable, ...]) -> str:
+    return ":".join([resource, *(str(i) for i in ids)])
+
+
+def bump_version(resource: str, *ids: Hashable) -> None:
+    """Record that a resource (e.g. one employee's summary) has changed."""
+    get_shared_state().bump(_key(resource, ids))
+
+
+def bump_all_versions() -> None:
+    """Invalidate every ETag, after writes that bypass the per-resource bumps."""
+    get_shared_state().bump(_GENERATION)
+
+
+def etag(resource: str, *ids: Hashable, variant: Tuple[Hashable, ...] = ()) -> str:
+    state = get_shared_state()
+    key = _key(resource, ids)
+    version = state.counter(key)
+    generation = state.counter(_GENERATION)
+    fingerprint = hashlib.blake2b(
+        repr((state.epoch, generation, key, variant)).encode(), digest_size=8
+    ).hexdigest()
+    return f'"{fingerprint}-{version}"'
+
+
+def etag_headers(tag: str) -> Dict[str, str]:
+    # Clients may keep the body but must revalidate before using it
+    return {"ETag": tag, "Cache-Control": "private, no-cache"}
+
+
+def not_modified(request: Request, tag: str) -> Optional[Response]:
+    """A 304 response when If-None-Match lists the current tag, else None."""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return None
+    # If-None-Match uses the weak comparison: a W/ prefix does not matter
+    candidates = {value.strip().removeprefix("W/") for value in header.split(",")}
+    if "*" in candidates or tag in candidates:
+        return Response(status_code=304, headers=etag_headers(tag))
+    return None
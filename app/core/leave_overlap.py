@@ -0,0 +1,48 @@
+"""
+Overlap rules for leave requests.
+
+A request covers fromDate..toDate (both inclusive); a half day covers one
+session of a single date. Two requests of the same employee overlap when
+their date ranges intersect, unless both are half days of different
+sessions (FirstHalf and SecondHalf of one date can both be taken). Only
+Pending and Approved requests hold their dates.
+"""
+from datetime import date
+from typing import Iterable, Iterator, List, Optional, Protocol, Tuple
+
+# Requests that hold their dates; Rejected and Cancelled ones free them
+HOLDING_STATUSES = ("Pending", "Approved")
+
+
+class LeaveSpan(Protocol):
+    id: int
+    employeeId: object
+    fromDate: date
+    toDate: Optional[date]
+    leaveSession: Optional[str]
+
+
+def sessions_overlap(session: Optional[str], other: Optional[str]) -> bool:
+    """Sessions of two requests sharing a date clash (None is the whole day)."""
+    return session is None or other is None or session == other
+
+
+def sweep_overlaps(rows: Iterable[LeaveSpan]) -> Iterator[Tuple[LeaveSpan, LeaveSpan]]:
+    """
+    Overlapping pairs among rows sorted by (employeeId, fromDate). One pass:
+    each row is compared only with the employee's requests still open on its
+    fromDate, so the cost is O(n) plus the size of those small active sets
+    rather than O(n^2) comparisons.
+    """
+    employee_id = object()
+    active: List[Tuple[date, LeaveSpan]] = []
+    for row in rows:
+        if row.employeeId != employee_id:
+            employee_id = row.employeeId
+            active = []
+        start = row.fromDate
+        active = [(end, other) for end, other in active if end >= start]
+        for _, other in active:
+            if sessions_overlap(row.leaveSession, other.leaveSession):
+                yield other, row
+        active.append((row.toDate or start, row))
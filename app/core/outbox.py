@@ -0,0 +1,291 @@
+"""
+Transactional outbox for leave lifecycle events.
+
+The CRUDLeave write paths add an OutboxEvent to the session that changes the
+leave, so the event is committed (or rolled back) with the change itself and
+the request never waits on a downstream consumer. Delivery happens later:
+
+- claim: one short transaction takes the next due Pending events in id
+  order (skipping rows locked by another worker where the database supports
+  it) and pushes their availableAt out by OUTBOX_LEASE_SECONDS;
+- send: the batch goes to every configured sink, outside any transaction;
+- settle: the events are marked Sent, or rescheduled with exponential
+  backoff, and marked Failed after OUTBOX_MAX_ATTEMPTS.
+
+A worker that dies between claim and settle only delays its batch until the
+lease runs out. Delivery is at least once: a batch is resent to every sink
+when one of them fails, so consumers should deduplicate on the event id.
+
+Sinks are picked by OUTBOX_SINKS ("log", "file:///path/events.jsonl"); more
+can be added with register_sink(scheme, factory).
+"""
+import json
+import logging
+import threading
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Dict, Iterable, List, Optional
+
+from sqlalchemy import bindparam, delete, insert, select, update
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.outbox import OutboxEvent
+
+logger = logging.getLogger("app.outbox")
+
+
+def utcnow() -> datetime:
+    """Naive UTC, as stored in the outbox DateTime columns."""
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+def _iso(value) -> Optional[str]:
+    return value.isoformat() if value is not None else None
+
+
+def leave_payload(leave, **changes) -> dict:
+    """The event body for a leave request (ORM object or result row)."""
+    fields = {
+        "leaveId": leave.id,
+        "employeeId": str(leave.employeeId),
+        "leaveTypeId": leave.leaveTypeId,
+        "fromDate": _iso(leave.fromDate),
+        "toDate": _iso(leave.toDate),
+        "leaveSession": leave.leaveSession,
+        "leaveDays": leave.leaveDays,
+        "status": leave.status,
+        "approvedBy": getattr(leave, "approvedBy", None),
+    }
+    fields.update(changes)
+    if fields["approvedBy"] is not None:
+        fields["approvedBy"] = str(fields["approvedBy"])
+    return fields
+
+
+def enqueue(db: Session, event_type: str, payloads: Iterable[dict]) -> None:
+    """
+    Add events to the caller's transaction (one INSERT for the lot). The
+    caller commits; wake_worker() afterwards shortens the delivery delay.
+    """
+    now = utcnow()
+    rows = [
+        {
+            "eventType": event_type,
+            "aggregateId": payload["leaveId"],
+            "payload": payload,
+            "createdAt": now,
+            "status": "Pending",
+            "availableAt": now,
+            "attempts": 0,
+        }
+        for payload in payloads
+    ]
+    if rows:
+        db.execute(insert(OutboxEvent), rows)
+
+
+class LogSink:
+    """Writes each event to the app.outbox logger."""
+
+    def send(self, events: List[dict]) -> None:
+        for event in events:
+            logger.info(json.dumps(event))
+
+
+class FileSink:
+    """Appends events as JSON lines to a local file (tests, local runs)."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+
+    def send(self, events: List[dict]) -> None:
+        lines = "".join(json.dumps(event) + "\n" for event in events)
+        with self._lock, open(self.path, "a", encoding="utf-8") as f:
+            f.write(lines)
+
+
+_sinks: Dict[str, Callable[[str], object]] = {
+    "log": lambda rest: LogSink(),
+    "file": lambda rest: FileSink(rest),
+}
+
+
+def register_sink(scheme: str, factory: Callable[[str], object]) -> None:
+    """factory receives the part after "scheme://" and returns an object with send(events)."""
+    _sinks[scheme] = factory
+
+
+def open_sinks(urls: Iterable[str]) -> list:
+    sinks = []
+    for url in urls:
+        scheme, _, rest = url.partition("://")
+        if scheme not in _sinks:
+            raise ValueError(f"Unsupported outbox sink: {url!r}")
+        sinks.append(_sinks[scheme](rest))
+    return sinks
+
+
+def _backoff(attempts: int) -> timedelta:
+    seconds = settings.OUTBOX_RETRY_BASE_SECONDS * 2 ** (attempts - 1)
+    return timedelta(seconds=min(seconds, settings.OUTBOX_RETRY_MAX_SECONDS))
+
+
+def claim(db: Session, batch_size: int) -> List[dict]:
+    """Lease the next due events; returns them as plain dicts."""
+    now = utcnow()
+    events = db.execute(
+        select(
+            OutboxEvent.id,
+            OutboxEvent.eventType,
+            OutboxEvent.payload,
+            OutboxEvent.createdAt,
+            OutboxEvent.attempts,
+        )
+        .where(OutboxEvent.status == "Pending", OutboxEvent.availableAt <= now)
+        .order_by(OutboxEvent.id)
+        .limit(batch_size)
+        .with_for_update(skip_locked=True)
+    ).all()
+    if events:
+        db.execute(
+            update(OutboxEvent)
+            .where(OutboxEvent.id.in_([e.id for e in events]))
+            .values(availableAt=now + timedelta(seconds=settings.OUTBOX_LEASE_SECONDS))
+        )
+    db.commit()
+    return [
+        {
+            "id": e.id,
+            "type": e.eventType,
+            "createdAt": _iso(e.createdAt),
+            "attempt": e.attempts + 1,
+            **e.payload,
+        }
+        for e in events
+    ]
+
+
+def settle(db: Session, events: List[dict], error: Optional[str] = None) -> None:
+    """Mark a sent batch, or reschedule a failed one."""
+    now = utcnow()
+    if error is None:
+        db.execute(
+            update(OutboxEvent)
+            .where(OutboxEvent.id.in_([e["id"] for e in events]))
+            .values(status="Sent", sentAt=now, attempts=OutboxEvent.attempts + 1)
+        )
+    else:
+        table = OutboxEvent.__table__
+        db.connection().execute(
+            update(table)
+            .where(table.c.id == bindparam("b_id"))
+            .values(
+                status=bindparam("b_status"),
+                availableAt=bindparam("b_available"),
+                attempts=bindparam("b_attempts"),
+                lastError=error[:2000],
+            ),
+            [
+                {
+                    "b_id": e["id"],
+                    "b_status": (
+                        "Failed" if e["attempt"] >= settings.OUTBOX_MAX_ATTEMPTS else "Pending"
+                    ),
+                    "b_available": now + _backoff(e["attempt"]),
+                    "b_attempts": e["attempt"],
+                }
+                for e in events
+            ],
+        )
+    db.commit()
+
+
+def drain_once(session_factory, sinks: list, batch_size: Optional[int] = None) -> int:
+    """Claim, send and settle one batch. Returns the number of events claimed."""
+    with session_factory() as db:
+        events = claim(db, batch_size or settings.OUTBOX_BATCH_SIZE)
+    if not events:
+        return 0
+    error = None
+    try:
+        for sink in sinks:
+            sink.send(events)
+    except Exception as exc:
+        error = f"{type(exc).__name__}: {exc}"
+        logger.warning("Outbox batch of %d failed: %s", len(events), error)
+    with session_factory() as db:
+        settle(db, events, error)
+    return len(events)
+
+
+def purge_sent(db: Session, older_than: timedelta) -> int:
+    """Delete Sent events older than the given age; returns the count."""
+    deleted = db.execute(
+        delete(OutboxEvent).where(
+            OutboxEvent.status == "Sent", OutboxEvent.sentAt < utcnow() - older_than
+        )
+    ).rowcount
+    db.commit()
+    return deleted
+
+
+class OutboxWorker:
+    """
+    Background thread draining the outbox: full batches back to back, then
+    a wait of OUTBOX_POLL_SECONDS or until wake() is called.
+    """
+
+    def __init__(self, session_factory, sinks: list):
+        self.session_factory = session_factory
+        self.sinks = sinks
+        self._wakeup = threading.Event()
+        self._stopping = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        self._thread = threading.Thread(target=self._run, name="outbox-worker", daemon=True)
+        self._thread.start()
+
+    def wake(self) -> None:
+        self._wakeup.set()
+
+    def stop(self, timeout: float = 5) -> None:
+        self._stopping.set()
+        self._wakeup.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def _run(self) -> None:
+        while not self._stopping.is_set():
+            self._wakeup.clear()
+            try:
+                claimed = drain_once(self.session_factory, self.sinks)
+            except Exception:
+                logger.exception("Outbox worker iteration failed")
+                claimed = 0
+            if claimed < settings.OUTBOX_BATCH_SIZE:
+                self._wakeup.wait(settings.OUTBOX_POLL_SECONDS)
+
+
+_worker: Optional[OutboxWorker] = None
+
+
+def start_worker(session_factory) -> OutboxWorker:
+    global _worker
+    _worker = OutboxWorker(session_factory, open_sinks(settings.OUTBOX_SINKS))
+    _worker.start()
+    return _worker
+
+
+def stop_worker() -> None:
+    global _worker
+    if _worker is not None:
+        _worker.stop()
+        _worker = None
+
+
+def wake_worker() -> None:
+    """Tell the in-process worker (if any) that new events were committed."""
+    if _worker is not None:
+        _worker.wake()
@@ -0,0 +1,128 @@
+"""
+Keyset (cursor) pagination and NDJSON streaming for list endpoints.
+
+A page is ordered on indexed columns and the cursor holds the ordering
+values of its last row; the next page starts strictly after them, so deep
+pages cost the same as the first one and rows inserted meanwhile are
+neither skipped nor repeated. Cursors are opaque to clients.
+"""
+import base64
+import json
+from datetime import date
+from typing import Any, AsyncIterator, Callable, Iterator, List, Optional, Sequence
+
+from sqlalchemy import and_, or_
+from sqlalchemy.sql import Select
+
+from app.core.config import settings
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+
+class InvalidCursor(ValueError):
+    """The cursor was not issued by this API (or for another list)."""
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    payload = [v.isoformat() if isinstance(v, date) else v for v in values]
+    raw = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, types: Sequence[Callable[[Any], Any]]) -> List[Any]:
+    """Decode a cursor into ordering values, converting each with `types`."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        values = json.loads(raw)
+        if not isinstance(values, list) or len(values) != len(types):
+            raise ValueError(cursor)
+        return [convert(value) for convert, value in zip(types, values)]
+    except (ValueError, TypeError) as exc:
+        raise InvalidCursor(cursor) from exc
+
+
+def after(columns: Sequence, values: Sequence[Any]):
+    """
+    (c1, c2, ...) > (v1, v2, ...) spelled out with AND/OR, since SQL Server
+    has no row-value comparison. Expects ascending order on every column.
+    """
+    clauses = []
+    for i, column in enumerate(columns):
+        equal = [columns[j] == values[j] for j in range(i)]
+        clauses.append(and_(*equal, column > values[i]))
+    return or_(*clauses)
+
+
+def page_size(limit: Optional[int]) -> int:
+    return min(limit or settings.PAGE_SIZE_DEFAULT, settings.PAGE_SIZE_MAX)
+
+
+def keyset_page(
+    statement: Select,
+    columns: Sequence,
+    cursor_values: Optional[Sequence[Any]] = None,
+    limit: Optional[int] = None,
+) -> Select:
+    """
+    Order an unordered SELECT on `columns` and start after `cursor_values`.
+    With a limit, limit + 1 rows are fetched so split_page can tell whether
+    another page follows.
+    """
+    if cursor_values is not None:
+        statement = statement.where(after(columns, cursor_values))
+    statement = statement.order_by(*columns)
+    if limit is not None:
+        statement = statement.limit(limit + 1)
+    return statement
+
+
+def split_page(rows: List[Any], limit: int, key: Callable[[Any], Sequence[Any]]):
+    """(rows of this page, cursor for the next page or None)."""
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    return rows, encode_cursor(key(rows[-1]))
+
+
+def iter_ndjson(items: Sequence[Any], serialize: Callable[[Any], bytes]) -> Iterator[bytes]:
+    """NDJSON for rows already in memory, written STREAM_BATCH_SIZE at a time."""
+    size = settings.STREAM_BATCH_SIZE
+    for start in range(0, len(items), size):
+        yield b"".join(serialize(item) + b"\n" for item in items[start:start + size])
+
+
+def stream_ndjson(
+    statement: Select, serialize: Callable[[Any], bytes], scalars: bool = False
+) -> Iterator[bytes]:
+    """
+    Run `statement` on its own session and yield NDJSON, one partition of
+    STREAM_BATCH_SIZE rows at a time (ORM entities with scalars=True). The
+    stream outlives the endpoint function, so it does not borrow the
+    request's session.
+    """
+    from app.db.session import SessionLocal
+
+    with SessionLocal() as db:
+        result = db.execute(
+            statement.execution_options(yield_per=settings.STREAM_BATCH_SIZE)
+        )
+        if scalars:
+            result = result.scalars()
+        for partition in result.partitions():
+            yield b"".join(serialize(row) + b"\n" for row in partition)
+
+
+async def astream_ndjson(
+    statement: Select, serialize: Callable[[Any], bytes], scalars: bool = False
+) -> AsyncIterator[bytes]:
+    """stream_ndjson on the async engine (server-side cursor via stream())."""
+    from app.db.session import AsyncSessionLocal
+
+    async with AsyncSessionLocal() as db:
+        result = await db.stream(
+            statement.execution_options(yield_per=settings.STREAM_BATCH_SIZE)
+        )
+        if scalars:
+            result = result.scalars()
+        async for partition in result.partitions():
+            yield b"".join(serialize(row) + b"\n" for row in partition)
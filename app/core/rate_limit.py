@@ -0,0 +1,53 @@
+"""
+Login admission control.
+
+Every login attempt takes a token from two buckets in the shared state (see
+app.core.shared_state): one per client IP and one per account. A burst of
+attempts is let through, after which attempts are admitted at the refill
+rate. Rejections raise RateLimited before the user lookup and bcrypt, so a
+credential-stuffing burst costs a bucket update per attempt rather than a
+password verification. Password verification itself is capped separately
+by PASSWORD_HASH_MAX_PENDING (PasswordHashingBusy, 503).
+"""
+import math
+from typing import Optional
+
+from app.core.config import settings
+from app.core.shared_state import get_shared_state
+
+
+class RateLimited(Exception):
+    """Too many login attempts for this client or account."""
+
+    def __init__(self, retry_after: float):
+        super().__init__(retry_after)
+        self.retry_after = retry_after
+
+    @property
+    def retry_after_header(self) -> str:
+        return str(max(1, math.ceil(self.retry_after)))
+
+
+def check_login(client_ip: Optional[str], username: str) -> None:
+    """Admit one login attempt or raise RateLimited."""
+    if not settings.LOGIN_RATE_LIMIT_ENABLED:
+        return
+    state = get_shared_state()
+    # The IP bucket first: a client that is already throttled does not also
+    # drain the account's bucket
+    buckets = [
+        (
+            f"login:ip:{client_ip or 'unknown'}",
+            settings.LOGIN_IP_BURST,
+            settings.LOGIN_IP_PER_MINUTE,
+        ),
+        (
+            f"login:account:{username.strip().lower()}",
+            settings.LOGIN_ACCOUNT_BURST,
+            settings.LOGIN_ACCOUNT_PER_MINUTE,
+        ),
+    ]
+    for key, burst, per_minute in buckets:
+        retry_after = state.take(key, burst, per_minute / 60)
+        if retry_after:
+            raise RateLimited(retry_after)
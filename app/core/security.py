@@ -1,13 +1,29 @@
+import asyncio
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime, timedelta, timezone
-from typing import List
+from typing import List, Optional
 from jose import jwt
 from passlib.context import CryptContext
+from starlette.concurrency import run_in_threadpool
 from app.core.config import settings
 import uuid
 
 # Password hashing context
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
+# bcrypt is CPU bound, so it runs in its own process pool instead of the
+# Starlette threadpool. At most PASSWORD_HASH_MAX_PENDING jobs are admitted;
+# anything beyond that is rejected straight away rather than queued.
+_hash_pool: Optional[ProcessPoolExecutor] = None
+_hash_pool_lock = threading.Lock()
+_hash_slots = threading.BoundedSemaphore(settings.PASSWORD_HASH_MAX_PENDING)
+
+
+class PasswordHashingBusy(Exception):
+    """Raised when the password hashing pool is saturated."""
+
 def create_access_token(
     email: str,
     uid: str,
@@ -42,4 +58,123 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     return pwd_context.verify(plain_password, hashed_password)
 
 def get_password_hash(password: str) -> str:
-    return pwd_context.hash(password)
\ No newline at end of file
+    return pwd_context.hash(password)
+
+
+def _hash_passwords(passwords: List[str], rounds: Optional[int] = None) -> List[str]:
+    hasher = pwd_context.handler("bcrypt").using(rounds=rounds) if rounds else pwd_context
+    return [hasher.hash(p) for p in passwords]
+
+
+def password_needs_rehash(hashed_password: str) -> bool:
+    """True for hashes made below the context's default cost (bulk imports)."""
+    try:
+        rounds = int(hashed_password.split("$")[2])
+    except (IndexError, ValueError):
+        return False
+    return rounds < pwd_context.handler("bcrypt").default_rounds
+
+
+def _get_hash_pool() -> ProcessPoolExecutor:
+    global _hash_pool
+    if _hash_pool is None:
+        with _hash_pool_lock:
+            if _hash_pool is None:
+                # 'spawn' behaves the same on Linux and on Windows dev machines
+                # and does not fork a parent that already runs threads.
+                _hash_pool = ProcessPoolExecutor(
+                    max_workers=settings.PASSWORD_HASH_WORKERS,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+    return _hash_pool
+
+
+def _acquire_hash_slot() -> None:
+    if not _hash_slots.acquire(blocking=False):
+        raise PasswordHashingBusy()
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """
+    Verify a password on the hashing pool without holding a request thread.
+    Raises PasswordHashingBusy when the admission limit is reached.
+    """
+    _acquire_hash_slot()
+    try:
+        if settings.PASSWORD_HASH_WORKERS > 0:
+            future = _get_hash_pool().submit(
+                verify_password, plain_password, hashed_password
+            )
+            return await asyncio.wrap_future(future)
+        return await run_in_threadpool(verify_password, plain_password, hashed_password)
+    finally:
+        _hash_slots.release()
+
+
+async def get_password_hash_async(password: str) -> str:
+    """Async counterpart of get_password_hash_pooled for the async CRUD path."""
+    _acquire_hash_slot()
+    try:
+        if settings.PASSWORD_HASH_WORKERS > 0:
+            future = _get_hash_pool().submit(get_password_hash, password)
+            return await asyncio.wrap_future(future)
+        return await run_in_threadpool(get_password_hash, password)
+    finally:
+        _hash_slots.release()
+
+
+def get_password_hash_pooled(password: str) -> str:
+    """
+    Blocking variant for the sync CRUD paths: the calling thread waits on
+    the pool but does not burn CPU. Subject to the same admission limit.
+    """
+    _acquire_hash_slot()
+    try:
+        if settings.PASSWORD_HASH_WORKERS > 0:
+            return _get_hash_pool().submit(get_password_hash, password).result()
+        return get_password_hash(password)
+    finally:
+        _hash_slots.release()
+
+
+async def hash_passwords_async(
+    passwords: List[str], rounds: Optional[int] = None, chunk_size: int = 8
+) -> List[str]:
+    """
+    Hash a batch of passwords across the pool's workers, keeping results in
+    input order. Only one chunk per worker is in flight at a time so logins
+    queued behind a bulk import wait for a chunk, not for the whole batch.
+    The batch takes a single admission slot.
+    """
+    if not passwords:
+        return []
+    _acquire_hash_slot()
+    try:
+        chunks = [
+            passwords[i:i + chunk_size] for i in range(0, len(passwords), chunk_size)
+        ]
+        if settings.PASSWORD_HASH_WORKERS <= 0:
+            hashed = []
+            for chunk in chunks:
+                hashed.extend(await run_in_threadpool(_hash_passwords, chunk, rounds))
+            return hashed
+
+        pool = _get_hash_pool()
+        in_flight = asyncio.Semaphore(settings.PASSWORD_HASH_WORKERS)
+
+        async def run_chunk(chunk):
+            async with in_flight:
+                return await asyncio.wrap_future(pool.submit(_hash_passwords, chunk, rounds))
+
+        results = await asyncio.gather(*(run_chunk(chunk) for chunk in chunks))
+        return [h for chunk in results for h in chunk]
+    finally:
+        _hash_slots.release()
+
+
+def shutdown_password_pool() -> None:
+    global _hash_pool
+    with _hash_pool_lock:
+        if _hash_pool is not None:
+            _hash_pool.shutdown(wait=False, cancel_futures=True)
+            _hash_pool = None
@@ -0,0 +1,230 @@
+"""
+Small state shared by every worker process: token buckets for rate limiting
+and named counters.
+
+The backend is picked by SHARED_STATE_URL:
+
+    memory://                      one process only (the default)
+    sqlite:////var/run/hr/state.db a local SQLite file, shared by the uvicorn
+                                   workers of one host
+
+Each operation is one short transaction, so the SQLite file is never held
+locked between requests. Other stores can be plugged in with
+register_backend(scheme, factory).
+"""
+import sqlite3
+import threading
+import time
+import uuid
+from typing import Callable, Dict, Optional, Tuple
+
+from app.core.config import settings
+
+# Buckets that have refilled completely are dropped every this many takes
+_PRUNE_EVERY = 1000
+
+
+class SharedState:
+    """
+    Interface of a shared-state backend. `epoch` identifies the store
+    instance: it changes when the counters start again from zero.
+    `cross_process` is False for stores only the opening process sees.
+    """
+
+    epoch: str
+    cross_process = True
+
+    def take(self, key: str, capacity: float, refill_per_second: float) -> float:
+        """
+        Take one token from the bucket `key` (created full). Returns 0 when a
+        token was taken, else the seconds until one will be available.
+        """
+        raise NotImplementedError
+
+    def counter(self, key: str) -> int:
+        """Current value of a counter (0 if never bumped)."""
+        raise NotImplementedError
+
+    def bump(self, key: str) -> int:
+        """Increment a counter and return its new value."""
+        raise NotImplementedError
+
+    def clear(self) -> None:
+        raise NotImplementedError
+
+
+def _refill(
+    tokens: float, updated: float, now: float, capacity: float, refill_per_second: float
+) -> Tuple[float, float, float]:
+    """(tokens after the take, retry_after, time the bucket is full again)."""
+    tokens = min(capacity, tokens + (now - updated) * refill_per_second)
+    if tokens >= 1:
+        tokens -= 1
+        retry_after = 0.0
+    else:
+        retry_after = (1 - tokens) / refill_per_second
+    return tokens, retry_after, now + (capacity - tokens) / refill_per_second
+
+
+class MemoryState(SharedState):
+    cross_process = False
+
+    def __init__(self):
+        self.epoch = uuid.uuid4().hex
+        self._buckets: Dict[str, Tuple[float, float, float]] = {}
+        self._counters: Dict[str, int] = {}
+        self._takes = 0
+        self._lock = threading.Lock()
+
+    def take(self, key: str, capacity: float, refill_per_second: float) -> float:
+        now = time.monotonic()
+        with self._lock:
+            tokens, updated, _ = self._buckets.get(key, (capacity, now, now))
+            tokens, retry_after, full_at = _refill(
+                tokens, updated, now, capacity, refill_per_second
+            )
+            self._buckets[key] = (tokens, now, full_at)
+            self._takes += 1
+            if self._takes % _PRUNE_EVERY == 0:
+                self._buckets = {k: v for k, v in self._buckets.items() if v[2] > now}
+        return retry_after
+
+    def counter(self, key: str) -> int:
+        return self._counters.get(key, 0)
+
+    def bump(self, key: str) -> int:
+        with self._lock:
+            value = self._counters.get(key, 0) + 1
+            self._counters[key] = value
+        return value
+
+    def clear(self) -> None:
+        with self._lock:
+            self.epoch = uuid.uuid4().hex
+            self._buckets.clear()
+            self._counters.clear()
+
+
+class SQLiteState(SharedState):
+    """
+    State in a local SQLite file (WAL mode). Buckets use wall-clock time, as
+    monotonic clocks are not comparable between processes.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._local = threading.local()
+        self._takes = 0
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS buckets ("
+                "key TEXT PRIMARY KEY, tokens REAL NOT NULL, "
+                "updated REAL NOT NULL, full_at REAL NOT NULL)"
+            )
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS counters ("
+                "key TEXT PRIMARY KEY, value INTEGER NOT NULL)"
+            )
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL)"
+            )
+            conn.execute(
+                "INSERT OR IGNORE INTO meta (key, value) VALUES ('epoch', ?)",
+                (uuid.uuid4().hex,),
+            )
+            self.epoch = conn.execute("SELECT value FROM meta WHERE key = 'epoch'").fetchone()[0]
+
+    def _connect(self) -> sqlite3.Connection:
+        # One connection per thread; transactions are managed explicitly
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def take(self, key: str, capacity: float, refill_per_second: float) -> float:
+        conn = self._connect()
+        now = time.time()
+        # BEGIN IMMEDIATE takes the write lock up front: read-modify-write
+        # of one bucket is atomic across processes
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = conn.execute(
+                "SELECT tokens, updated FROM buckets WHERE key = ?", (key,)
+            ).fetchone()
+            tokens, updated = row if row else (capacity, now)
+            tokens, retry_after, full_at = _refill(
+                tokens, updated, now, capacity, refill_per_second
+            )
+            conn.execute(
+                "INSERT OR REPLACE INTO buckets (key, tokens, updated, full_at) "
+                "VALUES (?, ?, ?, ?)",
+                (key, tokens, now, full_at),
+            )
+            self._takes += 1
+            if self._takes % _PRUNE_EVERY == 0:
+                conn.execute("DELETE FROM buckets WHERE full_at <= ?", (now,))
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        return retry_after
+
+    def counter(self, key: str) -> int:
+        row = self._connect().execute(
+            "SELECT value FROM counters WHERE key = ?", (key,)
+        ).fetchone()
+        return row[0] if row else 0
+
+    def bump(self, key: str) -> int:
+        return self._connect().execute(
+            "INSERT INTO counters (key, value) VALUES (?, 1) "
+            "ON CONFLICT (key) DO UPDATE SET value = value + 1 RETURNING value",
+            (key,),
+        ).fetchone()[0]
+
+    def clear(self) -> None:
+        conn = self._connect()
+        self.epoch = uuid.uuid4().hex
+        conn.execute("DELETE FROM buckets")
+        conn.execute("DELETE FROM counters")
+        conn.execute("UPDATE meta SET value = ? WHERE key = 'epoch'", (self.epoch,))
+
+
+_backends: Dict[str, Callable[[str], SharedState]] = {
+    "memory": lambda rest: MemoryState(),
+    "sqlite": lambda rest: SQLiteState(rest[1:] if rest.startswith("/") else rest),
+}
+_state: Optional[SharedState] = None
+_state_lock = threading.Lock()
+
+
+def register_backend(scheme: str, factory: Callable[[str], SharedState]) -> None:
+    """factory receives the part of SHARED_STATE_URL after "scheme://"."""
+    _backends[scheme] = factory
+
+
+def open_state(url: str) -> SharedState:
+    scheme, separator, rest = url.partition("://")
+    if not separator or scheme not in _backends:
+        raise ValueError(f"Unsupported SHARED_STATE_URL: {url!r}")
+    return _backends[scheme](rest)
+
+
+def get_shared_state() -> SharedState:
+    """The process-wide backend, opened on first use."""
+    global _state
+    if _state is None:
+        with _state_lock:
+            if _state is None:
+                _state = open_state(settings.SHARED_STATE_URL)
+    return _state
+
+
+def reset_shared_state() -> None:
+    """Forget the backend (tests, or after changing SHARED_STATE_URL)."""
+    global _state
+    with _state_lock:
+        _state = None
@@ -0,0 +1,177 @@
+"""
+Per-request SQL instrumentation.
+
+SQLMetricsMiddleware counts the statements each request executes and their
+total execution time, on every engine (sync and async). Statements run more
+than SQL_REPEAT_THRESHOLD times with the same shape (the same SQL, IN lists
+collapsed) are flagged as likely N+1 patterns. Each response carries a
+Server-Timing header:
+
+    Server-Timing: db;dur=3.41;desc="2 queries"
+
+and one structured log line per request is written to the "app.sql" logger
+(at WARNING when repeats were found).
+
+query_budget() asserts a statement budget around a block of code, e.g. a
+TestClient call, in tests.
+"""
+import json
+import logging
+import re
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, List, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.core.config import settings
+
+logger = logging.getLogger("app.sql")
+
+_PARAM = r"(?:\?|%s|%\(\w+\)s|:\w+)"
+_IN_LIST = re.compile(rf"\(\s*{_PARAM}(?:\s*,\s*{_PARAM})+\s*\)")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def statement_shape(statement: str) -> str:
+    """The statement with whitespace normalised and IN lists collapsed."""
+    return _IN_LIST.sub("(?)", _WHITESPACE.sub(" ", statement).strip())
+
+
+class SQLStats:
+    """Statements seen by one request (or one query_budget block)."""
+
+    def __init__(self):
+        self.count = 0
+        self.total_ms = 0.0
+        self.shapes: Counter = Counter()
+        self._lock = threading.Lock()
+
+    def record(self, statement: str, elapsed_ms: float) -> None:
+        with self._lock:
+            self.count += 1
+            self.total_ms += elapsed_ms
+            self.shapes[statement_shape(statement)] += 1
+
+    def repeated(self, threshold: Optional[int] = None) -> List[dict]:
+        threshold = settings.SQL_REPEAT_THRESHOLD if threshold is None else threshold
+        return [
+            {"statement": shape, "count": count}
+            for shape, count in self.shapes.most_common()
+            if count > threshold
+        ]
+
+    def server_timing(self) -> str:
+        noun = "query" if self.count == 1 else "queries"
+        return f'db;dur={self.total_ms:.2f};desc="{self.count} {noun}"'
+
+
+_request_stats: ContextVar[Optional[SQLStats]] = ContextVar("sql_request_stats", default=None)
+# query_budget() blocks collect from every thread, not only the current context
+_captures: List[SQLStats] = []
+_installed = False
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if context is not None:
+        context._sql_metrics_started = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = getattr(context, "_sql_metrics_started", None)
+    if started is None:
+        return
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    stats = _request_stats.get()
+    if stats is not None:
+        stats.record(statement, elapsed_ms)
+    for capture in list(_captures):
+        capture.record(statement, elapsed_ms)
+
+
+def install() -> None:
+    """Listen on every Engine (AsyncEngines run on one too). Idempotent."""
+    global _installed
+    if not _installed:
+        event.listen(Engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(Engine, "after_cursor_execute", _after_cursor_execute)
+        _installed = True
+
+
+class SQLMetricsMiddleware:
+    """Pure ASGI middleware, so streamed bodies are measured to the end."""
+
+    def __init__(self, app):
+        self.app = app
+        install()
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        stats = SQLStats()
+        token = _request_stats.set(stats)
+        started = time.perf_counter()
+        status = None
+
+        async def send_with_timing(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                # Statements run while streaming the body come after this point
+                # and only show up in the log line
+                status = message["status"]
+                headers = list(message.get("headers", []))
+                headers.append((b"server-timing", stats.server_timing().encode()))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _request_stats.reset(token)
+            repeated = stats.repeated()
+            logger.log(
+                logging.WARNING if repeated else logging.INFO,
+                json.dumps(
+                    {
+                        "method": scope["method"],
+                        "path": scope["path"],
+                        "status": status,
+                        "queries": stats.count,
+                        "dbMs": round(stats.total_ms, 2),
+                        "durationMs": round((time.perf_counter() - started) * 1000, 2),
+                        "repeated": repeated,
+                    }
+                ),
+            )
+
+
+@contextmanager
+def query_budget(max_queries: int, max_repeats: Optional[int] = None) -> Iterator[SQLStats]:
+    """
+    Fail with AssertionError when the block runs more than max_queries
+    statements, or (with max_repeats) any statement shape more than
+    max_repeats times. Counts statements from every thread, so it also sees
+    requests served through TestClient.
+
+        with query_budget(1):
+            client.post("/api/v1.0/Account/login", data=...)
+    """
+    install()
+    stats = SQLStats()
+    _captures.append(stats)
+    try:
+        yield stats
+    finally:
+        _captures.remove(stats)
+    statements = "\n".join(f"  {n} x {shape}" for shape, n in stats.shapes.most_common())
+    assert stats.count <= max_queries, (
+        f"{stats.count} queries, budget {max_queries}:\n{statements}"
+    )
+    if max_repeats is not None:
+        repeated = stats.repeated(max_repeats)
+        assert not repeated, f"statement repeated more than {max_repeats} times:\n{statements}"
@@ -0,0 +1,177 @@
+import hmac
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Set
+from uuid import UUID
+from app.core.config import settings
+
+
+@dataclass
+class EmployeeSnapshot:
+    """
+    Detached copy of the Employee columns the auth dependencies hand to routes.
+    It is not bound to a Session, so it can be shared between requests.
+    """
+    employeeId: UUID
+    email: str
+    firstName: Optional[str] = None
+    lastName: Optional[str] = None
+    centerId: Optional[int] = None
+    department: Optional[str] = None
+    designation: Optional[str] = None
+    onBoardingStatus: Optional[str] = None
+    reportingOfficerId: Optional[UUID] = None
+    roles: List[str] = field(default_factory=list)
+    # Roles taken from the token claims (see get_current_user)
+    current_roles: List[str] = field(default_factory=list)
+
+    @classmethod
+    def from_employee(cls, employee, current_roles: List[str]) -> "EmployeeSnapshot":
+        return cls(
+            employeeId=employee.employeeId,
+            email=employee.email,
+            firstName=employee.firstName,
+            lastName=employee.lastName,
+            centerId=employee.centerId,
+            department=employee.department,
+            designation=employee.designation,
+            onBoardingStatus=employee.onBoardingStatus,
+            reportingOfficerId=employee.reportingOfficerId,
+            roles=list(employee.roles or []),
+            current_roles=list(current_roles or []),
+        )
+
+
+@dataclass
+class _Entry:
+    token: str
+    claims: dict
+    user: EmployeeSnapshot
+    expires_at: float
+
+
+class TokenCache:
+    """
+    Bounded LRU cache of verified access tokens, keyed by the 'jti' claim.
+
+    An entry lives for at most `ttl_seconds` and never beyond the token's own
+    'exp'. Entries are dropped as soon as the employee they belong to changes.
+    Every invalidation bumps the employee's generation: a miss reads it before
+    loading the employee and passes it to put(), which drops the entry if an
+    update was committed in between. The cache is process-local: with several workers, the TTL bounds how long
+    another worker can keep serving a changed employee.
+    """
+
+    def __init__(self, max_size: int, ttl_seconds: int):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, _Entry]" = OrderedDict()
+        self._by_employee: Dict[UUID, Set[str]] = {}
+        self._generations: Dict[UUID, int] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def get(self, jti: str, token: str) -> Optional[_Entry]:
+        """Return the entry for `jti` if it is fresh and was issued for `token`."""
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(jti)
+            if entry is None:
+                self.misses += 1
+                return None
+            # The jti was read without verifying the signature, so the cached
+            # entry only counts if it was verified for exactly this token.
+            if entry.expires_at <= now or not hmac.compare_digest(entry.token, token):
+                self._remove(jti)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(jti)
+            self.hits += 1
+            return entry
+
+    def generation(self, employee_id) -> int:
+        """Read before loading the employee on a miss; see put()."""
+        with self._lock:
+            return self._generations.get(employee_id, 0)
+
+    def put(
+        self,
+        jti: str,
+        token: str,
+        claims: dict,
+        user: EmployeeSnapshot,
+        generation: Optional[int] = None,
+    ) -> None:
+        """
+        Cache `user` for the token. With `generation` (from generation(),
+        read before the employee was loaded) a snapshot that an update has
+        invalidated in the meantime is not stored.
+        """
+        if self.max_size <= 0:
+            return
+        expires_at = time.time() + self.ttl_seconds
+        exp = claims.get("exp")
+        if exp is not None:
+            expires_at = min(expires_at, float(exp))
+
+        with self._lock:
+            if (
+                generation is not None
+                and self._generations.get(user.employeeId, 0) != generation
+            ):
+                return
+            if jti in self._entries:
+                self._remove(jti)
+            self._entries[jti] = _Entry(token, claims, user, expires_at)
+            self._by_employee.setdefault(user.employeeId, set()).add(jti)
+            while len(self._entries) > self.max_size:
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                self.evictions += 1
+
+    def invalidate_employee(self, employee_id) -> None:
+        """Drop every cached token that belongs to the given employee."""
+        with self._lock:
+            self._generations[employee_id] = self._generations.get(employee_id, 0) + 1
+            for jti in self._by_employee.pop(employee_id, set()):
+                if self._entries.pop(jti, None) is not None:
+                    self.invalidations += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._by_employee.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "maxSize": self.max_size,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hitRatio": round(self.hits / lookups, 4) if lookups else 0.0,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+            }
+
+    def _remove(self, jti: str) -> None:
+        entry = self._entries.pop(jti, None)
+        if entry is None:
+            return
+        jtis = self._by_employee.get(entry.user.employeeId)
+        if jtis is not None:
+            jtis.discard(jti)
+            if not jtis:
+                del self._by_employee[entry.user.employeeId]
+
+
+token_cache = TokenCache(
+    max_size=settings.TOKEN_CACHE_MAX_SIZE,
+    ttl_seconds=settings.TOKEN_CACHE_TTL_SECONDS,
+)
@@ -0,0 +1,188 @@
+from datetime import date, datetime, timezone
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from app.core.cache import CoalescingTTLCache
+from app.core.config import settings
+from app.models.employee import Employee
+from app.models.leave import LeaveRequest
+from app.models.rollup import ApprovalDailyRollup, DepartmentHeadcount, LeaveDailyRollup
+
+# Shared by every dashboard poller; write paths call invalidate_dashboard()
+dashboard_cache = CoalescingTTLCache(ttl_seconds=settings.DASHBOARD_CACHE_TTL_SECONDS)
+
+
+def invalidate_dashboard() -> None:
+    """Called by the leave and employee write paths after they commit."""
+    dashboard_cache.invalidate()
+
+
+def _overall_status_query(today: date):
+    """All four counts as scalar subqueries of one SELECT (one round trip)."""
+
+    def count(model, *criteria):
+        return select(func.count()).select_from(model).where(*criteria).scalar_subquery()
+
+    return select(
+        count(Employee).label("totalEmployees"),
+        count(Employee, Employee.onBoardingStatus == "Completed").label(
+            "activeEmployees"
+        ),
+        count(
+            LeaveRequest,
+            LeaveRequest.status == "Approved",
+            LeaveRequest.fromDate <= today,
+            LeaveRequest.toDate >= today,
+        ).label("onLeaveToday"),
+        count(LeaveRequest, LeaveRequest.status == "Pending").label(
+            "pendingLeaveRequests"
+        ),
+    )
+
+
+def _overall_status_payload(row) -> dict:
+    return {
+        **row._asdict(),
+        "asOf": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+    }
+
+
+def _trend_window(today: date, months: int):
+    """YYYYMM of the month `months - 1` months back and of this month."""
+    start = today.year * 12 + today.month - 1 - (months - 1)
+    return (start // 12) * 100 + start % 12 + 1, today.year * 100 + today.month
+
+
+def _summary_queries(today: date, months: int):
+    """
+    The summary from the rollup tables (app.crud.crud_rollup): each query
+    reads one clustered range of at most a row per day, department and
+    leave type in the window, however many leave requests there are.
+    """
+    start, end = _trend_window(today, months)
+    leaves = LeaveDailyRollup
+    approvals = ApprovalDailyRollup
+    return (
+        select(DepartmentHeadcount.department, DepartmentHeadcount.employees)
+        .where(DepartmentHeadcount.employees != 0)
+        .order_by(DepartmentHeadcount.department),
+        select(
+            leaves.month,
+            leaves.department,
+            leaves.leaveTypeId,
+            func.sum(leaves.pending),
+            func.sum(leaves.approved),
+            func.sum(leaves.rejected),
+            func.sum(leaves.cancelled),
+            func.sum(leaves.approvedDays),
+        )
+        .where(leaves.month >= start, leaves.month <= end)
+        .group_by(leaves.month, leaves.department, leaves.leaveTypeId)
+        .order_by(leaves.month, leaves.department, leaves.leaveTypeId),
+        select(
+            approvals.month,
+            approvals.department,
+            func.sum(approvals.decisions),
+            func.sum(approvals.approvals),
+            func.sum(approvals.timedDecisions),
+            func.sum(approvals.turnaroundMinutes),
+            func.sum(approvals.decidedWithinDay),
+        )
+        .where(approvals.month >= start, approvals.month <= end)
+        .group_by(approvals.month, approvals.department)
+        .order_by(approvals.month, approvals.department),
+    )
+
+
+def _month_label(month: int) -> str:
+    return f"{month // 100:04d}-{month % 100:02d}"
+
+
+def _summary_payload(headcounts, trends, turnaround) -> dict:
+    # Employees without a department are stored under "" and reported under None
+    return {
+        "departmentDistribution": {
+            department or None: employees for department, employees in headcounts
+        },
+        "monthlyLeaveTrends": [
+            {
+                "month": _month_label(month),
+                "department": department or None,
+                "leaveTypeId": leave_type_id,
+                "requests": pending + approved + rejected + cancelled,
+                "pending": pending,
+                "approved": approved,
+                "rejected": rejected,
+                "cancelled": cancelled,
+                "approvedDays": float(approved_days or 0),
+            }
+            for month, department, leave_type_id, pending, approved, rejected, cancelled,
+            approved_days in trends
+        ],
+        "approvalTurnaround": [
+            {
+                "month": _month_label(month),
+                "department": department or None,
+                "decisions": decisions,
+                "approvals": approved,
+                "averageHours": round(minutes / timed / 60, 1) if timed else None,
+                "decidedWithinDayRate": round(within_day / timed, 3) if timed else None,
+            }
+            for month, department, decisions, approved, timed, minutes, within_day in turnaround
+        ],
+        "asOf": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+    }
+
+
+class CRUDDashboard:
+    def get_overall_status(self, db: Session) -> dict:
+        """HR headline counts, served from the coalescing TTL cache."""
+        today = date.today()
+        return dashboard_cache.get_or_load(
+            ("overallstatus", today),
+            lambda: _overall_status_payload(
+                db.execute(_overall_status_query(today)).one()
+            ),
+        )
+
+    def get_summary(self, db: Session, months: int = None) -> dict:
+        """
+        Department distribution, monthly leave trends and approval turnaround
+        for the last `months` months (DASHBOARD_TREND_MONTHS), from the
+        rollups and through the same cache as the headline counts.
+        """
+        months = months or settings.DASHBOARD_TREND_MONTHS
+        today = date.today()
+        return dashboard_cache.get_or_load(
+            ("summary", today, months),
+            lambda: _summary_payload(
+                *(db.execute(query).all() for query in _summary_queries(today, months))
+            ),
+        )
+
+
+crud_dashboard = CRUDDashboard()
+
+
+class AsyncCRUDDashboard:
+    async def get_overall_status(self, db: AsyncSession) -> dict:
+        today = date.today()
+
+        async def load():
+            row = (await db.execute(_overall_status_query(today))).one()
+            return _overall_status_payload(row)
+
+        return await dashboard_cache.aget_or_load(("overallstatus", today), load)
+
+    async def get_summary(self, db: AsyncSession, months: int = None) -> dict:
+        months = months or settings.DASHBOARD_TREND_MONTHS
+        today = date.today()
+
+        async def load():
+            rows = [(await db.execute(query)).all() for query in _summary_queries(today, months)]
+            return _summary_payload(*rows)
+
+        return await dashboard_cache.aget_or_load(("summary", today, months), load)
+
+
+async_crud_dashboard = AsyncCRUDDashboard()
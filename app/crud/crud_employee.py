@@ -1,7 +1,14 @@
+from typing import List, Set
+from sqlalchemy import insert, select
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 from app.models.employee import Employee
 from app.schemas.employee import EmployeeCreate, EmployeeUpdate
-from app.core.security import get_password_hash
+from app.core.security import get_password_hash_pooled
+from app.core.token_cache import token_cache
+from app.crud.crud_dashboard import invalidate_dashboard
+from app.crud.crud_hierarchy import crud_hierarchy
+from app.crud.crud_rollup import crud_rollup
 
 class CRUDEmployee:
     def get_by_email(self, db: Session, email: str):
@@ -14,28 +21,35 @@ class CRUDEmployee:
 
     def create_super_admin(self, db: Session, obj_in: EmployeeCreate):
         """Initializes the one-time Super Admin."""
-        print(obj_in)
         db_obj = Employee(
             **obj_in.model_dump(exclude={"password"}),
-            hashed_password=get_password_hash(obj_in.password),
+            hashed_password=get_password_hash_pooled(obj_in.password),
             # roles=["SuperAdmin"],
             onBoardingStatus="Completed"
         )
         db.add(db_obj)
+        db.flush()
+        crud_hierarchy.add_employees(db, [(db_obj.employeeId, db_obj.reportingOfficerId)])
+        crud_rollup.employees_added(db, [db_obj.department])
         db.commit()
         db.refresh(db_obj)
+        invalidate_dashboard()
         return db_obj
 
     def create_employee(self, db: Session, obj_in: EmployeeCreate):
         """Admin creates a standard employee or HR Admin."""
         db_obj = Employee(
             **obj_in.model_dump(exclude={"password"}),
-            hashed_password=get_password_hash(obj_in.password),
+            hashed_password=get_password_hash_pooled(obj_in.password),
             onBoardingStatus="Pending" # Employees must change password later
         )
         db.add(db_obj)
+        db.flush()
+        crud_hierarchy.add_employees(db, [(db_obj.employeeId, db_obj.reportingOfficerId)])
+        crud_rollup.employees_added(db, [db_obj.department])
         db.commit()
         db.refresh(db_obj)
+        invalidate_dashboard()
         return db_obj
 
     def update_roles(self, db: Session, db_obj: Employee, roles: list):
@@ -43,25 +57,106 @@ class CRUDEmployee:
         db_obj.roles = roles
         db.commit()
         db.refresh(db_obj)
+        token_cache.invalidate_employee(db_obj.employeeId)
         return db_obj
 
     def update(self, db: Session, db_obj: Employee, obj_in: EmployeeUpdate):
         """Dynamically update employee fields."""
         update_data = obj_in.model_dump(exclude_unset=True)
+        if (
+            "reportingOfficerId" in update_data
+            and update_data["reportingOfficerId"] != db_obj.reportingOfficerId
+        ):
+            # Raises ReportingCycleError before anything is changed
+            crud_hierarchy.move_employee(
+                db, db_obj.employeeId, update_data["reportingOfficerId"]
+            )
+        if "department" in update_data:
+            crud_rollup.employee_moved(db, db_obj.department, update_data["department"])
         for field, value in update_data.items():
             setattr(db_obj, field, value)
 
         db.commit()
         db.refresh(db_obj)
+        token_cache.invalidate_employee(db_obj.employeeId)
+        invalidate_dashboard()
         return db_obj
 
+    def get_existing_ids(self, db: Session, ids) -> Set:
+        """Which of the given employeeIds exist (one query)."""
+        if not ids:
+            return set()
+        return set(
+            db.scalars(select(Employee.employeeId).where(Employee.employeeId.in_(ids)))
+        )
+
+    def get_existing_emails(self, db: Session, emails: List[str]) -> Set[str]:
+        """Which of the given emails are already registered (one query)."""
+        if not emails:
+            return set()
+        return set(db.scalars(select(Employee.email).where(Employee.email.in_(emails))))
+
+    def bulk_insert(self, db: Session, rows: List[dict]) -> Set[str]:
+        """
+        Insert prepared employee rows with one executemany and commit.
+        If another request registered one of the emails in the meantime, the
+        batch is retried without the clashing rows; their emails are returned.
+        """
+        if not rows:
+            return set()
+        def insert_rows(batch):
+            db.execute(insert(Employee), batch)
+            crud_hierarchy.add_employees(
+                db, [(r["employeeId"], r.get("reportingOfficerId")) for r in batch]
+            )
+            crud_rollup.employees_added(db, [r.get("department") for r in batch])
+            db.commit()
+
+        try:
+            insert_rows(rows)
+            skipped = set()
+        except IntegrityError:
+            db.rollback()
+            skipped = self.get_existing_emails(db, [r["email"] for r in rows])
+            remaining = [r for r in rows if r["email"] not in skipped]
+            if remaining:
+                insert_rows(remaining)
+        invalidate_dashboard()
+        return skipped
+
+    def export_query(self, department: str = None, center_id: int = None):
+        """
+        The roster for app.core.export (no credentials), keyed on employeeId.
+        Unordered: the export orders and chunks it.
+        """
+        query = select(
+            Employee.employeeId,
+            Employee.email,
+            Employee.firstName,
+            Employee.lastName,
+            Employee.mobileNo,
+            Employee.centerId,
+            Employee.department,
+            Employee.designation,
+            Employee.onBoardingStatus,
+            Employee.roles,
+            Employee.reportingOfficerId,
+        )
+        if department is not None:
+            query = query.where(Employee.department == department)
+        if center_id is not None:
+            query = query.where(Employee.centerId == center_id)
+        return query
+
     def deactivate(self, db: Session, db_obj: Employee):
         """Soft delete: change status to Inactive."""
         db_obj.onBordingStatus = "Inactive"
         db_obj.isActive = False
         db.commit()
         db.refresh(db_obj)
+        token_cache.invalidate_employee(db_obj.employeeId)
+        invalidate_dashboard()
         return db_obj
 
 # Instantiate the class for use in routes
-employee_crud = CRUDEmployee()
\ No newline at end of file
+employee_crud = CRUDEmployee()
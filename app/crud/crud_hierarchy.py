@@ -0,0 +1,182 @@
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Tuple
+from uuid import UUID
+from sqlalchemy import delete, func, insert, literal, select
+from sqlalchemy.orm import Session, aliased
+from app.models.employee import Employee
+from app.models.employee_hierarchy import EmployeeHierarchy
+from app.models.leave import LeaveRequest
+
+
+class ReportingCycleError(ValueError):
+    """The new reporting officer is the employee or one of their reports."""
+
+
+class CRUDHierarchy:
+    """
+    Keeps employee_hierarchy in step with Employee.reportingOfficerId.
+    add_employees and move_employee run inside the caller's transaction and
+    do not commit.
+    """
+
+    def add_employees(
+        self, db: Session, pairs: Iterable[Tuple[UUID, Optional[UUID]]]
+    ) -> None:
+        """
+        Insert closure rows for new employees, given (employeeId,
+        reportingOfficerId) pairs. Managers may be existing employees or
+        appear earlier or later in the same batch. Costs one SELECT and one
+        executemany.
+        """
+        managers = dict(pairs)
+        if not managers:
+            return
+        external = {m for m in managers.values() if m is not None and m not in managers}
+        chains: Dict[UUID, List[Tuple[UUID, int]]] = defaultdict(list)
+        if external:
+            for ancestor_id, descendant_id, depth in db.execute(
+                select(
+                    EmployeeHierarchy.ancestorId,
+                    EmployeeHierarchy.descendantId,
+                    EmployeeHierarchy.depth,
+                ).where(EmployeeHierarchy.descendantId.in_(external))
+            ):
+                chains[descendant_id].append((ancestor_id, depth))
+
+        def chain(employee_id, visiting=()):
+            """(ancestor, depth) pairs of employee_id, itself included."""
+            if employee_id in chains:
+                return chains[employee_id]
+            if employee_id in visiting:
+                raise ReportingCycleError(employee_id)
+            manager_id = managers.get(employee_id)
+            result = [(employee_id, 0)]
+            if manager_id is not None:
+                result += [
+                    (ancestor_id, depth + 1)
+                    for ancestor_id, depth in chain(manager_id, visiting + (employee_id,))
+                ]
+            chains[employee_id] = result
+            return result
+
+        rows = [
+            {"ancestorId": ancestor_id, "descendantId": employee_id, "depth": depth}
+            for employee_id in managers
+            for ancestor_id, depth in chain(employee_id)
+        ]
+        db.execute(insert(EmployeeHierarchy), rows)
+
+    def move_employee(
+        self, db: Session, employee_id: UUID, manager_id: Optional[UUID]
+    ) -> None:
+        """
+        Re-attach employee_id (and everyone under them) below manager_id.
+        Two set-based statements: unlink the subtree from its old ancestors,
+        then cross-join the new manager's ancestors with the subtree.
+        """
+        subtree = select(EmployeeHierarchy.descendantId).where(
+            EmployeeHierarchy.ancestorId == employee_id
+        )
+        if manager_id is not None and db.scalar(
+            select(func.count())
+            .select_from(EmployeeHierarchy)
+            .where(
+                EmployeeHierarchy.ancestorId == employee_id,
+                EmployeeHierarchy.descendantId == manager_id,
+            )
+        ):
+            raise ReportingCycleError(employee_id)
+
+        db.execute(
+            delete(EmployeeHierarchy)
+            .where(EmployeeHierarchy.descendantId.in_(subtree))
+            .where(EmployeeHierarchy.ancestorId.not_in(subtree))
+            .execution_options(synchronize_session=False)
+        )
+        if manager_id is None:
+            return
+        above = aliased(EmployeeHierarchy)
+        below = aliased(EmployeeHierarchy)
+        db.execute(
+            insert(EmployeeHierarchy).from_select(
+                ["ancestorId", "descendantId", "depth"],
+                select(
+                    above.ancestorId,
+                    below.descendantId,
+                    above.depth + below.depth + literal(1),
+                )
+                .select_from(above)
+                .join(below, below.ancestorId == employee_id)
+                .where(above.descendantId == manager_id),
+            )
+        )
+
+    def rebuild(self, db: Session, batch_size: int = 5000) -> int:
+        """
+        Regenerate the closure table from Employee.reportingOfficerId and
+        commit. Employees caught in a reporting cycle keep only the part of
+        their chain below the cycle. Returns the number of rows written.
+        """
+        managers = dict(
+            db.execute(select(Employee.employeeId, Employee.reportingOfficerId)).all()
+        )
+        chains: Dict[UUID, List[Tuple[UUID, int]]] = {}
+
+        def chain(employee_id):
+            # Iterative walk up the reporting line, reusing known chains
+            path = []
+            current = employee_id
+            while current is not None and current not in chains and current not in path:
+                path.append(current)
+                current = managers.get(current)
+            tail = chains.get(current, []) if current is not None else []
+            for node in reversed(path):
+                tail = [(node, 0)] + [(a, d + 1) for a, d in tail]
+                chains[node] = tail
+            return chains[employee_id]
+
+        db.execute(delete(EmployeeHierarchy))
+        written = 0
+        batch = []
+        for employee_id in managers:
+            for ancestor_id, depth in chain(employee_id):
+                batch.append(
+                    {"ancestorId": ancestor_id, "descendantId": employee_id, "depth": depth}
+                )
+            if len(batch) >= batch_size:
+                db.execute(insert(EmployeeHierarchy), batch)
+                written += len(batch)
+                batch = []
+        if batch:
+            db.execute(insert(EmployeeHierarchy), batch)
+            written += len(batch)
+        db.commit()
+        return written
+
+    def subtree_pending_query(self, manager_id: UUID):
+        """Pending requests of everyone below manager_id: one indexed join."""
+        return (
+            select(LeaveRequest)
+            .join(
+                EmployeeHierarchy, EmployeeHierarchy.descendantId == LeaveRequest.employeeId
+            )
+            .where(EmployeeHierarchy.ancestorId == manager_id, EmployeeHierarchy.depth > 0)
+            .where(LeaveRequest.status == "Pending")
+        )
+
+    def subtree_headcount(self, db: Session, manager_id: UUID) -> dict:
+        """Headcount below manager_id, in total and per reporting level."""
+        by_depth = dict(
+            db.execute(
+                select(EmployeeHierarchy.depth, func.count())
+                .where(
+                    EmployeeHierarchy.ancestorId == manager_id, EmployeeHierarchy.depth > 0
+                )
+                .group_by(EmployeeHierarchy.depth)
+                .order_by(EmployeeHierarchy.depth)
+            ).all()
+        )
+        return {"total": sum(by_depth.values()), "byDepth": by_depth}
+
+
+crud_hierarchy = CRUDHierarchy()
@@ -0,0 +1,179 @@
+import heapq
+import threading
+import time
+from bisect import bisect_left, bisect_right
+from collections import defaultdict
+from datetime import date
+from typing import Dict, Hashable, List, Optional, Tuple
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.core.etag import HOLIDAYS, bump_version
+from app.core.working_days import busday_calendar
+from app.models.holiday import Holiday
+from app.schemas.holiday import HolidayBase, HolidayCreate, HolidayUpdate
+
+
+class _HolidayIndex:
+    """Date-sorted holiday lists, overall and per centerId/stateId/holidayType."""
+
+    def __init__(self, holidays: List[HolidayBase]):
+        self.all = sorted(holidays, key=lambda h: (h.holidayDate, h.hrholidayId))
+        self.all_dates = [h.holidayDate for h in self.all]
+        self.all_keys = [(h.holidayDate, h.hrholidayId) for h in self.all]
+        groups: Dict[Hashable, List[HolidayBase]] = defaultdict(list)
+        for holiday in self.all:
+            if holiday.centerId is not None:
+                groups[("center", holiday.centerId)].append(holiday)
+            if holiday.stateId is not None:
+                groups[("state", holiday.stateId)].append(holiday)
+            if holiday.holidayType:
+                groups[("type", holiday.holidayType)].append(holiday)
+        self.groups: Dict[Hashable, Tuple[List[date], List[HolidayBase]]] = {
+            key: ([h.holidayDate for h in items], items) for key, items in groups.items()
+        }
+        # numpy business-day calendars per centerId, built on first use
+        self.busday_calendars = {}
+
+    def range(self, key: Optional[Hashable], start: date = None, end: date = None):
+        """Holidays of one group (or all) with start <= holidayDate <= end."""
+        if key is None:
+            dates, items = self.all_dates, self.all
+        else:
+            dates, items = self.groups.get(key, ([], []))
+        lo = bisect_left(dates, start) if start else 0
+        hi = bisect_right(dates, end) if end else len(dates)
+        return items[lo:hi]
+
+
+class HolidayCalendar:
+    """
+    Process-local index of active holidays.
+
+    Rows are loaded once and re-read only when the version is bumped by a
+    holiday write, or after HOLIDAY_CALENDAR_TTL_SECONDS so that writes made
+    by other workers are eventually picked up. Lookups never touch the DB.
+    """
+
+    def __init__(self, ttl_seconds: int):
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._version = 0
+        self._loaded_version: Optional[int] = None
+        self._loaded_at = 0.0
+        self._index = _HolidayIndex([])
+
+    def bump_version(self) -> None:
+        with self._lock:
+            self._version += 1
+
+    def is_stale(self) -> bool:
+        return (
+            self._loaded_version != self._version
+            or time.monotonic() - self._loaded_at > self.ttl_seconds
+        )
+
+    def ensure_loaded(self, db: Session) -> None:
+        if not self.is_stale():
+            return
+        with self._lock:
+            if not self.is_stale():
+                return
+            version = self._version
+            rows = db.query(Holiday).filter(Holiday.isActive == True).all()
+            self._index = _HolidayIndex([HolidayBase.model_validate(r) for r in rows])
+            self._loaded_version = version
+            self._loaded_at = time.monotonic()
+
+    def all_active(
+        self, after: Optional[Tuple[date, int]] = None, limit: int = None
+    ) -> List[HolidayBase]:
+        """Active holidays in (holidayDate, hrholidayId) order, keyset-paged."""
+        index = self._index
+        start = bisect_right(index.all_keys, tuple(after)) if after else 0
+        end = len(index.all) if limit is None else start + limit
+        return index.all[start:end]
+
+    def holidays_for(
+        self,
+        center_id: int = None,
+        state_id: int = None,
+        holiday_type: str = None,
+        start: date = None,
+        end: date = None,
+    ) -> List[HolidayBase]:
+        """Holidays matching every given filter, in date order."""
+        index = self._index
+        filters = [
+            (kind, value)
+            for kind, value in (("center", center_id), ("state", state_id), ("type", holiday_type))
+            if value is not None
+        ]
+        if not filters:
+            return index.range(None, start, end)
+        # Range-scan the first group and check the rest on the few survivors
+        first, rest = filters[0], filters[1:]
+        fields = {"center": "centerId", "state": "stateId", "type": "holidayType"}
+        return [
+            h
+            for h in index.range(first, start, end)
+            if all(getattr(h, fields[kind]) == value for kind, value in rest)
+        ]
+
+    def applicable(self, center_id: Optional[int], start: date = None, end: date = None):
+        """Center-specific plus National holidays in date order (no duplicates)."""
+        index = self._index
+        streams = [index.range(("type", "National"), start, end)]
+        if center_id is not None:
+            streams.append(index.range(("center", center_id), start, end))
+        seen = set()
+        merged = []
+        for holiday in heapq.merge(
+            *streams, key=lambda h: (h.holidayDate, h.hrholidayId)
+        ):
+            if holiday.hrholidayId not in seen:
+                seen.add(holiday.hrholidayId)
+                merged.append(holiday)
+        return merged
+
+    def upcoming_for_employee(self, center_id: Optional[int], today: date):
+        return self.applicable(center_id, start=today)
+
+    def busday_calendar(self, center_id: Optional[int]):
+        """numpy busdaycalendar of the holidays applicable to a center."""
+        index = self._index
+        calendar = index.busday_calendars.get(center_id)
+        if calendar is None:
+            calendar = busday_calendar(
+                {h.holidayDate for h in self.applicable(center_id)}
+            )
+            index.busday_calendars[center_id] = calendar
+        return calendar
+
+
+holiday_calendar = HolidayCalendar(ttl_seconds=settings.HOLIDAY_CALENDAR_TTL_SECONDS)
+
+
+class CRUDHoliday:
+    def get_by_id(self, db: Session, holiday_id: int):
+        return db.query(Holiday).filter(Holiday.hrholidayId == holiday_id).first()
+
+    def create(self, db: Session, obj_in: HolidayCreate):
+        db_obj = Holiday(**obj_in.model_dump())
+        db.add(db_obj)
+        db.commit()
+        db.refresh(db_obj)
+        holiday_calendar.bump_version()
+        bump_version(HOLIDAYS)
+        return db_obj
+
+    def update(self, db: Session, db_obj: Holiday, obj_in: HolidayUpdate):
+        for field, value in obj_in.model_dump(exclude_unset=True).items():
+            setattr(db_obj, field, value)
+        db.commit()
+        db.refresh(db_obj)
+        holiday_calendar.bump_version()
+        bump_version(HOLIDAYS)
+        return db_obj
+
+
+crud_holiday = CRUDHoliday()
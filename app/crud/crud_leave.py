@@ -1,13 +1,184 @@
+from collections import defaultdict
+from typing import List
+import numpy as np
+from sqlalchemy import bindparam, case, delete, func, insert, or_, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.core.etag import LEAVE_SUMMARY, bump_all_versions, bump_version, etag
+from app.core.leave_overlap import HOLDING_STATUSES, sweep_overlaps
+from app.core.outbox import enqueue, leave_payload, utcnow, wake_worker
+from app.core.pagination import keyset_page
+from app.core.team_availability import daily_availability
+from app.core.working_days import center_array, count_working_days_by_center, working_days
+from app.crud.crud_dashboard import invalidate_dashboard
+from app.crud.crud_hierarchy import crud_hierarchy
+from app.crud.crud_holiday import holiday_calendar
+from app.crud.crud_rollup import LeaveChange, crud_rollup
 from app.models.leave import LeaveRequest
+from app.models.leave_balance import LeaveBalance
 from app.models.employee import Employee
-from app.schemas.leave import LeaveCreate, HalfDayLeaveCreate, LeaveApproval
-from datetime import datetime
+from app.models.leave_accrual import LeaveAccrual
+from app.schemas.leave import (
+    LeaveCreate,
+    HalfDayLeaveCreate,
+    LeaveApproval,
+    LeaveApprovalResult,
+)
+from datetime import date, datetime
+
+
+def financial_year_id(day: date) -> int:
+    """Financial years are identified by the calendar year they start in."""
+    if day.month >= settings.FINANCIAL_YEAR_START_MONTH:
+        return day.year
+    return day.year - 1
+
+
+def opening_allotment(leave_type_id: int) -> float:
+    """Allotment a ledger row opens with, before any accrual postings."""
+    if settings.LEAVE_ALLOTMENT_MODE == "monthly":
+        return 0.0
+    return float(settings.LEAVE_TYPE_ALLOTMENTS.get(leave_type_id, 0))
+
+
+class LeaveStatusConflict(Exception):
+    """
+    The request to decide is no longer Pending, or a request in a batch
+    changed status while the batch was being applied.
+    """
+
+
+class LeaveOverlap(Exception):
+    """The new request overlaps pending or approved requests of the employee."""
+
+    def __init__(self, leave_ids: List[int]):
+        super().__init__(leave_ids)
+        self.leave_ids = leave_ids
+
+
+def _per_leave(values: dict):
+    """Column value for a multi-row UPDATE: a literal if uniform, else CASE id."""
+    distinct = set(values.values())
+    if len(distinct) == 1:
+        return distinct.pop()
+    return case(values, value=LeaveRequest.id)
+
+
+def _balance_share(status: str, days: float):
+    """(used, pending) contribution of a request in the given status."""
+    if status == "Approved":
+        return days, 0.0
+    if status == "Pending":
+        return 0.0, days
+    return 0.0, 0.0
 
 
 class CRUDLeave:
+    def placement(self, db: Session, employee_id, lock: bool = False) -> tuple:
+        """
+        (centerId, department) of the employee: one lookup per write. With
+        lock=True the employee row stays locked until the transaction ends,
+        serializing that employee's submissions.
+        """
+        query = select(Employee.centerId, Employee.department).where(
+            Employee.employeeId == employee_id
+        )
+        if lock:
+            query = query.with_for_update()
+        row = db.execute(query).first()
+        return tuple(row) if row else (None, None)
+
+    def working_days(
+        self, db: Session, center_id, from_date: date, to_date: date, leave_session: str = None
+    ) -> float:
+        """Working days a request consumes on the center's calendar."""
+        holiday_calendar.ensure_loaded(db)
+        return working_days(
+            from_date, to_date, leave_session, holiday_calendar.busday_calendar(center_id)
+        )
+
+    def cost_leaves(self, rows) -> np.ndarray:
+        """
+        Working days for a batch of rows carrying fromDate, toDate, leaveSession
+        and centerId, costed per center in one numpy pass each.
+        """
+        from_dates = np.array([r.fromDate for r in rows], dtype="datetime64[D]")
+        to_dates = np.array([r.toDate or r.fromDate for r in rows], dtype="datetime64[D]")
+        half_day = np.fromiter((bool(r.leaveSession) for r in rows), dtype=bool, count=len(rows))
+        return count_working_days_by_center(
+            from_dates,
+            to_dates,
+            half_day,
+            center_array([r.centerId for r in rows]),
+            holiday_calendar.busday_calendar,
+        )
+
+    def overlap_query(
+        self, employee_id, from_date: date, to_date: date, leave_session: str = None
+    ):
+        """
+        Pending/Approved requests of the employee overlapping the range (see
+        app.core.leave_overlap): one seek on ix_leaves_employeeId_status_fromDate.
+        """
+        query = select(LeaveRequest.id).where(
+            LeaveRequest.employeeId == employee_id,
+            LeaveRequest.status.in_(HOLDING_STATUSES),
+            LeaveRequest.fromDate <= to_date,
+            func.coalesce(LeaveRequest.toDate, LeaveRequest.fromDate) >= from_date,
+        )
+        if leave_session is not None:
+            # A half day only clashes with full days and the same session
+            query = query.where(
+                or_(
+                    LeaveRequest.leaveSession.is_(None),
+                    LeaveRequest.leaveSession == leave_session,
+                )
+            )
+        return query.order_by(LeaveRequest.id)
+
+    def check_overlap(
+        self, db: Session, employee_id, from_date: date, to_date: date, leave_session: str = None
+    ) -> None:
+        """Raise LeaveOverlap if the range collides with the employee's requests."""
+        clashes = db.scalars(
+            self.overlap_query(employee_id, from_date, to_date, leave_session)
+        ).all()
+        if clashes:
+            raise LeaveOverlap(list(clashes))
+
+    def audit_overlaps(self, db: Session, batch_size: int = 10000):
+        """
+        Every overlapping pair of Pending/Approved requests in the table, as
+        (earlier, later) rows: one ordered read and a sort-and-sweep pass
+        (see app.core.leave_overlap.sweep_overlaps).
+        """
+        rows = db.execute(
+            select(
+                LeaveRequest.id,
+                LeaveRequest.employeeId,
+                LeaveRequest.fromDate,
+                LeaveRequest.toDate,
+                LeaveRequest.leaveSession,
+                LeaveRequest.status,
+            )
+            .where(LeaveRequest.status.in_(HOLDING_STATUSES))
+            .order_by(LeaveRequest.employeeId, LeaveRequest.fromDate, LeaveRequest.id)
+            .execution_options(yield_per=batch_size)
+        )
+        yield from sweep_overlaps(rows)
+
     def create_full_day_leave(self, db: Session, obj_in: LeaveCreate):
         """Submit a full-day leave request[cite: 125, 130]."""
+        # Locked first: two submissions of one employee cannot both pass the
+        # overlap check before either is inserted
+        placement = self.placement(db, obj_in.employeeId, lock=True)
+        try:
+            self.check_overlap(db, obj_in.employeeId, obj_in.fromDate, obj_in.toDate)
+        except LeaveOverlap:
+            db.rollback()  # releases the lock
+            raise
         db_obj = LeaveRequest(
             employeeId=obj_in.employeeId,
             leaveTypeId=obj_in.leaveTypeId,
@@ -15,15 +186,31 @@ class CRUDLeave:
             toDate=obj_in.toDate,
             reason=obj_in.reason,
             financialYearId=obj_in.financialYearId,
+            leaveDays=self.working_days(db, placement[0], obj_in.fromDate, obj_in.toDate),
             status="Pending",  # Default status is Pending [cite: 132]
+            submittedAt=utcnow(),
         )
         db.add(db_obj)
+        self._apply_status_change(db, db_obj, old_status=None, placement=placement)
+        db.flush()  # assigns the id the event refers to
+        enqueue(db, "leave.submitted", [leave_payload(db_obj)])
         db.commit()
         db.refresh(db_obj)
+        invalidate_dashboard()
+        bump_version(LEAVE_SUMMARY, db_obj.employeeId)
+        wake_worker()
         return db_obj
 
     def create_half_day_leave(self, db: Session, obj_in: HalfDayLeaveCreate):
         """Submit a half-day leave request for a specific session[cite: 161, 166]."""
+        placement = self.placement(db, obj_in.employeeId, lock=True)
+        try:
+            self.check_overlap(
+                db, obj_in.employeeId, obj_in.leaveDate, obj_in.leaveDate, obj_in.leaveSession
+            )
+        except LeaveOverlap:
+            db.rollback()  # releases the lock
+            raise
         db_obj = LeaveRequest(
             employeeId=obj_in.employeeId,
             leaveTypeId=obj_in.leaveTypeId,
@@ -31,80 +218,759 @@ class CRUDLeave:
             toDate=obj_in.leaveDate,  # Same day for half-day [cite: 166]
             leaveSession=obj_in.leaveSession,  # "FirstHalf" or "SecondHalf" [cite: 166]
             reason=obj_in.reason,
+            financialYearId=obj_in.financialYearId or financial_year_id(obj_in.leaveDate),
+            leaveDays=self.working_days(
+                db, placement[0], obj_in.leaveDate, obj_in.leaveDate, obj_in.leaveSession
+            ),
             status="Pending",
+            submittedAt=utcnow(),
         )
         db.add(db_obj)
+        self._apply_status_change(db, db_obj, old_status=None, placement=placement)
+        db.flush()  # assigns the id the event refers to
+        enqueue(db, "leave.submitted", [leave_payload(db_obj)])
         db.commit()
         db.refresh(db_obj)
+        invalidate_dashboard()
+        bump_version(LEAVE_SUMMARY, db_obj.employeeId)
+        wake_worker()
         return db_obj
 
-    def get_leave_summary(self, db: Session, employee_id: int):
+    def get_leave_summary(self, db: Session, employee_id, financial_year: int = None):
         """Get comprehensive leave summary including balances by leave type[cite: 169, 177]."""
-        requests = (
-            db.query(LeaveRequest).filter(LeaveRequest.employeeId == employee_id).all()
+        # Single range read over the leave_balances primary key
+        balances = (
+            db.query(LeaveBalance)
+            .filter(
+                LeaveBalance.employeeId == employee_id,
+                LeaveBalance.financialYearId
+                == (financial_year or financial_year_id(date.today())),
+            )
+            .all()
         )
-        used = len([r for r in requests if r.status == "Approved"])
-        pending = len([r for r in requests if r.status == "Pending"])
+        return self.summarize(balances)
+
+    def summary_etag(self, employee_id, financial_year: int = None) -> str:
+        """ETag of get_leave_summary's result, without reading the database."""
+        return etag(
+            LEAVE_SUMMARY,
+            employee_id,
+            variant=(
+                financial_year or financial_year_id(date.today()),
+                settings.LEAVE_TYPES,
+                settings.LEAVE_TYPE_ALLOTMENTS,
+                settings.LEAVE_ALLOTMENT_MODE,
+            ),
+        )
+
+    def summarize(self, balances):
+        """Build the summary payload from an employee's ledger rows for one year."""
+        by_type = {b.leaveTypeId: b for b in balances}
+        breakdown = []
+        for leave_type_id in sorted(set(settings.LEAVE_TYPES) | set(by_type)):
+            balance = by_type.get(leave_type_id)
+            if balance is None:
+                # Nothing booked or accrued yet: the opening allotment is all available
+                allotted = opening_allotment(leave_type_id)
+                used, pending, available = 0.0, 0.0, allotted
+            else:
+                allotted, used = balance.allotted, balance.used
+                pending, available = balance.pending, balance.available
+            breakdown.append(
+                {
+                    "leaveTypeId": leave_type_id,
+                    "leaveType": settings.LEAVE_TYPES.get(
+                        leave_type_id, f"Leave Type {leave_type_id}"
+                    ),
+                    "total": allotted,
+                    "used": used,
+                    "pending": pending,
+                    "available": available,
+                }
+            )
 
         # Returns leave balance, used, and pending leaves [cite: 159, 175]
         return {
-            "totalLeaves": 12,
-            "usedLeaves": used,
-            "pendingLeaves": pending,
-            "availableLeaves": 12 - used,
-            "leaveTypeBreakdown": [
-                {"leaveType": "Sick Leave", "total": 6, "used": 1, "available": 5},
-                {
-                    "leaveType": "Casual Leave",
-                    "total": 6,
-                    "used": used - 1 if used > 0 else 0,
-                    "available": 5,
-                },
-            ],
+            "totalLeaves": sum(b["total"] for b in breakdown),
+            "usedLeaves": sum(b["used"] for b in breakdown),
+            "pendingLeaves": sum(b["pending"] for b in breakdown),
+            "availableLeaves": sum(b["available"] for b in breakdown),
+            "leaveTypeBreakdown": breakdown,
         }
 
     def approve_or_reject_leave(self, db: Session, obj_in: LeaveApproval):
-        """Reporting officer approves or rejects a leave request[cite: 143, 151]."""
+        """
+        Reporting officer approves or rejects a leave request[cite: 143, 151].
+        The row is locked while it is decided; raises LeaveStatusConflict
+        when it is no longer Pending.
+        """
         db_obj = (
             db.query(LeaveRequest)
             .filter(LeaveRequest.id == obj_in.hrEmployeeFullDayLeaveDetailsId)
+            .with_for_update()
             .first()
         )
         if db_obj:
+            if db_obj.status != "Pending":
+                db.rollback()
+                raise LeaveStatusConflict()
             # Updates status and records approval comments [cite: 148, 150]
             db_obj.status = "Approved" if obj_in.isApproved else "Rejected"
             db_obj.approvedBy = obj_in.approvedBy
             db_obj.approvalComments = obj_in.approvalComments
+            db_obj.decidedAt = utcnow()
+            self._apply_status_change(db, db_obj, old_status="Pending")
+            enqueue(db, f"leave.{db_obj.status.lower()}", [leave_payload(db_obj)])
             db.commit()
             db.refresh(db_obj)
+            invalidate_dashboard()
+            bump_version(LEAVE_SUMMARY, db_obj.employeeId)
+            wake_worker()
         return db_obj
 
-    def get_pending_by_manager(self, db: Session, manager_id: int):
-        """Returns all pending leave requests requiring approval from the reporting officer[cite: 187, 192]."""
+    def approve_or_reject_batch(
+        self, db: Session, items: List[LeaveApproval], approver_id, is_admin: bool = False
+    ) -> List[LeaveApprovalResult]:
+        """
+        Approve/reject many requests in one transaction. Costs one locking
+        SELECT, one UPDATE per outcome, one ledger read and executemany (plus
+        an INSERT opening any missing ledger rows), one outbox
+        INSERT per outcome and the rollup increments regardless of the number
+        of items. Items the approver may not decide, unknown or no longer
+        pending requests are reported and skipped.
+        """
+        leave_ids = {item.hrEmployeeFullDayLeaveDetailsId for item in items}
+        rows = {
+            row.id: row
+            for row in db.execute(
+                select(
+                    LeaveRequest.id,
+                    LeaveRequest.employeeId,
+                    LeaveRequest.leaveTypeId,
+                    LeaveRequest.financialYearId,
+                    LeaveRequest.fromDate,
+                    LeaveRequest.toDate,
+                    LeaveRequest.leaveSession,
+                    LeaveRequest.leaveDays,
+                    LeaveRequest.status,
+                    LeaveRequest.submittedAt,
+                    Employee.reportingOfficerId,
+                    Employee.centerId,
+                    Employee.department,
+                )
+                .join(Employee, LeaveRequest.employeeId == Employee.employeeId)
+                .where(LeaveRequest.id.in_(leave_ids))
+                .with_for_update()
+            )
+        }
+
+        results = []
+        decided = {"Approved": [], "Rejected": []}
+        seen = set()
+        for item in items:
+            leave_id = item.hrEmployeeFullDayLeaveDetailsId
+            row = rows.get(leave_id)
+            error = None
+            if leave_id in seen:
+                error = "Duplicate item in this batch"
+            elif row is None:
+                error = "Leave request not found"
+            elif not is_admin and (
+                item.approvedBy != approver_id or row.reportingOfficerId != approver_id
+            ):
+                error = "Unauthorized to approve this request"
+            elif row.status != "Pending":
+                error = f"Leave request is already {row.status}"
+            seen.add(leave_id)
+            if error:
+                results.append(
+                    LeaveApprovalResult(
+                        hrEmployeeFullDayLeaveDetailsId=leave_id, succeeded=False, error=error
+                    )
+                )
+                continue
+            outcome = "Approved" if item.isApproved else "Rejected"
+            decided[outcome].append((item, row))
+            results.append(
+                LeaveApprovalResult(
+                    hrEmployeeFullDayLeaveDetailsId=leave_id, succeeded=True, status=outcome
+                )
+            )
+
+        chosen = decided["Approved"] + decided["Rejected"]
+        if not chosen:
+            return results
+
+        decided_at = utcnow()
+        for outcome, pairs in decided.items():
+            if not pairs:
+                continue
+            ids = [row.id for _, row in pairs]
+            applied = db.execute(
+                update(LeaveRequest)
+                .where(LeaveRequest.id.in_(ids), LeaveRequest.status == "Pending")
+                .values(
+                    status=outcome,
+                    decidedAt=decided_at,
+                    approvedBy=_per_leave({row.id: item.approvedBy for item, row in pairs}),
+                    approvalComments=_per_leave(
+                        {row.id: item.approvalComments for item, row in pairs}
+                    ),
+                )
+                .execution_options(synchronize_session=False)
+            ).rowcount
+            if applied != len(ids):
+                db.rollback()
+                raise LeaveStatusConflict()
+
+        # Ledger: move each request's days out of pending, per (employee, year, type)
+        days = [row.leaveDays for _, row in chosen]
+        missing = [i for i, d in enumerate(days) if d is None]
+        if missing:
+            holiday_calendar.ensure_loaded(db)
+            costed = self.cost_leaves([chosen[i][1] for i in missing]).tolist()
+            for i, d in zip(missing, costed):
+                days[i] = d
+        deltas = defaultdict(lambda: [0.0, 0.0])
+        for (item, row), row_days in zip(chosen, days):
+            used, _ = _balance_share("Approved" if item.isApproved else "Rejected", row_days)
+            fy = row.financialYearId or financial_year_id(row.fromDate)
+            key = (row.employeeId, fy, row.leaveTypeId)
+            deltas[key][0] += used
+            deltas[key][1] -= row_days
+        self._open_ledger_rows(db, deltas)
+        balances = LeaveBalance.__table__
+        db.connection().execute(
+            update(balances)
+            .where(
+                (balances.c.employeeId == bindparam("b_employee"))
+                & (balances.c.financialYearId == bindparam("b_year"))
+                & (balances.c.leaveTypeId == bindparam("b_type"))
+            )
+            .values(
+                used=balances.c.used + bindparam("b_used"),
+                pending=balances.c.pending + bindparam("b_pending"),
+                available=balances.c.available - bindparam("b_used"),
+            ),
+            [
+                {
+                    "b_employee": employee_id,
+                    "b_year": fy,
+                    "b_type": leave_type_id,
+                    "b_used": used,
+                    "b_pending": pending,
+                }
+                for (employee_id, fy, leave_type_id), (used, pending) in deltas.items()
+            ],
+        )
+        crud_rollup.leaves_changed(
+            db,
+            [
+                LeaveChange(
+                    row.fromDate,
+                    row.leaveTypeId,
+                    row_days,
+                    row.department,
+                    "Pending",
+                    "Approved" if item.isApproved else "Rejected",
+                    row.submittedAt,
+                    decided_at,
+                )
+                for (item, row), row_days in zip(chosen, days)
+            ],
+        )
+        # One event per decided request, in the same transaction
+        events = defaultdict(list)
+        for (item, row), row_days in zip(chosen, days):
+            outcome = "Approved" if item.isApproved else "Rejected"
+            events[outcome].append(
+                leave_payload(row, leaveDays=row_days, status=outcome, approvedBy=item.approvedBy)
+            )
+        for outcome, payloads in events.items():
+            enqueue(db, f"leave.{outcome.lower()}", payloads)
+        db.commit()
+        invalidate_dashboard()
+        for employee_id in {employee_id for employee_id, _, _ in deltas}:
+            bump_version(LEAVE_SUMMARY, employee_id)
+        wake_worker()
+        return results
+
+    def export_query(
+        self, financial_year: int = None, department: str = None, center_id: int = None
+    ):
+        """
+        Leave requests with their employee's name and placement for
+        app.core.export, keyed on the request id (leaveId). Unordered: the
+        export orders and chunks it.
+        """
+        query = select(
+            LeaveRequest.id.label("leaveId"),
+            LeaveRequest.employeeId,
+            Employee.firstName,
+            Employee.lastName,
+            Employee.email,
+            Employee.department,
+            Employee.centerId,
+            LeaveRequest.leaveTypeId,
+            LeaveRequest.fromDate,
+            LeaveRequest.toDate,
+            LeaveRequest.leaveSession,
+            LeaveRequest.leaveDays,
+            LeaveRequest.status,
+            LeaveRequest.financialYearId,
+            LeaveRequest.reason,
+            LeaveRequest.approvedBy,
+            LeaveRequest.approvalComments,
+        ).join(Employee, LeaveRequest.employeeId == Employee.employeeId)
+        if financial_year is not None:
+            query = query.where(LeaveRequest.financialYearId == financial_year)
+        if department is not None:
+            query = query.where(Employee.department == department)
+        if center_id is not None:
+            query = query.where(Employee.centerId == center_id)
+        return query
+
+    def pending_by_manager_query(self, manager_id, after_id: int = None, limit: int = None):
+        """Pending requests of a manager's team in id order, starting after after_id."""
         # Join with Employee to find team members reporting to this specific manager [cite: 116, 117]
-        return (
-            db.query(LeaveRequest)
+        query = (
+            select(LeaveRequest)
             .join(Employee, LeaveRequest.employeeId == Employee.employeeId)
-            .filter(Employee.reportingOfficerId == manager_id)
-            .filter(LeaveRequest.status == "Pending")
-            .all()
+            .where(Employee.reportingOfficerId == manager_id)
+            .where(LeaveRequest.status == "Pending")
+        )
+        return keyset_page(
+            query, [LeaveRequest.id], None if after_id is None else [after_id], limit
+        )
+
+    def get_pending_by_manager(
+        self, db: Session, manager_id: int, after_id: int = None, limit: int = None
+    ):
+        """Returns pending leave requests requiring approval from the reporting officer[cite: 187, 192]."""
+        return db.scalars(self.pending_by_manager_query(manager_id, after_id, limit)).all()
+
+    def pending_in_subtree_query(self, manager_id, after_id: int = None, limit: int = None):
+        """Pending requests of everyone below the manager, at any depth, in id order."""
+        return keyset_page(
+            crud_hierarchy.subtree_pending_query(manager_id),
+            [LeaveRequest.id],
+            None if after_id is None else [after_id],
+            limit,
         )
 
+    def get_pending_in_subtree(
+        self, db: Session, manager_id, after_id: int = None, limit: int = None
+    ):
+        return db.scalars(self.pending_in_subtree_query(manager_id, after_id, limit)).all()
+
+    def availability_query(
+        self, from_date: date, to_date: date, reporting_officer_id=None, department: str = None
+    ):
+        """
+        Pending/Approved requests intersecting the window, of a reporting
+        officer's direct reports or of a department, with the names to show,
+        in the column order daily_availability() unpacks.
+        Seeks employees on reportingOfficerId/department, then each member's
+        requests on ix_leaves_employeeId_status_fromDate.
+        """
+        query = (
+            select(
+                LeaveRequest.id,
+                LeaveRequest.employeeId,
+                Employee.firstName,
+                Employee.lastName,
+                LeaveRequest.fromDate,
+                LeaveRequest.toDate,
+                LeaveRequest.leaveSession,
+                LeaveRequest.status,
+            )
+            .join(Employee, LeaveRequest.employeeId == Employee.employeeId)
+            .where(
+                LeaveRequest.status.in_(HOLDING_STATUSES),
+                LeaveRequest.fromDate <= to_date,
+                func.coalesce(LeaveRequest.toDate, LeaveRequest.fromDate) >= from_date,
+            )
+        )
+        if reporting_officer_id is not None:
+            query = query.where(Employee.reportingOfficerId == reporting_officer_id)
+        if department is not None:
+            query = query.where(Employee.department == department)
+        return query.order_by(
+            Employee.firstName, Employee.lastName, LeaveRequest.employeeId, LeaveRequest.fromDate
+        )
+
+    def get_team_availability(
+        self,
+        db: Session,
+        from_date: date,
+        to_date: date,
+        reporting_officer_id=None,
+        department: str = None,
+    ) -> List[dict]:
+        """Per-day absence counts and absentees (see app.core.team_availability)."""
+        rows = db.execute(
+            self.availability_query(from_date, to_date, reporting_officer_id, department)
+        ).all()
+        return daily_availability(rows, from_date, to_date)
+
     def cancel_leave(self, db: Session, leave_id: int, employee_id: int):
         """Internal logic to cancel a pending leave request before it is processed[cite: 141]."""
         db_obj = (
             db.query(LeaveRequest)
             .filter(LeaveRequest.id == leave_id, LeaveRequest.employeeId == employee_id)
+            .with_for_update()
             .first()
         )
 
         # Only allows cancellation if the request has not been approved/rejected yet
         if db_obj and db_obj.status == "Pending":
             db_obj.status = "Cancelled"
+            self._apply_status_change(db, db_obj, old_status="Pending")
+            enqueue(db, "leave.cancelled", [leave_payload(db_obj)])
             db.commit()
             db.refresh(db_obj)
+            invalidate_dashboard()
+            bump_version(LEAVE_SUMMARY, db_obj.employeeId)
+            wake_worker()
             return db_obj
         return None
 
+    def rebuild_balances(
+        self, db: Session, financial_year: int = None, recost: bool = False
+    ) -> int:
+        """
+        Recompute leave_balances from leave history (all years, or one).
+        Requests without a stored leaveDays are costed on the way; with
+        recost=True every Pending/Approved request is re-costed against the
+        current holiday calendars. Allotments are the opening allotment plus
+        the postings of the accrual jobs (leave_accruals). Returns the number
+        of ledger rows written.
+        """
+        query = (
+            select(
+                LeaveRequest.id,
+                LeaveRequest.employeeId,
+                LeaveRequest.leaveTypeId,
+                LeaveRequest.financialYearId,
+                LeaveRequest.fromDate,
+                LeaveRequest.toDate,
+                LeaveRequest.leaveSession,
+                LeaveRequest.leaveDays,
+                LeaveRequest.status,
+                Employee.centerId,
+            )
+            .outerjoin(Employee, LeaveRequest.employeeId == Employee.employeeId)
+            .where(LeaveRequest.status.in_(["Pending", "Approved"]))
+        )
+        if financial_year is not None:
+            query = query.where(LeaveRequest.financialYearId == financial_year)
+
+        holiday_calendar.ensure_loaded(db)
+        recost_days = (
+            update(LeaveRequest.__table__)
+            .where(LeaveRequest.__table__.c.id == bindparam("b_id"))
+            .values(leaveDays=bindparam("b_days"))
+        )
+        totals = defaultdict(lambda: [0.0, 0.0])
+        backfill = []
+        result = db.execute(query.execution_options(yield_per=5000))
+        for rows in result.partitions():
+            days = [row.leaveDays for row in rows]
+            stale = [i for i, d in enumerate(days) if recost or d is None]
+            if stale:
+                costed = self.cost_leaves([rows[i] for i in stale]).tolist()
+                for i, new_days in zip(stale, costed):
+                    if days[i] != new_days:
+                        backfill.append({"b_id": rows[i].id, "b_days": new_days})
+                        days[i] = new_days
+            for row, row_days in zip(rows, days):
+                fy = row.financialYearId or financial_year_id(row.fromDate)
+                used, pending = _balance_share(row.status, row_days)
+                key = (row.employeeId, fy, row.leaveTypeId)
+                totals[key][0] += used
+                totals[key][1] += pending
+
+        # Written after the stream is drained: the connection is still busy
+        # with the server-side cursor until then
+        if backfill:
+            db.connection().execute(recost_days, backfill)
+
+        # Allotments: the opening allotment plus the accrual job postings
+        posted = select(
+            LeaveAccrual.employeeId,
+            LeaveAccrual.financialYearId,
+            LeaveAccrual.leaveTypeId,
+            func.sum(LeaveAccrual.days),
+        ).group_by(
+            LeaveAccrual.employeeId, LeaveAccrual.financialYearId, LeaveAccrual.leaveTypeId
+        )
+        if financial_year is not None:
+            posted = posted.where(LeaveAccrual.financialYearId == financial_year)
+        accrued = {
+            (employee_id, fy, leave_type_id): days
+            for employee_id, fy, leave_type_id, days in db.execute(posted)
+        }
+        for key in accrued:
+            # Accrued but never booked: still gets its ledger row
+            totals.setdefault(key, [0.0, 0.0])
+
+        clear = delete(LeaveBalance)
+        if financial_year is not None:
+            clear = clear.where(LeaveBalance.financialYearId == financial_year)
+        db.execute(clear)
+
+        rows = []
+        for key, (used, pending) in totals.items():
+            employee_id, fy, leave_type_id = key
+            allotted = opening_allotment(leave_type_id) + accrued.get(key, 0.0)
+            rows.append(
+                {
+                    "employeeId": employee_id,
+                    "financialYearId": fy,
+                    "leaveTypeId": leave_type_id,
+                    "allotted": allotted,
+                    "used": used,
+                    "pending": pending,
+                    "available": allotted - used,
+                }
+            )
+        if rows:
+            db.execute(insert(LeaveBalance), rows)
+        db.commit()
+        bump_all_versions()
+        return len(rows)
+
+    def _open_ledger_rows(self, db: Session, keys) -> None:
+        """
+        Open the leave_balances rows missing among (employeeId, financialYearId,
+        leaveTypeId) keys, at the opening allotment plus accrual postings and
+        nothing booked, so that an increment by key has a row to land on.
+        """
+        keys = set(keys)
+        employee_ids = {employee_id for employee_id, _, _ in keys}
+        years = {fy for _, fy, _ in keys}
+        existing = {
+            tuple(row)
+            for row in db.execute(
+                select(
+                    LeaveBalance.employeeId, LeaveBalance.financialYearId, LeaveBalance.leaveTypeId
+                ).where(
+                    LeaveBalance.employeeId.in_(employee_ids),
+                    LeaveBalance.financialYearId.in_(years),
+                )
+            )
+        }
+        absent = keys - existing
+        if not absent:
+            return
+
+        accrued = {
+            (employee_id, fy, leave_type_id): posted
+            for employee_id, fy, leave_type_id, posted in db.execute(
+                select(
+                    LeaveAccrual.employeeId,
+                    LeaveAccrual.financialYearId,
+                    LeaveAccrual.leaveTypeId,
+                    func.sum(LeaveAccrual.days),
+                )
+                .where(
+                    LeaveAccrual.employeeId.in_({employee_id for employee_id, _, _ in absent}),
+                    LeaveAccrual.financialYearId.in_({fy for _, fy, _ in absent}),
+                )
+                .group_by(
+                    LeaveAccrual.employeeId,
+                    LeaveAccrual.financialYearId,
+                    LeaveAccrual.leaveTypeId,
+                )
+            )
+        }
+        rows = []
+        for key in absent:
+            employee_id, fy, leave_type_id = key
+            allotted = opening_allotment(leave_type_id) + accrued.get(key, 0.0)
+            rows.append(
+                {
+                    "employeeId": employee_id,
+                    "financialYearId": fy,
+                    "leaveTypeId": leave_type_id,
+                    "allotted": allotted,
+                    "used": 0.0,
+                    "pending": 0.0,
+                    "available": allotted,
+                }
+            )
+        # A concurrent first booking may open some of them first; then open
+        # the rest one by one and leave the winners' rows alone
+        try:
+            with db.begin_nested():
+                db.execute(insert(LeaveBalance), rows)
+        except IntegrityError:
+            for row in rows:
+                try:
+                    with db.begin_nested():
+                        db.execute(insert(LeaveBalance), [row])
+                except IntegrityError:
+                    pass
+
+    def _apply_status_change(
+        self, db: Session, leave: LeaveRequest, old_status, placement: tuple = None
+    ):
+        """
+        Move the request's days between the pending and used columns of its
+        ledger row and count the change into the dashboard rollups. Runs
+        inside the caller's transaction. `placement` is the employee's
+        (centerId, department) when the caller has already read it.
+        """
+        center_id, department = placement or self.placement(db, leave.employeeId)
+        days = leave.leaveDays
+        if days is None:
+            days = self.working_days(
+                db, center_id, leave.fromDate, leave.toDate, leave.leaveSession
+            )
+        crud_rollup.leaves_changed(
+            db,
+            [
+                LeaveChange(
+                    leave.fromDate,
+                    leave.leaveTypeId,
+                    days,
+                    department,
+                    old_status,
+                    leave.status,
+                    leave.submittedAt,
+                    leave.decidedAt,
+                )
+            ],
+        )
+        old_used, old_pending = _balance_share(old_status, days)
+        new_used, new_pending = _balance_share(leave.status, days)
+        used, pending = new_used - old_used, new_pending - old_pending
+        if not used and not pending:
+            return
+
+        fy = leave.financialYearId or financial_year_id(leave.fromDate)
+        key = (
+            (LeaveBalance.employeeId == leave.employeeId)
+            & (LeaveBalance.financialYearId == fy)
+            & (LeaveBalance.leaveTypeId == leave.leaveTypeId)
+        )
+        increment = (
+            update(LeaveBalance)
+            .where(key)
+            .values(
+                used=LeaveBalance.used + used,
+                pending=LeaveBalance.pending + pending,
+                available=LeaveBalance.available - used,
+            )
+        )
+        if db.execute(increment).rowcount:
+            return
+
+        # First booking for this (employee, year, type): open the ledger row.
+        # A concurrent first booking may win the insert; fall back to the update.
+        allotted = opening_allotment(leave.leaveTypeId) + db.scalar(
+            select(func.coalesce(func.sum(LeaveAccrual.days), 0.0)).where(
+                LeaveAccrual.employeeId == leave.employeeId,
+                LeaveAccrual.financialYearId == fy,
+                LeaveAccrual.leaveTypeId == leave.leaveTypeId,
+            )
+        )
+        try:
+            with db.begin_nested():
+                db.add(
+                    LeaveBalance(
+                        employeeId=leave.employeeId,
+                        financialYearId=fy,
+                        leaveTypeId=leave.leaveTypeId,
+                        allotted=allotted,
+                        used=used,
+                        pending=pending,
+                        available=allotted - used,
+                    )
+                )
+        except IntegrityError:
+            db.execute(increment)
+
 
 crud_leave = CRUDLeave()
+
+
+class AsyncCRUDLeave:
+    """
+    CRUDLeave for AsyncSession. Reads are issued natively; write paths run the
+    sync implementation through run_sync so both modes share one set of rules.
+    """
+
+    async def create_full_day_leave(self, db: AsyncSession, obj_in: LeaveCreate):
+        return await db.run_sync(crud_leave.create_full_day_leave, obj_in=obj_in)
+
+    async def create_half_day_leave(self, db: AsyncSession, obj_in: HalfDayLeaveCreate):
+        return await db.run_sync(crud_leave.create_half_day_leave, obj_in=obj_in)
+
+    async def get_leave_summary(
+        self, db: AsyncSession, employee_id, financial_year: int = None
+    ):
+        balances = (
+            await db.scalars(
+                select(LeaveBalance).where(
+                    LeaveBalance.employeeId == employee_id,
+                    LeaveBalance.financialYearId
+                    == (financial_year or financial_year_id(date.today())),
+                )
+            )
+        ).all()
+        return crud_leave.summarize(balances)
+
+    async def approve_or_reject_leave(self, db: AsyncSession, obj_in: LeaveApproval):
+        return await db.run_sync(crud_leave.approve_or_reject_leave, obj_in=obj_in)
+
+    async def approve_or_reject_batch(
+        self, db: AsyncSession, items: List[LeaveApproval], approver_id, is_admin: bool = False
+    ) -> List[LeaveApprovalResult]:
+        return await db.run_sync(
+            crud_leave.approve_or_reject_batch,
+            items=items,
+            approver_id=approver_id,
+            is_admin=is_admin,
+        )
+
+    async def get_pending_by_manager(
+        self, db: AsyncSession, manager_id: int, after_id: int = None, limit: int = None
+    ):
+        result = await db.scalars(
+            crud_leave.pending_by_manager_query(manager_id, after_id, limit)
+        )
+        return result.all()
+
+    async def get_pending_in_subtree(
+        self, db: AsyncSession, manager_id, after_id: int = None, limit: int = None
+    ):
+        result = await db.scalars(
+            crud_leave.pending_in_subtree_query(manager_id, after_id, limit)
+        )
+        return result.all()
+
+    async def get_team_availability(
+        self,
+        db: AsyncSession,
+        from_date: date,
+        to_date: date,
+        reporting_officer_id=None,
+        department: str = None,
+    ) -> List[dict]:
+        rows = (
+            await db.execute(
+                crud_leave.availability_query(
+                    from_date, to_date, reporting_officer_id, department
+                )
+            )
+        ).all()
+        return daily_availability(rows, from_date, to_date)
+
+    async def cancel_leave(self, db: AsyncSession, leave_id: int, employee_id: int):
+        return await db.run_sync(
+            crud_leave.cancel_leave, leave_id=leave_id, employee_id=employee_id
+        )
+
+
+async_crud_leave = AsyncCRUDLeave()
@@ -0,0 +1,372 @@
+"""
+Monthly leave accrual and year-end carry-forward, as chunked set-based jobs.
+
+Each job walks the employees table in primary key order, LEAVE_ACCRUAL_CHUNK_SIZE
+employees per transaction. A chunk is a handful of statements whatever its
+size:
+
+- INSERT ... SELECT writes the chunk's postings (leave_accruals), skipping
+  (kind, period, employee, leave type) keys that already have one, so a
+  period is never posted twice for an employee, even across restarts;
+- INSERT ... SELECT opens the ledger rows the postings need;
+- UPDATE ... FROM adds this run's postings to the ledger rows.
+
+The chunk's checkpoint (batch_checkpoints) is committed with it, so an
+interrupted job resumes after the last committed chunk. The ledger updates
+are increments, like the CRUDLeave write paths', so submissions and
+approvals can run concurrently.
+"""
+import time
+import uuid
+from datetime import date, datetime, timezone
+from typing import Callable, Optional
+
+from sqlalchemy import case, exists, func, insert, literal, select, true, union_all, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.etag import bump_all_versions
+from app.crud.crud_leave import financial_year_id
+from app.models.batch_checkpoint import BatchCheckpoint
+from app.models.employee import Employee
+from app.models.leave_accrual import LeaveAccrual
+from app.models.leave_balance import LeaveBalance
+
+# Posting kinds
+ACCRUAL = "Accrual"
+CARRY_FORWARD = "CarryForward"  # into the next year
+CARRY_OUT = "CarryOut"  # the carried days, out of the closing year
+LAPSE = "Lapse"  # the rest of the closing year's balance
+
+# A chunk that loses a ledger-row insert race with a first booking is retried
+_CHUNK_ATTEMPTS = 3
+
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+def _per_type(values: dict, leave_type_id):
+    """A leave type -> days mapping as a SQL expression (0 for other types)."""
+    if not values:
+        return literal(0.0)
+    return case({k: float(v) for k, v in values.items()}, value=leave_type_id, else_=0.0)
+
+
+def _in_chunk(employee_id, after, upto):
+    """employee_id in (after, upto]; open-ended where a bound is None."""
+    clause = true()
+    if after is not None:
+        clause = clause & (employee_id > after)
+    if upto is not None:
+        clause = clause & (employee_id <= upto)
+    return clause
+
+
+class JobNotDue(ValueError):
+    """The period of an accrual or year-end job has not been reached yet."""
+
+
+class CRUDLeaveAccrual:
+    def accrue_month(
+        self,
+        db: Session,
+        month: date,
+        chunk_size: int = None,
+        progress: Optional[Callable[[dict], None]] = None,
+    ) -> dict:
+        """
+        Credit LEAVE_TYPE_MONTHLY_ACCRUALS to every employee for the month
+        (any day of it). Requires LEAVE_ALLOTMENT_MODE "monthly".
+        """
+        if settings.LEAVE_ALLOTMENT_MODE != "monthly":
+            raise ValueError(
+                f"LEAVE_ALLOTMENT_MODE is {settings.LEAVE_ALLOTMENT_MODE!r}: "
+                "allotments are not accrued monthly"
+            )
+        month = month.replace(day=1)
+        if month > date.today():
+            raise JobNotDue(f"{month:%Y-%m} has not started")
+        period = month.year * 100 + month.month
+        fy = financial_year_id(month)
+
+        def post(db, after, upto, run_id, now):
+            written = 0
+            for leave_type_id, days in settings.LEAVE_TYPE_MONTHLY_ACCRUALS.items():
+                rows = select(
+                    Employee.employeeId,
+                    literal(fy),
+                    literal(leave_type_id),
+                    literal(ACCRUAL),
+                    literal(period),
+                    literal(float(days)),
+                    literal(run_id),
+                    literal(now),
+                ).where(
+                    _in_chunk(Employee.employeeId, after, upto),
+                    ~exists().where(
+                        LeaveAccrual.kind == ACCRUAL,
+                        LeaveAccrual.period == period,
+                        LeaveAccrual.employeeId == Employee.employeeId,
+                        LeaveAccrual.leaveTypeId == leave_type_id,
+                    ),
+                )
+                written += self._insert_postings(db, rows)
+            return written
+
+        return self._run(
+            db, f"leave-accrual:{period}", [ACCRUAL], period, post, chunk_size, progress
+        )
+
+    def close_year(
+        self,
+        db: Session,
+        financial_year: int,
+        chunk_size: int = None,
+        progress: Optional[Callable[[dict], None]] = None,
+    ) -> dict:
+        """
+        Carry each employee's unused balance (available less pending) into
+        the next year, up to LEAVE_TYPE_CARRY_FORWARD_CAPS, and lapse the
+        rest. Every employee and leave type is closed, the ones with no
+        ledger row for the year at their opening allotment. Run once the
+        year's requests are decided.
+        """
+        ends = date(financial_year + 1, settings.FINANCIAL_YEAR_START_MONTH, 1)
+        if date.today() < ends:
+            raise JobNotDue(f"Financial year {financial_year} runs until {ends}")
+        period = financial_year
+        # The configured types, and any other type the year has a ledger row for
+        type_ids = sorted(
+            set(settings.LEAVE_TYPES)
+            | set(
+                db.scalars(
+                    select(LeaveBalance.leaveTypeId)
+                    .where(LeaveBalance.financialYearId == financial_year)
+                    .distinct()
+                )
+            )
+        )
+        leave_types = union_all(
+            *(select(literal(t).label("leaveTypeId")) for t in type_ids)
+        ).subquery("leave_types")
+        leave_type_id = leave_types.c.leaveTypeId
+        if settings.LEAVE_ALLOTMENT_MODE == "monthly":
+            opening = literal(0.0)
+        else:
+            opening = _per_type(settings.LEAVE_TYPE_ALLOTMENTS, leave_type_id)
+        remaining = func.coalesce(LeaveBalance.available - LeaveBalance.pending, opening)
+        cap = _per_type(settings.LEAVE_TYPE_CARRY_FORWARD_CAPS, leave_type_id)
+        carried = case((remaining <= 0, 0.0), (remaining < cap, remaining), else_=cap)
+        lapsed = case((remaining <= cap, 0.0), else_=remaining - cap)
+        postings = [
+            (CARRY_FORWARD, financial_year + 1, carried),
+            (CARRY_OUT, financial_year, -carried),
+            (LAPSE, financial_year, -lapsed),
+        ]
+        # Employee x leave type, with the closing year's ledger row if any
+        closing = Employee.__table__.join(leave_types, true()).outerjoin(
+            LeaveBalance,
+            (LeaveBalance.employeeId == Employee.employeeId)
+            & (LeaveBalance.financialYearId == financial_year)
+            & (LeaveBalance.leaveTypeId == leave_type_id),
+        )
+
+        def post(db, after, upto, run_id, now):
+            # All three read the ledger as it was before this chunk's updates
+            written = 0
+            for kind, fy, days in postings:
+                rows = (
+                    select(
+                        Employee.employeeId,
+                        literal(fy),
+                        leave_type_id,
+                        literal(kind),
+                        literal(period),
+                        days,
+                        literal(run_id),
+                        literal(now),
+                    )
+                    .select_from(closing)
+                    .where(
+                        _in_chunk(Employee.employeeId, after, upto),
+                        ~exists().where(
+                            LeaveAccrual.kind == kind,
+                            LeaveAccrual.period == period,
+                            LeaveAccrual.employeeId == Employee.employeeId,
+                            LeaveAccrual.leaveTypeId == leave_type_id,
+                        ),
+                    )
+                )
+                written += self._insert_postings(db, rows)
+            return written
+
+        return self._run(
+            db,
+            f"leave-year-end:{financial_year}",
+            [kind for kind, _, _ in postings],
+            period,
+            post,
+            chunk_size,
+            progress,
+        )
+
+    def _insert_postings(self, db: Session, rows) -> int:
+        return db.execute(
+            insert(LeaveAccrual).from_select(
+                [
+                    "employeeId",
+                    "financialYearId",
+                    "leaveTypeId",
+                    "kind",
+                    "period",
+                    "days",
+                    "runId",
+                    "postedAt",
+                ],
+                rows,
+            )
+        ).rowcount
+
+    def _apply(self, db: Session, kinds, period: int, after, upto, run_id: str) -> None:
+        """Add this run's postings for the chunk to the ledger."""
+        posted = (
+            select(
+                LeaveAccrual.employeeId,
+                LeaveAccrual.financialYearId,
+                LeaveAccrual.leaveTypeId,
+                func.sum(LeaveAccrual.days).label("days"),
+            )
+            .where(
+                # kind and period lead the primary key: one range per kind
+                LeaveAccrual.kind.in_(kinds),
+                LeaveAccrual.period == period,
+                LeaveAccrual.runId == run_id,
+                _in_chunk(LeaveAccrual.employeeId, after, upto),
+            )
+            .group_by(
+                LeaveAccrual.employeeId, LeaveAccrual.financialYearId, LeaveAccrual.leaveTypeId
+            )
+            .subquery()
+        )
+        same_row = (
+            (LeaveBalance.employeeId == posted.c.employeeId)
+            & (LeaveBalance.financialYearId == posted.c.financialYearId)
+            & (LeaveBalance.leaveTypeId == posted.c.leaveTypeId)
+        )
+        if settings.LEAVE_ALLOTMENT_MODE == "monthly":
+            opening = literal(0.0)
+        else:
+            opening = _per_type(settings.LEAVE_TYPE_ALLOTMENTS, posted.c.leaveTypeId)
+        db.execute(
+            insert(LeaveBalance).from_select(
+                [
+                    "employeeId",
+                    "financialYearId",
+                    "leaveTypeId",
+                    "allotted",
+                    "used",
+                    "pending",
+                    "available",
+                ],
+                select(
+                    posted.c.employeeId,
+                    posted.c.financialYearId,
+                    posted.c.leaveTypeId,
+                    opening,
+                    literal(0.0),
+                    literal(0.0),
+                    opening,
+                ).where(~exists().where(same_row)),
+            )
+        )
+        db.execute(
+            update(LeaveBalance)
+            .where(same_row)
+            .values(
+                allotted=LeaveBalance.allotted + posted.c.days,
+                available=LeaveBalance.available + posted.c.days,
+            )
+            .execution_options(synchronize_session=False)
+        )
+
+    def _run(
+        self, db: Session, job: str, kinds, period: int, post, chunk_size, progress
+    ) -> dict:
+        """
+        Walk the employees in chunks from the job's checkpoint. Returns a
+        summary; a finished job returns its totals without doing anything.
+        """
+        chunk_size = chunk_size or settings.LEAVE_ACCRUAL_CHUNK_SIZE
+        started = time.perf_counter()
+        checkpoint = db.get(BatchCheckpoint, job)
+        if checkpoint is None:
+            now = _now()
+            checkpoint = BatchCheckpoint(
+                job=job, employees=0, postings=0, startedAt=now, updatedAt=now
+            )
+            db.add(checkpoint)
+            db.commit()
+        resumed = checkpoint.finishedAt is None and checkpoint.employees > 0
+        total = db.scalar(select(func.count()).select_from(Employee))
+        # Postings of this run are told apart from earlier runs' by runId
+        run_id = uuid.uuid4().hex
+
+        while checkpoint.finishedAt is None:
+            after = checkpoint.lastEmployeeId
+            # Upper bound of the chunk; None when fewer than chunk_size remain
+            upto = db.scalar(
+                select(Employee.employeeId)
+                .where(_in_chunk(Employee.employeeId, after, None))
+                .order_by(Employee.employeeId)
+                .offset(chunk_size - 1)
+                .limit(1)
+            )
+            for attempt in range(1, _CHUNK_ATTEMPTS + 1):
+                try:
+                    now = _now()
+                    written = post(db, after, upto, run_id, now)
+                    self._apply(db, kinds, period, after, upto, run_id)
+                    if upto is None:
+                        checkpoint.employees += db.scalar(
+                            select(func.count())
+                            .select_from(Employee)
+                            .where(_in_chunk(Employee.employeeId, after, None))
+                        )
+                        checkpoint.finishedAt = now
+                    else:
+                        checkpoint.employees += chunk_size
+                        checkpoint.lastEmployeeId = upto
+                    checkpoint.postings += written
+                    checkpoint.updatedAt = now
+                    db.commit()
+                    break
+                except IntegrityError:
+                    # A first booking opened one of the chunk's ledger rows
+                    db.rollback()
+                    if attempt == _CHUNK_ATTEMPTS:
+                        raise
+            bump_all_versions()
+            if progress is not None:
+                progress(
+                    {
+                        "job": job,
+                        "employees": checkpoint.employees,
+                        "total": total,
+                        "postings": checkpoint.postings,
+                        "elapsedSeconds": round(time.perf_counter() - started, 2),
+                    }
+                )
+
+        return {
+            "job": job,
+            "employees": checkpoint.employees,
+            "postings": checkpoint.postings,
+            "resumed": resumed,
+            "finishedAt": checkpoint.finishedAt.isoformat(),
+            "elapsedSeconds": round(time.perf_counter() - started, 2),
+        }
+
+
+crud_leave_accrual = CRUDLeaveAccrual()
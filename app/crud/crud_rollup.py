@@ -0,0 +1,291 @@
+"""
+Maintenance of the dashboard rollup tables (app.models.rollup).
+
+The leave and employee write paths report their changes here inside their
+own transaction, so a rollup row moves together with the rows it counts.
+Counters are only ever incremented, never overwritten, which keeps
+concurrent writers from losing each other's updates. reconcile() recomputes
+the rollups from the raw tables and applies the differences the same way,
+to repair drift (rows written around the CRUD layer, department moves); it
+is not safe against concurrent writers and belongs in a quiet window.
+"""
+from collections import Counter, defaultdict
+from datetime import date, datetime
+from typing import Dict, Iterable, NamedTuple, Optional, Set
+
+from sqlalchemy import and_, bindparam, case, delete, func, insert, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.models.employee import Employee
+from app.models.leave import LeaveRequest
+from app.models.rollup import ApprovalDailyRollup, DepartmentHeadcount, LeaveDailyRollup
+
+STATUS_COLUMNS = {
+    "Pending": "pending",
+    "Approved": "approved",
+    "Rejected": "rejected",
+    "Cancelled": "cancelled",
+}
+DECISIONS = ("Approved", "Rejected")
+
+
+class LeaveChange(NamedTuple):
+    """
+    A leave request whose status was just set (oldStatus None when new).
+    leaveDays is the request's working days as the ledger counts them, costed
+    when the stored column is still NULL (reconcile() counts that as 0 until
+    rebuild_leave_balances has filled it).
+    """
+
+    fromDate: date
+    leaveTypeId: int
+    leaveDays: float
+    department: Optional[str]
+    oldStatus: Optional[str]
+    newStatus: str
+    submittedAt: Optional[datetime] = None
+    decidedAt: Optional[datetime] = None
+
+
+def _month(day: date) -> int:
+    return day.year * 100 + day.month
+
+
+def _add_decision(counters: Dict[str, float], status, submitted_at, decided_at) -> None:
+    counters["decisions"] += 1
+    counters["approvals"] += int(status == "Approved")
+    if submitted_at is not None:
+        # Whole minutes, so that reconcile() arrives at exactly the same sums
+        minutes = round((decided_at - submitted_at).total_seconds() / 60)
+        counters["timedDecisions"] += 1
+        counters["turnaroundMinutes"] += minutes
+        counters["decidedWithinDay"] += int(minutes <= 24 * 60)
+
+
+def _counters():
+    return defaultdict(lambda: defaultdict(int))
+
+
+def _number(value):
+    # Counts stay ints; Numeric sums come back as Decimal
+    return value if isinstance(value, int) else float(value or 0)
+
+
+class CRUDRollup:
+    def increment(
+        self,
+        db: Session,
+        model,
+        deltas: Dict[tuple, Dict[str, float]],
+        existing: Optional[Set[tuple]] = None,
+    ) -> None:
+        """
+        Add {key: {column: delta}} to rollup rows (key in primary key order),
+        creating the missing rows. Runs in the caller's transaction. Once the
+        rows exist this is one executemany UPDATE however many keys there are;
+        new keys add a SELECT and one INSERT. `existing`, the keys that have
+        rows when the caller has just read them, saves the lookup.
+        """
+        deltas = {key: delta for key, delta in deltas.items() if any(delta.values())}
+        if not deltas:
+            return
+        table = model.__table__
+        key_columns = list(table.primary_key.columns)
+        counters = sorted({column for delta in deltas.values() for column in delta})
+        zeros = dict.fromkeys((c.name for c in table.c if not c.primary_key), 0)
+        increments = (
+            update(table)
+            .where(and_(*[c == bindparam(f"k_{c.name}") for c in key_columns]))
+            .values({name: table.c[name] + bindparam(f"d_{name}") for name in counters})
+        )
+
+        def params(keys):
+            return [
+                {
+                    **{f"k_{c.name}": value for c, value in zip(key_columns, key)},
+                    **{f"d_{name}": deltas[key].get(name, 0) for name in counters},
+                }
+                for key in keys
+            ]
+
+        def new_rows(keys):
+            return [
+                {**zeros, **{c.name: v for c, v in zip(key_columns, key)}, **deltas[key]}
+                for key in keys
+            ]
+
+        connection = db.connection()
+        if existing is not None:
+            present = [key for key in deltas if key in existing]
+            if present:
+                connection.execute(increments, params(present))
+        elif len(deltas) == 1:
+            if connection.execute(increments, params(deltas)).rowcount:
+                return
+            existing = set()
+        else:
+            updated = connection.execute(increments, params(deltas)).rowcount
+            if updated == len(deltas) and connection.dialect.supports_sane_multi_rowcount:
+                return
+            lookup = select(*key_columns).where(
+                *[column.in_({key[i] for key in deltas}) for i, column in enumerate(key_columns)]
+            )
+            existing = set(map(tuple, db.execute(lookup)))
+        missing = [key for key in deltas if key not in existing]
+        if not missing:
+            return
+        try:
+            with db.begin_nested():
+                db.execute(insert(table), new_rows(missing))
+        except IntegrityError:
+            # A concurrent transaction created some of them: one key at a time
+            for key in missing:
+                if connection.execute(increments, params([key])).rowcount:
+                    continue
+                with db.begin_nested():
+                    db.execute(insert(table), new_rows([key]))
+
+    def leaves_changed(self, db: Session, changes: Iterable[LeaveChange]) -> None:
+        """Count status changes into the leave and approval rollups."""
+        leaves = _counters()
+        decisions = _counters()
+        for change in changes:
+            department = change.department or ""
+            day = change.fromDate
+            counters = leaves[(_month(day), department, change.leaveTypeId, day)]
+            if change.oldStatus is not None:
+                counters[STATUS_COLUMNS[change.oldStatus]] -= 1
+            counters[STATUS_COLUMNS[change.newStatus]] += 1
+            days = change.leaveDays or 0.0
+            if change.newStatus == "Approved":
+                counters["approvedDays"] += days
+            if change.oldStatus == "Approved":
+                counters["approvedDays"] -= days
+            if change.newStatus in DECISIONS and change.oldStatus != change.newStatus:
+                decided_on = change.decidedAt.date()
+                _add_decision(
+                    decisions[(_month(decided_on), department, decided_on)],
+                    change.newStatus,
+                    change.submittedAt,
+                    change.decidedAt,
+                )
+        self.increment(db, LeaveDailyRollup, leaves)
+        self.increment(db, ApprovalDailyRollup, decisions)
+
+    def employees_added(self, db: Session, departments: Iterable[Optional[str]]) -> None:
+        counts = Counter(department or "" for department in departments)
+        self.increment(
+            db, DepartmentHeadcount, {(d,): {"employees": n} for d, n in counts.items()}
+        )
+
+    def employee_moved(self, db: Session, old: Optional[str], new: Optional[str]) -> None:
+        if (old or "") != (new or ""):
+            self.increment(
+                db,
+                DepartmentHeadcount,
+                {(old or "",): {"employees": -1}, (new or "",): {"employees": 1}},
+            )
+
+    def reconcile(self, db: Session, since: date = None, batch_size: int = 10000) -> dict:
+        """
+        Recompute the rollups from leaves and employees (leave and decision
+        days from `since` on, or all) and add the differences to the stored
+        rows, then commit. Departments are the employees' current ones.
+        Leave writes committed while it runs can be lost from the rollups
+        (see app.commands.reconcile_rollups). Returns the number of rollup
+        rows corrected per table.
+        """
+        department = func.coalesce(Employee.department, "")
+        status = LeaveRequest.status
+
+        def count(value):
+            return func.sum(case((status == value, 1), else_=0))
+
+        leave_query = (
+            select(
+                LeaveRequest.fromDate,
+                department,
+                LeaveRequest.leaveTypeId,
+                count("Pending"),
+                count("Approved"),
+                count("Rejected"),
+                count("Cancelled"),
+                func.sum(case((status == "Approved", LeaveRequest.leaveDays), else_=0)),
+            )
+            .join(Employee, LeaveRequest.employeeId == Employee.employeeId)
+            .group_by(LeaveRequest.fromDate, department, LeaveRequest.leaveTypeId)
+        )
+        # Turnaround is computed in Python, as on the write path: date and
+        # interval arithmetic is spelled differently by every database
+        decision_query = (
+            select(
+                LeaveRequest.decidedAt,
+                LeaveRequest.submittedAt,
+                department,
+                status,
+            )
+            .join(Employee, LeaveRequest.employeeId == Employee.employeeId)
+            .where(LeaveRequest.decidedAt.is_not(None), status.in_(DECISIONS))
+            .execution_options(yield_per=batch_size)
+        )
+        if since is not None:
+            leave_query = leave_query.where(LeaveRequest.fromDate >= since)
+            decision_query = decision_query.where(
+                LeaveRequest.decidedAt >= datetime.combine(since, datetime.min.time())
+            )
+
+        names = ["pending", "approved", "rejected", "cancelled", "approvedDays"]
+        leaves = _counters()
+        for day, dept, leave_type_id, *values in db.execute(leave_query):
+            counters = leaves[(_month(day), dept, leave_type_id, day)]
+            counters.update(zip(names, map(_number, values)))
+        decisions = _counters()
+        for decided_at, submitted_at, dept, decision in db.execute(decision_query):
+            day = decided_at.date()
+            _add_decision(decisions[(_month(day), dept, day)], decision, submitted_at, decided_at)
+        headcounts = _counters()
+        for dept, employees in db.execute(
+            select(department, func.count()).select_from(Employee).group_by(department)
+        ):
+            headcounts[(dept,)]["employees"] = employees
+
+        corrected = {}
+        for model, fresh in [
+            (LeaveDailyRollup, leaves),
+            (ApprovalDailyRollup, decisions),
+            (DepartmentHeadcount, headcounts),
+        ]:
+            corrected[model.__tablename__] = self._correct(db, model, fresh, since)
+        db.commit()
+        return corrected
+
+    def _correct(self, db: Session, model, fresh, since: Optional[date]) -> int:
+        """Add fresh - stored to each rollup row; drop rows left all zero."""
+        table = model.__table__
+        key_columns = list(table.primary_key.columns)
+        counters = [c for c in table.c if not c.primary_key]
+        stored = select(*key_columns, *counters)
+        window = []
+        if since is not None and "day" in table.c:
+            window = [table.c.month >= _month(since), table.c.day >= since]
+        deltas = _counters()
+        for key, values in fresh.items():
+            deltas[key].update(values)
+        existing = set()
+        for row in db.execute(stored.where(*window)):
+            key = tuple(row[: len(key_columns)])
+            existing.add(key)
+            for column, value in zip(counters, row[len(key_columns):]):
+                deltas[key][column.name] -= _number(value)
+        deltas = {
+            key: {name: value for name, value in delta.items() if abs(value) > 1e-6}
+            for key, delta in deltas.items()
+        }
+        deltas = {key: delta for key, delta in deltas.items() if delta}
+        self.increment(db, model, deltas, existing)
+        db.execute(delete(table).where(*window, *[c == 0 for c in counters]))
+        return len(deltas)
+
+
+crud_rollup = CRUDRollup()
@@ -1,9 +1,23 @@
 from sqlalchemy.orm import DeclarativeBase
-from app.models import *
 
 class Base(DeclarativeBase):
     pass
     # # Generate __tablename__ automatically based on class name
     # @declared_attr
     # def __tablename__(cls) -> str:
-    #     return cls.__name__.lower()
\ No newline at end of file
+    #     return cls.__name__.lower()
+
+
+# Register every model on Base.metadata (for Alembic and create_all); the
+# models import Base from here, so this has to come after the class.
+from app.models import (  # noqa: E402,F401
+    batch_checkpoint,
+    employee,
+    employee_hierarchy,
+    holiday,
+    leave,
+    leave_accrual,
+    leave_balance,
+    outbox,
+    rollup,
+)
@@ -0,0 +1,149 @@
+"""
+Connection pool telemetry.
+
+The engines in app.db.session use the Instrumented* pool classes below,
+which time how long each checkout waits for a connection and note when it
+had to open an overflow connection. Connects, checkouts, checkins and
+invalidations are counted from SQLAlchemy pool events. Everything is
+process-local and is reported by GET /api/v1.0/Admin/Pool.
+"""
+import threading
+import time
+from bisect import bisect_left
+from typing import Dict, List
+
+from sqlalchemy import event, exc
+from sqlalchemy.pool import AsyncAdaptedQueuePool, Pool, QueuePool
+
+# Upper bounds (ms) of the checkout wait histogram; one more bucket holds the rest
+WAIT_BUCKETS_MS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+
+
+class PoolStats:
+    """Counters and the wait-time histogram of one pool."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        with self._lock:
+            self.wait_counts = [0] * (len(WAIT_BUCKETS_MS) + 1)
+            self.wait_total_ms = 0.0
+            self.wait_max_ms = 0.0
+            self.checkout_timeouts = 0
+            self.connects = 0
+            self.checkouts = 0
+            self.checkins = 0
+            self.invalidations = 0
+            self.overflow_connects = 0
+
+    def record_wait(self, elapsed_ms: float, timed_out: bool = False) -> None:
+        with self._lock:
+            self.wait_counts[bisect_left(WAIT_BUCKETS_MS, elapsed_ms)] += 1
+            self.wait_total_ms += elapsed_ms
+            self.wait_max_ms = max(self.wait_max_ms, elapsed_ms)
+            if timed_out:
+                self.checkout_timeouts += 1
+
+    def count(self, counter: str) -> None:
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    def snapshot(self, pool: Pool) -> dict:
+        with self._lock:
+            waits = sum(self.wait_counts)
+            histogram: List[Dict] = [
+                {"leMs": bound, "count": count}
+                for bound, count in zip(WAIT_BUCKETS_MS + (None,), self.wait_counts)
+            ]
+            counters = {
+                "connects": self.connects,
+                "checkouts": self.checkouts,
+                "checkins": self.checkins,
+                "invalidations": self.invalidations,
+                "overflowConnects": self.overflow_connects,
+                "checkoutTimeouts": self.checkout_timeouts,
+            }
+            wait = {
+                "count": waits,
+                "meanMs": round(self.wait_total_ms / waits, 3) if waits else 0.0,
+                "maxMs": round(self.wait_max_ms, 3),
+                "histogram": histogram,
+            }
+        return {"name": self.name, "pool": pool_status(pool), **counters, "checkoutWait": wait}
+
+
+def pool_status(pool: Pool) -> dict:
+    """Live occupancy; pools without a queue (SQLite memory, NullPool) report less."""
+    status = {"class": type(pool).__name__}
+    if isinstance(pool, QueuePool):
+        status.update(
+            size=pool.size(),
+            checkedOut=pool.checkedout(),
+            idle=pool.checkedin(),
+            # QueuePool.overflow() counts up from -size; clamp to connections above size
+            overflow=max(pool.overflow(), 0),
+            maxOverflow=pool._max_overflow,
+            timeoutSeconds=pool.timeout(),
+        )
+    return status
+
+
+class _TimedCheckout:
+    """Mixin timing QueuePool._do_get, i.e. the wait for a pooled connection."""
+
+    stats: PoolStats
+
+    def _do_get(self):
+        overflow = self._overflow
+        started = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except exc.TimeoutError:
+            self.stats.record_wait((time.perf_counter() - started) * 1000, timed_out=True)
+            raise
+        self.stats.record_wait((time.perf_counter() - started) * 1000)
+        # QueuePool counts _overflow up from -size: a new connection past pool_size
+        if self._overflow > max(overflow, 0):
+            self.stats.count("overflow_connects")
+        return connection
+
+    def recreate(self):
+        # engine.dispose() swaps in a new pool; keep the same counters
+        pool = super().recreate()
+        pool.stats = self.stats
+        return pool
+
+
+class InstrumentedQueuePool(_TimedCheckout, QueuePool):
+    pass
+
+
+class InstrumentedAsyncQueuePool(_TimedCheckout, AsyncAdaptedQueuePool):
+    pass
+
+
+def instrument(pool: Pool, name: str) -> PoolStats:
+    """Attach a PoolStats to `pool` and count its events."""
+    stats = PoolStats(name)
+    pool.stats = stats
+
+    @event.listens_for(pool, "connect")
+    def on_connect(dbapi_connection, connection_record):
+        stats.count("connects")
+
+    @event.listens_for(pool, "checkout")
+    def on_checkout(dbapi_connection, connection_record, connection_proxy):
+        stats.count("checkouts")
+
+    @event.listens_for(pool, "checkin")
+    def on_checkin(dbapi_connection, connection_record):
+        stats.count("checkins")
+
+    @event.listens_for(pool, "invalidate")
+    def on_invalidate(dbapi_connection, connection_record, exception):
+        stats.count("invalidations")
+
+    return stats
@@ -1,22 +1,212 @@
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from sqlalchemy import create_engine
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker
 from app.core.config import settings
+from app.db.pool_metrics import InstrumentedAsyncQueuePool, InstrumentedQueuePool, instrument
+
+logger = logging.getLogger(__name__)
 
 # For SQL Server with Windows Auth, this is the cleanest format:
 # We use the raw string from settings directly
 SQLALCHEMY_DATABASE_URL = settings.DATABASE_URL
 
-engine = create_engine(
-    SQLALCHEMY_DATABASE_URL,
-    pool_pre_ping=True,
-    echo=True  # Set to True to see the exact SQL and connection attempts in terminal
-)
+# Engines are created on first use (normally by the app's lifespan), not at
+# import: importing the app must not load DB drivers or need the database.
+# `engine`, `SessionLocal`, `async_engine` and `AsyncSessionLocal` stay
+# importable from this module and are built when first accessed.
+_engine = None
+_session_factory = None
+_async_engine = None
+_async_session_factory = None
+_init_lock = threading.Lock()
+
+
+def pool_options(url: str, pool_class) -> dict:
+    """create_engine pool arguments from settings."""
+    options = {
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+        "pool_recycle": settings.DB_POOL_RECYCLE_SECONDS,
+    }
+    url = make_url(url)
+    if url.get_backend_name() == "sqlite" and url.database in (None, "", ":memory:"):
+        # In-memory SQLite keeps its single-connection pool
+        return options
+    options.update(
+        poolclass=pool_class,
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT_SECONDS,
+    )
+    return options
+
+
+def init_engine() -> Engine:
+    """Create the sync engine and bind SessionLocal (idempotent)."""
+    global _engine, _session_factory
+    if _engine is None:
+        with _init_lock:
+            if _engine is None:
+                engine = create_engine(
+                    SQLALCHEMY_DATABASE_URL,
+                    echo=settings.DB_ECHO,  # log the exact SQL and connection attempts
+                    **pool_options(SQLALCHEMY_DATABASE_URL, InstrumentedQueuePool),
+                )
+                instrument(engine.pool, "sync")
+                _session_factory = sessionmaker(
+                    autocommit=False, autoflush=False, bind=engine
+                )
+                _engine = engine
+    return _engine
+
+
+def get_session_factory() -> sessionmaker:
+    init_engine()
+    return _session_factory
 
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 def get_db():
-    db = SessionLocal()
+    db = get_session_factory()()
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+
+# Drivers used when ASYNC_DATABASE_URL is derived from DATABASE_URL
+ASYNC_DRIVERS = {
+    "sqlite": "aiosqlite",
+    "mssql": "aioodbc",
+    "postgresql": "asyncpg",
+}
+
+
+def get_async_database_url() -> str:
+    if settings.ASYNC_DATABASE_URL:
+        return settings.ASYNC_DATABASE_URL
+    url = make_url(settings.DATABASE_URL)
+    backend = url.get_backend_name()
+    if backend not in ASYNC_DRIVERS:
+        raise RuntimeError(f"No async driver known for '{backend}', set ASYNC_DATABASE_URL")
+    return url.set(drivername=f"{backend}+{ASYNC_DRIVERS[backend]}").render_as_string(
+        hide_password=False
+    )
+
+
+def init_async_engine():
+    """Create the AsyncEngine when DB_ASYNC_MODE is on (idempotent); else None."""
+    global _async_engine, _async_session_factory
+    if not settings.DB_ASYNC_MODE:
+        return None
+    if _async_engine is None:
+        with _init_lock:
+            if _async_engine is None:
+                url = get_async_database_url()
+                engine = create_async_engine(
+                    url,
+                    echo=settings.DB_ECHO,
+                    **pool_options(url, InstrumentedAsyncQueuePool),
+                )
+                instrument(engine.sync_engine.pool, "async")
+                # expire_on_commit=False: attributes stay readable after commit without
+                # an implicit (and, under asyncio, illegal) lazy refresh.
+                _async_session_factory = async_sessionmaker(
+                    bind=engine, class_=AsyncSession, autoflush=False, expire_on_commit=False
+                )
+                _async_engine = engine
+    return _async_engine
+
+
+def get_async_session_factory():
+    init_async_engine()
+    return _async_session_factory
+
+
+async def get_async_db():
+    factory = get_async_session_factory()
+    if factory is None:
+        raise RuntimeError("DB_ASYNC_MODE is disabled")
+    async with factory() as db:
+        yield db
+
+
+def warm_pool(connections: int) -> int:
+    """
+    Open up to `connections` pooled connections at once and hand them back
+    to the pool, so the first requests do not pay for connecting. Failures
+    are logged, not raised: the app still starts while the DB is away.
+    Returns the number of connections opened.
+    """
+    engine = init_engine()
+    if connections <= 0:
+        return 0
+
+    def connect():
+        return engine.connect()
+
+    opened = []
+    try:
+        with ThreadPoolExecutor(max_workers=connections) as executor:
+            futures = [executor.submit(connect) for _ in range(connections)]
+            for future in futures:
+                try:
+                    opened.append(future.result())
+                except Exception as exc:  # noqa: BLE001 - startup must not fail here
+                    logger.warning("Connection pool warm-up failed: %s", exc)
+    finally:
+        for connection in opened:
+            connection.close()
+    return len(opened)
+
+
+async def warm_async_pool(connections: int) -> int:
+    """warm_pool for the AsyncEngine."""
+    import asyncio
+
+    engine = init_async_engine()
+    if engine is None or connections <= 0:
+        return 0
+    results = await asyncio.gather(
+        *(engine.connect().start() for _ in range(connections)), return_exceptions=True
+    )
+    opened = 0
+    for result in results:
+        if isinstance(result, Exception):
+            logger.warning("Async connection pool warm-up failed: %s", result)
+        else:
+            opened += 1
+            await result.close()
+    return opened
+
+
+def pool_stats() -> list:
+    """Telemetry of the engines created so far (see app.db.pool_metrics)."""
+    pools = [_engine.pool] if _engine is not None else []
+    if _async_engine is not None:
+        pools.append(_async_engine.sync_engine.pool)
+    return [pool.stats.snapshot(pool) for pool in pools]
+
+
+def dispose_engines() -> None:
+    if _engine is not None:
+        _engine.dispose()
+
+
+async def dispose_async_engine() -> None:
+    if _async_engine is not None:
+        await _async_engine.dispose()
+
+
+def __getattr__(name):
+    if name == "engine":
+        return init_engine()
+    if name == "SessionLocal":
+        return get_session_factory()
+    if name == "async_engine":
+        return init_async_engine()
+    if name == "AsyncSessionLocal":
+        return get_async_session_factory()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
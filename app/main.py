@@ -1,28 +1,115 @@
-from fastapi import FastAPI
-from app.api.v1.endpoints import auth, leaves, dashboard, employees
+import logging
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+from starlette.concurrency import run_in_threadpool
 from app.core.config import settings
-from app.db.base import Base
-from app.db.session import engine
+from app.core.rate_limit import RateLimited
+from app.core.security import PasswordHashingBusy, shutdown_password_pool
 
-# This command creates all tables in the database if they don't exist
-Base.metadata.create_all(bind=engine)
+# The schema is managed by Alembic (`alembic upgrade head` in prestart.sh);
+# importing this module does not touch the database.
 
-app = FastAPI(title=settings.PROJECT_NAME)
+logger = logging.getLogger(__name__)
 
-# Account endpoints (Authentication)
-app.include_router(auth.router, prefix="/api/v1.0/Account", tags=["Authentication"])
-app.include_router(employees.router, prefix="/api/v1.0/Employee", tags=["Employee"])
 
-# HR Module endpoints [cite: 52]
-app.include_router(leaves.router, prefix="/api/v1.0", tags=["Leave Management"])
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    from app.db import session
+
+    opened = await run_in_threadpool(session.warm_pool, settings.DB_POOL_WARMUP_CONNECTIONS)
+    if settings.DB_ASYNC_MODE:
+        opened += await session.warm_async_pool(settings.DB_POOL_WARMUP_CONNECTIONS)
+    logger.info("Database pools warmed with %d connection(s)", opened)
+    if settings.OUTBOX_WORKER_ENABLED:
+        from app.core import outbox
+
+        outbox.start_worker(session.get_session_factory())
+    yield
+    if settings.OUTBOX_WORKER_ENABLED:
+        await run_in_threadpool(outbox.stop_worker)
+    shutdown_password_pool()
+    await session.dispose_async_engine()
+    session.dispose_engines()
+
+
+def password_hashing_busy_handler(request: Request, exc: PasswordHashingBusy):
+    # Fail fast while bcrypt is saturated instead of queueing without bound
+    return JSONResponse(
+        status_code=503,
+        content={"detail": "Authentication service is busy, please retry"},
+        headers={"Retry-After": str(settings.PASSWORD_HASH_RETRY_AFTER_SECONDS)},
+    )
+
+
+def rate_limited_handler(request: Request, exc: RateLimited):
+    return JSONResponse(
+        status_code=429,
+        content={"detail": "Too many login attempts, please retry later"},
+        headers={"Retry-After": exc.retry_after_header},
+    )
 
-app.include_router(
-    dashboard.router,
-    prefix="/api/v1.0/Dashboard",
-    tags=["HR Dashboard"]
-)
 
-@app.get("/")
 def root():
     return {"message": "HR Module API is running", "docs": "/docs"}
 
+
+def create_app() -> FastAPI:
+    """
+    Build the application. Routers are imported here rather than at module
+    level, so only the set served in the configured mode is loaded.
+    """
+    from app.api.v1.endpoints import admin, auth, employees
+
+    app = FastAPI(title=settings.PROJECT_NAME, lifespan=lifespan)
+    app.add_exception_handler(PasswordHashingBusy, password_hashing_busy_handler)
+    app.add_exception_handler(RateLimited, rate_limited_handler)
+    if settings.SQL_METRICS_ENABLED:
+        from app.core.sql_metrics import SQLMetricsMiddleware
+
+        app.add_middleware(SQLMetricsMiddleware)
+
+    # Account endpoints (Authentication)
+    app.include_router(auth.router, prefix="/api/v1.0/Account", tags=["Authentication"])
+    app.include_router(employees.router, prefix="/api/v1.0/Employee", tags=["Employee"])
+    app.include_router(admin.router, prefix="/api/v1.0/Admin", tags=["Admin"])
+
+    # HR Module endpoints [cite: 52]
+    if settings.DB_ASYNC_MODE:
+        # Same paths, served from the AsyncEngine
+        from app.api.v1.endpoints import leaves_async, dashboard_async, holiday_async
+
+        app.include_router(leaves_async.router, prefix="/api/v1.0", tags=["Leave Management"])
+        app.include_router(
+            dashboard_async.router,
+            prefix="/api/v1.0/Dashboard",
+            tags=["HR Dashboard"]
+        )
+        app.include_router(holiday_async.router, prefix="/api/v1.0", tags=["Holiday"])
+    else:
+        from app.api.v1.endpoints import leaves, dashboard, holiday
+
+        app.include_router(leaves.router, prefix="/api/v1.0", tags=["Leave Management"])
+        app.include_router(
+            dashboard.router,
+            prefix="/api/v1.0/Dashboard",
+            tags=["HR Dashboard"]
+        )
+        app.include_router(holiday.router, prefix="/api/v1.0", tags=["Holiday"])
+
+    app.get("/")(root)
+    return app
+
+
+_app = None
+
+
+def __getattr__(name):
+    # `app.main:app` (and `from app.main import app`) still work: the
+    # application is built on first access instead of at import.
+    global _app
+    if name == "app":
+        if _app is None:
+            _app = create_app()
+        return _app
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
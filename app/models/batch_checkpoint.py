@@ -0,0 +1,18 @@
+from sqlalchemy import Column, DateTime, Integer, String, Uuid
+from app.db.base import Base
+
+
+class BatchCheckpoint(Base):
+    """
+    Progress of a chunked batch job over the employees table, committed with
+    each chunk: an interrupted job resumes after lastEmployeeId.
+    """
+    __tablename__ = "batch_checkpoints"
+
+    job = Column(String(100), primary_key=True)  # e.g. "leave-accrual:202605"
+    lastEmployeeId = Column(Uuid, nullable=True)
+    employees = Column(Integer, nullable=False, default=0)  # processed so far
+    postings = Column(Integer, nullable=False, default=0)  # rows written so far
+    startedAt = Column(DateTime, nullable=False)
+    updatedAt = Column(DateTime, nullable=False)
+    finishedAt = Column(DateTime, nullable=True)
@@ -1,5 +1,4 @@
-from sqlalchemy import Column, Integer, String, Boolean, ForeignKey, JSON
-from sqlalchemy.dialects.mssql import UNIQUEIDENTIFIER
+from sqlalchemy import Column, Integer, String, Boolean, ForeignKey, JSON, Uuid
 from sqlalchemy.orm import relationship
 from app.db.base import Base
 import uuid
@@ -8,9 +7,9 @@ class Employee(Base):
     __tablename__ = "employees"
 
     employeeId = Column(
-        UNIQUEIDENTIFIER,
+        Uuid,
         primary_key=True,
-        default=uuid.uuid4(),  # Generates a new one automatically on creation
+        default=uuid.uuid4,  # Generates a new one automatically on creation
         index=True
     )
     # employeeCode = Column(String(50), unique=True, index=True)
@@ -22,7 +21,7 @@ class Employee(Base):
     mobileNo = Column(String(20))
 
     centerId = Column(Integer)
-    department = Column(String(100))
+    department = Column(String(100), index=True)
     designation = Column(String(100))
     onBoardingStatus = Column(String(50), default="Pending")
 
@@ -30,7 +29,7 @@ class Employee(Base):
     roles = Column(JSON, default=["Employee"])
 
     reportingOfficerId = Column(
-        UNIQUEIDENTIFIER, ForeignKey("employees.employeeId"), nullable=True
+        Uuid, ForeignKey("employees.employeeId"), nullable=True, index=True
     )
 
     leaves = relationship(
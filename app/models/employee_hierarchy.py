@@ -0,0 +1,22 @@
+from sqlalchemy import Column, Integer, ForeignKey, Index, Uuid
+from app.db.base import Base
+
+
+class EmployeeHierarchy(Base):
+    """
+    Closure table of the reporting line: one row per (ancestor, descendant)
+    pair, including each employee with itself at depth 0. Maintained by the
+    employee write paths; rebuilt with
+    `python -m app.commands.rebuild_employee_hierarchy`.
+    """
+    __tablename__ = "employee_hierarchy"
+
+    # The primary key is the "everyone under X" index
+    ancestorId = Column(Uuid, ForeignKey("employees.employeeId"), primary_key=True)
+    descendantId = Column(Uuid, ForeignKey("employees.employeeId"), primary_key=True)
+    depth = Column(Integer, nullable=False)
+
+    __table_args__ = (
+        # "everyone above X", used when a subtree moves
+        Index("ix_employee_hierarchy_descendantId", "descendantId", "ancestorId", "depth"),
+    )
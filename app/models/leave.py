@@ -1,13 +1,28 @@
-from sqlalchemy import Column, Integer, String, Date, Text, ForeignKey
+from sqlalchemy import (
+    Column, Integer, String, Date, DateTime, Text, ForeignKey, Index, Numeric, Uuid
+)
 from sqlalchemy.orm import relationship
-from sqlalchemy.dialects.mssql import UNIQUEIDENTIFIER
 from app.db.base import Base
 
 class LeaveRequest(Base):
     __tablename__ = "leaves"
+    __table_args__ = (
+        # One employee's requests by status: manager queues (joined from
+        # employees.reportingOfficerId), per-employee lookups, and the
+        # overlap check's fromDate range on submission.
+        Index(
+            "ix_leaves_employeeId_status_fromDate",
+            "employeeId",
+            "status",
+            "fromDate",
+            mssql_include=["leaveTypeId", "toDate", "leaveSession", "leaveDays"],
+        ),
+        # Dashboard counts: a status plus a fromDate/toDate window
+        Index("ix_leaves_status_fromDate_toDate", "status", "fromDate", "toDate"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
-    employeeId = Column(UNIQUEIDENTIFIER, ForeignKey("employees.employeeId"))
+    employeeId = Column(Uuid, ForeignKey("employees.employeeId"))
 
     leaveTypeId = Column(Integer)
     fromDate = Column(Date, nullable=False)
@@ -16,10 +31,16 @@ class LeaveRequest(Base):
     reason = Column(Text)
     status = Column(String(20), default="Pending")
     financialYearId = Column(Integer)
+    # Days charged against the balance, fixed when the request is submitted
+    leaveDays = Column(Numeric(5, 1, asdecimal=False), nullable=True)
 
     # Secondary link to Employee table
-    approvedBy = Column(UNIQUEIDENTIFIER, ForeignKey("employees.employeeId"), nullable=True)
+    approvedBy = Column(Uuid, ForeignKey("employees.employeeId"), nullable=True)
     approvalComments = Column(String(255), nullable=True)
+    # UTC; approval turnaround for the dashboard. Null on rows older than
+    # these columns.
+    submittedAt = Column(DateTime, nullable=True)
+    decidedAt = Column(DateTime, nullable=True)
 
     # RELATIONSHIPS
     # We must explicitly tell SQLAlchemy which foreign_key belongs to which relationship
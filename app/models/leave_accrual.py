@@ -0,0 +1,37 @@
+from sqlalchemy import Column, DateTime, ForeignKey, Index, Integer, Numeric, String, Uuid
+from app.db.base import Base
+
+
+class LeaveAccrual(Base):
+    """
+    Days credited to (or debited from) an employee's allotment by the batch
+    jobs in app.crud.crud_leave_accrual: monthly accruals and the year-end
+    carry-forward and lapse. A ledger row's allotment is the opening
+    allotment plus the sum of its postings.
+    """
+    __tablename__ = "leave_accruals"
+    __table_args__ = (
+        # Opening a ledger row, and rebuilds: the postings of one (employee, year, type)
+        Index(
+            "ix_leave_accruals_employeeId_financialYearId",
+            "employeeId",
+            "financialYearId",
+            "leaveTypeId",
+        ),
+    )
+
+    # One posting per kind, period, employee and leave type: a job run twice
+    # for the same period finds its postings and skips them. Kind and period
+    # lead, so one chunk of a job is a single range of the primary key.
+    kind = Column(String(20), primary_key=True)  # Accrual, CarryForward, CarryOut, Lapse
+    # Accrual: the month as YYYYMM; year-end postings: the closing financialYearId
+    period = Column(Integer, primary_key=True)
+    employeeId = Column(Uuid, ForeignKey("employees.employeeId"), primary_key=True)
+    leaveTypeId = Column(Integer, primary_key=True)
+
+    # The year whose ledger row the posting adjusts
+    financialYearId = Column(Integer, nullable=False)
+    days = Column(Numeric(6, 1, asdecimal=False), nullable=False)
+    # The job run that wrote the posting (uuid hex)
+    runId = Column(String(32), nullable=False)
+    postedAt = Column(DateTime, nullable=False)
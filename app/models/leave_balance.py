@@ -0,0 +1,23 @@
+from sqlalchemy import Column, Integer, Numeric, ForeignKey, Uuid
+from app.db.base import Base
+
+
+class LeaveBalance(Base):
+    """
+    Running leave balance per employee, financial year and leave type.
+    Maintained by the CRUDLeave write paths; rebuilt from history with
+    `python -m app.commands.rebuild_leave_balances`.
+    """
+    __tablename__ = "leave_balances"
+
+    # Employee and financial year lead the key so that one employee's summary
+    # is a single range over the primary key index.
+    employeeId = Column(Uuid, ForeignKey("employees.employeeId"), primary_key=True)
+    financialYearId = Column(Integer, primary_key=True)
+    leaveTypeId = Column(Integer, primary_key=True)
+
+    # Days, in steps of 0.5 for half-day leaves
+    allotted = Column(Numeric(6, 1, asdecimal=False), nullable=False, default=0)
+    used = Column(Numeric(6, 1, asdecimal=False), nullable=False, default=0)
+    pending = Column(Numeric(6, 1, asdecimal=False), nullable=False, default=0)
+    available = Column(Numeric(6, 1, asdecimal=False), nullable=False, default=0)
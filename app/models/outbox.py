@@ -0,0 +1,31 @@
+from sqlalchemy import Column, DateTime, Index, Integer, JSON, String, Text
+from app.db.base import Base
+
+
+class OutboxEvent(Base):
+    """
+    Leave lifecycle event waiting for delivery to the downstream consumers.
+    Written in the same transaction as the leave change it describes and
+    drained by app.core.outbox (in-process worker or
+    `python -m app.commands.outbox_worker`).
+    """
+    __tablename__ = "outbox_events"
+    __table_args__ = (
+        # The worker's claim: due Pending events in id order
+        Index("ix_outbox_events_status_availableAt", "status", "availableAt"),
+    )
+
+    id = Column(Integer, primary_key=True)
+    eventType = Column(String(50), nullable=False)  # e.g. "leave.approved"
+    aggregateId = Column(Integer, nullable=False)  # leaves.id
+    payload = Column(JSON, nullable=False)
+    createdAt = Column(DateTime, nullable=False)
+
+    # Pending -> Sent, or Failed after OUTBOX_MAX_ATTEMPTS. A claimed event
+    # stays Pending with availableAt pushed out by the lease, so events of a
+    # worker that died are picked up again.
+    status = Column(String(20), nullable=False, default="Pending")
+    availableAt = Column(DateTime, nullable=False)
+    attempts = Column(Integer, nullable=False, default=0)
+    lastError = Column(Text, nullable=True)
+    sentAt = Column(DateTime, nullable=True)
@@ -0,0 +1,56 @@
+from sqlalchemy import Column, Date, Integer, Numeric, String
+from app.db.base import Base
+
+
+# Pre-aggregated counts for the dashboard summary. Maintained by the leave and
+# employee write paths in the same transaction as the change (see
+# app.crud.crud_rollup) and reconciled with the raw tables every night, in a
+# quiet window, by `python -m app.commands.reconcile_rollups`. An employee without a
+# department is counted under "".
+#
+# The daily tables are keyed month first and clustered on that key (SQL
+# Server clusters primary keys; SQLite needs WITHOUT ROWID), so the monthly
+# summary reads one contiguous range already in GROUP BY order.
+
+
+class LeaveDailyRollup(Base):
+    """Leave requests per first day, department and leave type, by status."""
+    __tablename__ = "leave_daily_rollups"
+    __table_args__ = {"sqlite_with_rowid": False}
+
+    month = Column(Integer, primary_key=True)  # YYYYMM of day
+    department = Column(String(100), primary_key=True)
+    leaveTypeId = Column(Integer, primary_key=True)
+    day = Column(Date, primary_key=True)  # LeaveRequest.fromDate
+
+    # Requests by current status; their sum is the number ever submitted
+    pending = Column(Integer, nullable=False, default=0)
+    approved = Column(Integer, nullable=False, default=0)
+    rejected = Column(Integer, nullable=False, default=0)
+    cancelled = Column(Integer, nullable=False, default=0)
+    approvedDays = Column(Numeric(9, 1, asdecimal=False), nullable=False, default=0)
+
+
+class ApprovalDailyRollup(Base):
+    """Approve/reject decisions per day (UTC) and department, with turnaround."""
+    __tablename__ = "approval_daily_rollups"
+    __table_args__ = {"sqlite_with_rowid": False}
+
+    month = Column(Integer, primary_key=True)
+    department = Column(String(100), primary_key=True)
+    day = Column(Date, primary_key=True)  # LeaveRequest.decidedAt
+
+    decisions = Column(Integer, nullable=False, default=0)
+    approvals = Column(Integer, nullable=False, default=0)
+    # Decisions on requests with a submittedAt, and their submission-to-decision time
+    timedDecisions = Column(Integer, nullable=False, default=0)
+    turnaroundMinutes = Column(Integer, nullable=False, default=0)
+    decidedWithinDay = Column(Integer, nullable=False, default=0)
+
+
+class DepartmentHeadcount(Base):
+    """Employees per department."""
+    __tablename__ = "department_headcounts"
+
+    department = Column(String(100), primary_key=True)
+    employees = Column(Integer, nullable=False, default=0)
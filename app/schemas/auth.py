@@ -31,4 +31,13 @@ class ApiResponse(BaseModel, Generic[T]):
     succeeded: bool
     message: Optional[str] = None
     errors: Optional[List[str]] = None
-    data: Optional[T] = None # Can hold TokenData, EmployeeBase, etc.
\ No newline at end of file
+    data: Optional[T] = None # Can hold TokenData, EmployeeBase, etc.
+
+class ApiPage(BaseModel, Generic[T]):
+    """
+    One keyset page of a list endpoint; pass nextCursor back to get the
+    next one (None on the last page).
+    """
+    data: List[T]
+    nextCursor: Optional[str] = None
+    succeeded: bool = True
\ No newline at end of file
@@ -1,13 +1,16 @@
 from pydantic import BaseModel, EmailStr, ConfigDict
 from typing import Optional, List
+from uuid import UUID
 
 class EmployeeBase(BaseModel):
     firstName: str
     lastName: str
     email: EmailStr
     mobileNo: Optional[str] = None
+    centerId: Optional[int] = None
     department: Optional[str] = None
     designation: Optional[str] = None
+    reportingOfficerId: Optional[UUID] = None
     roles: List[str] = ["Employee"]
 
     # This allows Pydantic to read data even if it's an ORM object
@@ -24,9 +27,25 @@ class EmployeeUpdate(BaseModel):
     centerId: Optional[int] = None
     department: Optional[str] = None
     designation: Optional[str] = None
+    reportingOfficerId: Optional[UUID] = None
     roles: Optional[List[str]] = None
 
 class EmployeeResponse(BaseModel):
     succeeded: bool
     message: Optional[str] = None
-    data: Optional[EmployeeBase] = None
\ No newline at end of file
+    data: Optional[EmployeeBase] = None
+
+class BulkImportRow(BaseModel):
+    """Outcome of one line of a bulk import."""
+    line: int
+    email: Optional[str] = None
+    status: str  # "created", "duplicate", "invalid" or "retryable"
+    employeeId: Optional[UUID] = None
+    errors: Optional[List[str]] = None
+
+class BulkImportReport(BaseModel):
+    created: int = 0
+    duplicates: int = 0
+    invalid: int = 0
+    retryable: int = 0
+    rows: List[BulkImportRow] = []
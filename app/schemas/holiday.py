@@ -1,4 +1,4 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 from datetime import date
 from typing import List, Optional
 
@@ -6,9 +6,29 @@ class HolidayBase(BaseModel):
     hrholidayId: int
     holidayName: str
     holidayDate: date
-    holidayType: str
+    holidayType: Optional[str] = None
     isActive: bool
+    centerId: Optional[int] = None
+    stateId: Optional[int] = None
+
+    model_config = ConfigDict(from_attributes=True)
 
 class HolidayResponse(BaseModel):
     data: List[HolidayBase]
-    succeeded: bool
\ No newline at end of file
+    succeeded: bool
+
+class HolidayCreate(BaseModel):
+    holidayName: str
+    holidayDate: date
+    holidayType: Optional[str] = None
+    isActive: bool = True
+    centerId: Optional[int] = None
+    stateId: Optional[int] = None
+
+class HolidayUpdate(BaseModel):
+    holidayName: Optional[str] = None
+    holidayDate: Optional[date] = None
+    holidayType: Optional[str] = None
+    isActive: Optional[bool] = None
+    centerId: Optional[int] = None
+    stateId: Optional[int] = None
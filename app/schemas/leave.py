@@ -1,11 +1,13 @@
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field, TypeAdapter, model_validator
 from datetime import date
 from typing import Optional, List
+from uuid import UUID
+from app.core.config import settings
 
 
 # Base properties shared across schemas
 class LeaveBase(BaseModel):
-    employeeId: int
+    employeeId: UUID
     leaveTypeId: int
     reason: str
 
@@ -16,34 +18,102 @@ class LeaveCreate(LeaveBase):
     toDate: date
     financialYearId: int
 
+    @model_validator(mode="after")
+    def check_date_order(self):
+        if self.toDate < self.fromDate:
+            raise ValueError("toDate is before fromDate")
+        return self
+
 
 # Schema for submitting a Half-Day Leave
 class HalfDayLeaveCreate(LeaveBase):
     leaveDate: date
     leaveSession: str = Field(..., pattern="^(FirstHalf|SecondHalf)$")
+    # Derived from leaveDate when omitted
+    financialYearId: Optional[int] = None
 
 
 # Schema for Manager/HR Approval
 class LeaveApproval(BaseModel):
     hrEmployeeFullDayLeaveDetailsId: int
-    approvedBy: int
+    approvedBy: UUID
     approvalComments: str
     isApproved: bool
 
 
+# Schema for approving/rejecting many requests in one call
+class LeaveBatchApproval(BaseModel):
+    items: List[LeaveApproval] = Field(
+        ..., min_length=1, max_length=settings.LEAVE_APPROVAL_BATCH_MAX_ITEMS
+    )
+
+
+# Outcome of one item of a batch approval
+class LeaveApprovalResult(BaseModel):
+    hrEmployeeFullDayLeaveDetailsId: int
+    succeeded: bool
+    status: Optional[str] = None
+    error: Optional[str] = None
+
+
+# Schema for returning a stored leave request
+class LeaveRequestRead(BaseModel):
+    id: int
+    employeeId: UUID
+    leaveTypeId: Optional[int] = None
+    fromDate: date
+    toDate: Optional[date] = None
+    leaveSession: Optional[str] = None
+    reason: Optional[str] = None
+    status: Optional[str] = None
+    financialYearId: Optional[int] = None
+    leaveDays: Optional[float] = None
+    approvedBy: Optional[UUID] = None
+    approvalComments: Optional[str] = None
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+# Validates a whole page of ORM rows in one call:
+# leave_request_list.validate_python(rows, from_attributes=True)
+leave_request_list = TypeAdapter(List[LeaveRequestRead])
+
+
+# Team availability: one entry per day of the window. approved/pending are
+# day counts (a half day counts 0.5); isWorkingDay follows the weekmask only,
+# as holidays differ between the team's centers.
+class TeamAbsentee(BaseModel):
+    leaveId: int
+    employeeId: UUID
+    name: str
+    status: str
+    leaveSession: Optional[str] = None
+
+
+class TeamAvailabilityDay(BaseModel):
+    day: date
+    isWorkingDay: bool
+    approved: float
+    pending: float
+    absentees: List[TeamAbsentee]
+
+
 # Schema for the Leave Summary response [cite: 175, 176]
+# Day counts are floats because half-day leaves count as 0.5
 class LeaveTypeBreakdown(BaseModel):
+    leaveTypeId: Optional[int] = None
     leaveType: str
-    total: int
-    used: int
-    available: int
+    total: float
+    used: float
+    pending: float = 0
+    available: float
 
 
 class LeaveSummaryData(BaseModel):
-    totalLeaves: int
-    usedLeaves: int
-    pendingLeaves: int
-    availableLeaves: int
+    totalLeaves: float
+    usedLeaves: float
+    pendingLeaves: float
+    availableLeaves: float
     leaveTypeBreakdown: List[LeaveTypeBreakdown]
 
 
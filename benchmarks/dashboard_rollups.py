@@ -0,0 +1,103 @@
+"""
+Dashboard summary benchmark: rollups against the live aggregation.
+
+Seeds a throwaway SQLite database with benchmarks.datagen (which fills the
+rollups with a reconcile), then times an uncached dashboard summary, the
+GROUP BYs over leaves and employees it replaces, and the nightly reconcile:
+
+    python -m benchmarks.dashboard_rollups --employees 20000 --years 3
+
+The summary reads a few thousand rollup rows whatever the number of leave
+requests; the target is single-digit milliseconds without the cache.
+"""
+import argparse
+import json
+import os
+import tempfile
+import time
+from datetime import date, timedelta
+
+
+def median_ms(action, repeat):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        action()
+        timings.append(time.perf_counter() - started)
+    return round(sorted(timings)[len(timings) // 2] * 1000, 2)
+
+
+def run(args):
+    from sqlalchemy import func, select
+    from app.core.config import settings
+    from app.crud.crud_dashboard import crud_dashboard, invalidate_dashboard
+    from app.crud.crud_rollup import crud_rollup
+    from app.db.base import Base
+    from app.db.session import SessionLocal, engine
+    from app.models.employee import Employee
+    from app.models.leave import LeaveRequest
+    from benchmarks.datagen import generate
+
+    Base.metadata.create_all(bind=engine)
+    with SessionLocal() as db:
+        summary = generate(db, employees=args.employees, years=args.years)
+
+        def rollups():
+            invalidate_dashboard()
+            return crud_dashboard.get_summary(db)
+
+        today = date.today()
+        start = date(today.year - 1, today.month, 1)
+        month = func.strftime("%Y%m", LeaveRequest.fromDate)
+
+        def live():
+            # Department distribution and monthly trends only: no turnaround
+            db.execute(
+                select(Employee.department, func.count()).group_by(Employee.department)
+            ).all()
+            db.execute(
+                select(month, Employee.department, LeaveRequest.leaveTypeId, func.count())
+                .join(Employee, LeaveRequest.employeeId == Employee.employeeId)
+                .where(LeaveRequest.fromDate >= start)
+                .group_by(month, Employee.department, LeaveRequest.leaveTypeId)
+            ).all()
+
+        result = rollups()
+        timings = {
+            "summaryUncachedMs": median_ms(rollups, args.repeat),
+            "summaryCachedMs": median_ms(lambda: crud_dashboard.get_summary(db), args.repeat),
+            "liveGroupByMs": median_ms(live, max(args.repeat // 10, 3)),
+        }
+        started = time.perf_counter()
+        crud_rollup.reconcile(db)
+        timings["reconcileAllSeconds"] = round(time.perf_counter() - started, 2)
+        started = time.perf_counter()
+        crud_rollup.reconcile(db, since=today - timedelta(days=45))
+        timings["reconcile45DaysSeconds"] = round(time.perf_counter() - started, 2)
+
+    return {
+        "employees": args.employees,
+        "leaves": summary["leaves"],
+        "trendMonths": settings.DASHBOARD_TREND_MONTHS,
+        "trendRows": len(result["monthlyLeaveTrends"]),
+        "turnaroundRows": len(result["approvalTurnaround"]),
+        **timings,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--employees", type=int, default=20000)
+    parser.add_argument("--years", type=int, default=3)
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="dashboard-rollups-")
+    os.environ.setdefault("DATABASE_URL", f"sqlite:///{workdir}/bench.db")
+    os.environ.setdefault("SECRET_KEY", "benchmark-secret")
+
+    print(json.dumps(run(args), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,244 @@
+"""
+Synthetic organisation and leave-history generator.
+
+Fills a database with centers, a reporting tree, years of leave requests and
+per-center holidays, then derives the hierarchy closure table and the leave
+balance ledger the same way production does:
+
+    python -m benchmarks.datagen --database-url sqlite:///org.db \\
+        --centers 20 --employees 5000 --depth 5 --years 3
+
+Every employee can log in with the password "benchmark-password". Employee 0
+is a SuperAdmin at the top of the tree. Used by benchmarks.endpoints.
+"""
+import argparse
+import json
+import os
+import random
+import time
+import uuid
+from datetime import date, datetime, timedelta
+
+PASSWORD = "benchmark-password"
+# Length in days of a full-day leave beyond its first day, and how often
+LEAVE_LENGTHS = [0, 0, 0, 1, 1, 2, 4, 9]
+
+
+def reporting_tree(employees, depth):
+    """
+    Manager index for employees 0..employees-1 (None for the root), filled
+    level by level with a fan-out that reaches `employees` at `depth` levels.
+    Returns (managers, levels).
+    """
+    fanout = 1
+    while sum(fanout ** level for level in range(depth)) < employees:
+        fanout += 1
+    managers = [None]
+    levels = [[0]]
+    while len(managers) < employees:
+        level = []
+        for slot in range(len(levels[-1]) * fanout):
+            if len(managers) == employees:
+                break
+            level.append(len(managers))
+            managers.append(levels[-1][slot // fanout])
+        levels.append(level)
+    return managers, levels
+
+
+def generate(
+    db,
+    centers=20,
+    employees=5000,
+    depth=5,
+    years=3,
+    leaves_per_year=8,
+    holidays_per_center=8,
+    seed=7,
+    today=None,
+):
+    """Seed an empty schema; returns a summary with ids the harness needs."""
+    from sqlalchemy import insert
+    from app.core.security import get_password_hash
+    from app.crud.crud_hierarchy import crud_hierarchy
+    from app.crud.crud_leave import crud_leave, financial_year_id
+    from app.crud.crud_rollup import crud_rollup
+    from app.models.employee import Employee
+    from app.models.holiday import Holiday
+    from app.models.leave import LeaveRequest
+
+    rnd = random.Random(seed)
+    today = today or date.today()
+    first_day = date(today.year - years + 1, 1, 1)
+
+    # Employees: centers follow the first-level manager's subtree
+    managers, levels = reporting_tree(employees, depth)
+    ids = [uuid.uuid4() for _ in range(employees)]
+    center_of = [1] * employees
+    for index in range(1, employees):
+        manager = managers[index]
+        center_of[index] = (index - 1) % centers + 1 if manager == 0 else center_of[manager]
+    hashed = get_password_hash(PASSWORD)
+    rows = [
+        {
+            "employeeId": ids[i],
+            "email": f"bench{i}@example.com",
+            "hashed_password": hashed,
+            "firstName": f"First{i}",
+            "lastName": f"Last{i}",
+            "centerId": center_of[i],
+            "department": f"Dept {rnd.randrange(12)}",
+            "designation": "Manager" if i < len(managers) - len(levels[-1]) else "Associate",
+            "onBoardingStatus": "Completed",
+            "roles": ["SuperAdmin"] if i == 0 else ["Employee"],
+            "reportingOfficerId": ids[managers[i]] if managers[i] is not None else None,
+        }
+        for i in range(employees)
+    ]
+    for start in range(0, len(rows), 5000):
+        db.execute(insert(Employee), rows[start:start + 5000])
+
+    # Holidays: national days plus a few per center, every year
+    holidays = []
+    for year in range(first_day.year, today.year + 2):
+        for month, day in [(1, 26), (8, 15), (10, 2)]:
+            holidays.append(
+                {"holidayName": "National", "holidayDate": date(year, month, day),
+                 "holidayType": "National", "isActive": True}
+            )
+        for center_id in range(1, centers + 1):
+            for _ in range(holidays_per_center):
+                holidays.append(
+                    {
+                        "holidayName": f"Center {center_id}",
+                        "holidayDate": date(year, 1, 1) + timedelta(days=rnd.randrange(365)),
+                        "holidayType": "Regional",
+                        "isActive": True,
+                        "centerId": center_id,
+                    }
+                )
+    db.execute(insert(Holiday), holidays)
+
+    # Leave history: older requests are decided, the last month is mostly pending
+    span = (today - first_day).days
+    recent = today - timedelta(days=30)
+    batch = []
+    written = 0
+    both_halves = {"FirstHalf", "SecondHalf"}
+    for i in range(employees):
+        # Sessions held per date by Pending/Approved requests: submissions that
+        # overlap them are rejected by the API, so none are generated
+        taken = {}
+        for _ in range(rnd.randint(leaves_per_year // 2, leaves_per_year * 3 // 2) * years):
+            from_date = first_day + timedelta(days=rnd.randrange(span + 60))
+            half_day = rnd.random() < 0.15
+            to_date = from_date + timedelta(days=0 if half_day else rnd.choice(LEAVE_LENGTHS))
+            sessions = {rnd.choice(sorted(both_halves))} if half_day else both_halves
+            if from_date >= recent:
+                status = rnd.choice(["Pending", "Pending", "Pending", "Approved"])
+            else:
+                status = rnd.choice(["Approved"] * 8 + ["Rejected", "Cancelled"])
+            days = [from_date + timedelta(days=d) for d in range((to_date - from_date).days + 1)]
+            if status in ("Pending", "Approved"):
+                if any(taken.get(day, set()) & sessions for day in days):
+                    continue
+                for day in days:
+                    taken.setdefault(day, set()).update(sessions)
+            decided = status in ("Approved", "Rejected") and managers[i] is not None
+            # Submitted up to three weeks ahead, decided within hours to days
+            submitted_at = datetime.combine(
+                from_date - timedelta(days=rnd.randint(1, 21)), datetime.min.time()
+            ) + timedelta(minutes=rnd.randrange(8 * 60, 19 * 60))
+            batch.append(
+                {
+                    "employeeId": ids[i],
+                    "leaveTypeId": rnd.choice([1, 2]),
+                    "fromDate": from_date,
+                    "toDate": to_date,
+                    "leaveSession": next(iter(sessions)) if half_day else None,
+                    "reason": "generated",
+                    "status": status,
+                    "financialYearId": financial_year_id(from_date),
+                    "approvedBy": ids[managers[i]] if decided else None,
+                    "submittedAt": submitted_at,
+                    "decidedAt": (
+                        submitted_at + timedelta(minutes=rnd.randrange(10, 5 * 24 * 60))
+                        if status in ("Approved", "Rejected")
+                        else None
+                    ),
+                }
+            )
+            if len(batch) == 20000:
+                db.execute(insert(LeaveRequest), batch)
+                written += len(batch)
+                batch = []
+    if batch:
+        db.execute(insert(LeaveRequest), batch)
+        written += len(batch)
+    db.commit()
+
+    # Derived tables, built by the same code the rebuild commands use
+    crud_hierarchy.rebuild(db)
+    crud_leave.rebuild_balances(db)
+    crud_rollup.reconcile(db)
+    if db.bind.dialect.name == "sqlite":
+        # Planner statistics, as a maintained database has them
+        db.connection().exec_driver_sql("ANALYZE")
+        db.commit()
+
+    # A first-level manager: has both direct reports and a deep subtree
+    manager = levels[1][0] if len(levels) > 1 else 0
+    return {
+        "centers": centers,
+        "employees": employees,
+        "depth": len(levels),
+        "years": years,
+        "leaves": written,
+        "holidays": len(holidays),
+        "adminId": str(ids[0]),
+        "managerId": str(ids[manager]),
+        "managerEmail": f"bench{manager}@example.com",
+        "employeeId": str(ids[-1]),
+        "employeeEmail": f"bench{employees - 1}@example.com",
+        "password": PASSWORD,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--database-url", default=os.environ.get("DATABASE_URL"))
+    parser.add_argument("--centers", type=int, default=20)
+    parser.add_argument("--employees", type=int, default=5000)
+    parser.add_argument("--depth", type=int, default=5)
+    parser.add_argument("--years", type=int, default=3)
+    parser.add_argument("--leaves-per-year", type=int, default=8)
+    parser.add_argument("--holidays-per-center", type=int, default=8)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+    if not args.database_url:
+        parser.error("--database-url (or DATABASE_URL) is required")
+
+    os.environ["DATABASE_URL"] = args.database_url
+    os.environ.setdefault("SECRET_KEY", "benchmark-secret")
+    from app.db.base import Base
+    from app.db.session import SessionLocal, engine
+
+    Base.metadata.create_all(bind=engine)
+    started = time.perf_counter()
+    with SessionLocal() as db:
+        summary = generate(
+            db,
+            centers=args.centers,
+            employees=args.employees,
+            depth=args.depth,
+            years=args.years,
+            leaves_per_year=args.leaves_per_year,
+            holidays_per_center=args.holidays_per_center,
+            seed=args.seed,
+        )
+    summary["elapsedSeconds"] = round(time.perf_counter() - started, 2)
+    print(json.dumps(summary, indent=2))
+
+
+if __name__ == "__main__":
+    main()
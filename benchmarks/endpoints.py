@@ -0,0 +1,216 @@
+"""
+Endpoint benchmark harness.
+
+Seeds a synthetic organisation (benchmarks.datagen) into a throwaway SQLite
+database, then drives endpoints of every router at a fixed concurrency and
+reports throughput and p50/p95/p99 latency per scenario as JSON:
+
+    python -m benchmarks.endpoints --output before.json
+    python -m benchmarks.endpoints --output after.json --baseline before.json
+    DB_ASYNC_MODE=true python -m benchmarks.endpoints --only leaves
+
+With --baseline, each scenario also gets the change in throughput and p95
+against the earlier report. Runs in-process (httpx over ASGI, lifespan
+included), so it measures the application and the database, not a network
+stack. Scenarios only read, so every run with the same seed sees the same
+data.
+"""
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import subprocess
+import tempfile
+import time
+from datetime import date, timedelta
+
+from benchmarks.login_storm import percentile
+
+# name -> (router, method, path template, who calls it, share of --requests)
+SCENARIOS = {
+    "auth.login": ("auth", "POST", "/api/v1.0/Account/login", None, 0.05),
+    "employees.subtreeHeadcount": (
+        "employees", "GET", "/api/v1.0/Employee/SubtreeHeadcount/{managerId}", "manager", 1,
+    ),
+    "leaves.summary": (
+        "leaves", "GET",
+        "/api/v1.0/LeaveAccounts/GetLeaveSummarybyEmployeeId/{employeeId}", "employee", 1,
+    ),
+    "leaves.pendingByManager": (
+        "leaves", "GET",
+        "/api/v1.0/LeaveDetails/GetByReportingOfficerId/{managerId}", "manager", 1,
+    ),
+    "leaves.pendingInSubtree": (
+        "leaves", "GET",
+        "/api/v1.0/LeaveDetails/GetBySubtree/{managerId}?limit=100", "manager", 1,
+    ),
+    "leaves.teamAvailability": (
+        "leaves", "GET",
+        "/api/v1.0/LeaveDetails/TeamAvailability"
+        "?reportingOfficerId={managerId}&fromDate={windowFrom}&toDate={windowTo}", "manager", 1,
+    ),
+    "leaves.departmentAvailability": (
+        "leaves", "GET",
+        "/api/v1.0/LeaveDetails/TeamAvailability"
+        "?department=Dept%200&fromDate={windowFrom}&toDate={windowTo}", "admin", 1,
+    ),
+    "dashboard.overallStatus": ("dashboard", "GET", "/api/v1.0/Dashboard/overallstatus", "admin", 1),
+    "dashboard.summary": ("dashboard", "GET", "/api/v1.0/Dashboard/summary", "admin", 1),
+    "holiday.getAll": ("holiday", "GET", "/api/v1.0/hrholiday/GetAll?limit=100", "employee", 1),
+    "holiday.upcoming": ("holiday", "GET", "/api/v1.0/Employee/GetUpComingHoliday/1", "employee", 1),
+    "admin.pool": ("admin", "GET", "/api/v1.0/Admin/Pool", "admin", 1),
+}
+
+
+def git_revision():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+async def drive(client, method, url, requests, concurrency, **kwargs):
+    latencies = []
+    statuses = {}
+    remaining = iter(range(requests))
+
+    async def worker():
+        for _ in remaining:
+            started = time.perf_counter()
+            response = await client.request(method, url, **kwargs)
+            latencies.append((time.perf_counter() - started) * 1000)
+            statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    return {
+        "requests": requests,
+        "statuses": statuses,
+        "requestsPerSecond": round(requests / elapsed, 1),
+        "latencyMs": {
+            "p50": round(statistics.median(latencies), 2),
+            "p95": round(percentile(latencies, 95), 2),
+            "p99": round(percentile(latencies, 99), 2),
+        },
+    }
+
+
+async def run(args):
+    import httpx
+    from app.core.security import create_access_token
+    from app.db.base import Base
+    from app.db.session import SessionLocal, engine
+    from app.main import create_app
+    from benchmarks.datagen import generate
+
+    Base.metadata.create_all(bind=engine)
+    started = time.perf_counter()
+    with SessionLocal() as db:
+        org = generate(
+            db, centers=args.centers, employees=args.employees, depth=args.depth,
+            years=args.years, seed=args.seed,
+        )
+    seed_seconds = time.perf_counter() - started
+    # 90-day availability window around today
+    today = date.today()
+    org["windowFrom"] = today - timedelta(days=45)
+    org["windowTo"] = today + timedelta(days=44)
+
+    tokens = {
+        "admin": create_access_token(email="bench0@example.com", uid=org["adminId"],
+                                     roles=["SuperAdmin"]),
+        "manager": create_access_token(email=org["managerEmail"], uid=org["managerId"],
+                                       roles=["Employee"]),
+        "employee": create_access_token(email=org["employeeEmail"], uid=org["employeeId"],
+                                        roles=["Employee"]),
+    }
+
+    app = create_app()
+    results = {}
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(
+            transport=transport, base_url="http://bench", timeout=None
+        ) as client:
+            for name, (router, method, path, caller, share) in SCENARIOS.items():
+                if args.only and router not in args.only:
+                    continue
+                kwargs = {}
+                if caller is None:
+                    kwargs["data"] = {"username": org["managerEmail"], "password": org["password"]}
+                else:
+                    kwargs["headers"] = {"Authorization": f"Bearer {tokens[caller]}"}
+                url = path.format(**org)
+                # One untimed request per scenario: caches, first-use imports
+                await client.request(method, url, **kwargs)
+                results[name] = await drive(
+                    client, method, url, max(args.concurrency, int(args.requests * share)),
+                    args.concurrency, **kwargs
+                )
+
+    report = {
+        "revision": git_revision(),
+        "asyncMode": os.environ.get("DB_ASYNC_MODE", "false"),
+        "concurrency": args.concurrency,
+        "data": {k: org[k] for k in ("centers", "employees", "depth", "years", "leaves")},
+        "seedSeconds": round(seed_seconds, 2),
+        "scenarios": results,
+    }
+    if args.baseline:
+        with open(args.baseline) as f:
+            compare(report, json.load(f))
+    return report
+
+
+def compare(report, baseline):
+    """Add the change against an earlier report to every shared scenario."""
+    report["baselineRevision"] = baseline.get("revision")
+    for name, result in report["scenarios"].items():
+        before = baseline.get("scenarios", {}).get(name)
+        if not before:
+            continue
+        result["vsBaseline"] = {
+            "requestsPerSecondPct": round(
+                (result["requestsPerSecond"] / before["requestsPerSecond"] - 1) * 100, 1
+            ),
+            "p95Pct": round(
+                (result["latencyMs"]["p95"] / before["latencyMs"]["p95"] - 1) * 100, 1
+            ),
+        }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=500, help="per scenario")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--centers", type=int, default=20)
+    parser.add_argument("--employees", type=int, default=5000)
+    parser.add_argument("--depth", type=int, default=5)
+    parser.add_argument("--years", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--only", nargs="*", help="routers to run (auth, leaves, ...)")
+    parser.add_argument("--output", help="also write the report to this file")
+    parser.add_argument("--baseline", help="earlier report to compare against")
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="endpoints-")
+    os.environ.setdefault("DATABASE_URL", f"sqlite:///{workdir}/bench.db")
+    os.environ.setdefault("SECRET_KEY", "benchmark-secret")
+    # auth.login logs in as one account over and over: measure the login
+    # itself, not the 429s of the admission control
+    os.environ.setdefault("LOGIN_RATE_LIMIT_ENABLED", "false")
+
+    report = asyncio.run(run(args))
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text + "\n")
+    print(text)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""
+Leave export benchmark: throughput and memory.
+
+Seeds a throwaway SQLite database with benchmarks.datagen, then exports one
+financial year and then every leave request, in each format:
+
+    python -m benchmarks.export --employees 5000 --years 3
+    python -m benchmarks.export --employees 20000 --years 5 --chunk-rows 50000
+
+Peak memory is measured with tracemalloc on a second pass (it slows the
+export down) and should be the same for one year as for all of them: it
+depends on EXPORT_CHUNK_ROWS, not on the number of rows.
+"""
+import argparse
+import json
+import os
+import tempfile
+import time
+import tracemalloc
+from datetime import date
+
+
+def drain(chunks):
+    size = 0
+    for chunk in chunks:
+        size += len(chunk)
+    return size
+
+
+def run(args):
+    from app.core.config import settings
+    from app.core.export import export_chunks, gzip_chunks
+    from app.crud.crud_leave import crud_leave, financial_year_id
+    from app.db.base import Base
+    from app.db.session import SessionLocal, engine
+    from app.models.leave import LeaveRequest
+    from benchmarks.datagen import generate
+
+    if args.chunk_rows:
+        settings.EXPORT_CHUNK_ROWS = args.chunk_rows
+    Base.metadata.create_all(bind=engine)
+    with SessionLocal() as db:
+        summary = generate(db, employees=args.employees, years=args.years)
+
+    year = financial_year_id(date.today()) - 1
+    results = []
+    for label, financial_year in [(f"fy{year}", year), ("all", None)]:
+        statement = crud_leave.export_query(financial_year=financial_year)
+        for fmt, compress in [("csv", False), ("ndjson", False), ("csv", True)]:
+            counted = []
+
+            def chunks():
+                stream = export_chunks(statement, LeaveRequest.id, fmt, progress=counted.append)
+                return gzip_chunks(stream) if compress else stream
+
+            started = time.perf_counter()
+            size = drain(chunks())
+            elapsed = time.perf_counter() - started
+            tracemalloc.start()
+            drain(chunks())
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            results.append(
+                {
+                    "rows": label,
+                    "format": fmt + (".gz" if compress else ""),
+                    "exported": counted[-1],
+                    "megabytes": round(size / 1e6, 1),
+                    "seconds": round(elapsed, 2),
+                    "rowsPerSecond": round(counted[-1] / elapsed),
+                    "peakTracedMegabytes": round(peak / 1e6, 1),
+                }
+            )
+    return {
+        "employees": args.employees,
+        "leaves": summary["leaves"],
+        "chunkRows": settings.EXPORT_CHUNK_ROWS,
+        "streamBatchSize": settings.STREAM_BATCH_SIZE,
+        "exports": results,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--employees", type=int, default=5000)
+    parser.add_argument("--years", type=int, default=3)
+    parser.add_argument("--chunk-rows", type=int, default=None)
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="export-")
+    os.environ.setdefault("DATABASE_URL", f"sqlite:///{workdir}/bench.db")
+    os.environ.setdefault("SECRET_KEY", "benchmark-secret")
+
+    print(json.dumps(run(args), indent=2))
+
+
+if __name__ == "__main__":
+    main()
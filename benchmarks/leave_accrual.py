@@ -0,0 +1,95 @@
+"""
+Leave accrual and year-end job benchmark.
+
+Seeds employees into a throwaway SQLite database, accrues the twelve months
+of one financial year in LEAVE_ALLOTMENT_MODE=monthly, then closes the year,
+and reports each job's wall time:
+
+    python -m benchmarks.leave_accrual --employees 100000
+    python -m benchmarks.leave_accrual --employees 100000 --chunk-size 20000
+
+Every job is one run over all employees, committed per chunk; the target is
+a 100k-employee month in seconds, not minutes.
+"""
+import argparse
+import json
+import os
+import tempfile
+import time
+import uuid
+from datetime import date
+
+
+def run(args):
+    from sqlalchemy import insert
+    from app.core.config import settings
+    from app.crud.crud_leave_accrual import crud_leave_accrual
+    from app.db.base import Base
+    from app.db.session import SessionLocal, engine
+    from app.models.employee import Employee
+
+    settings.LEAVE_ALLOTMENT_MODE = "monthly"
+    Base.metadata.create_all(bind=engine)
+    with SessionLocal() as db:
+        rows = [
+            {
+                "employeeId": uuid.uuid4(),
+                "email": f"employee{i}@example.com",
+                "hashed_password": "x",
+                "roles": ["Employee"],
+            }
+            for i in range(args.employees)
+        ]
+        for start in range(0, len(rows), 5000):
+            db.execute(insert(Employee), rows[start:start + 5000])
+        db.commit()
+
+        fy = args.financial_year
+        months = [
+            date(fy + (m + settings.FINANCIAL_YEAR_START_MONTH - 1) // 12,
+                 (m + settings.FINANCIAL_YEAR_START_MONTH - 1) % 12 + 1, 1)
+            for m in range(12)
+        ]
+        accruals = []
+        for month in months:
+            summary = crud_leave_accrual.accrue_month(db, month, chunk_size=args.chunk_size)
+            accruals.append(summary["elapsedSeconds"])
+        # A second run of a finished month: only the checkpoint is read
+        started = time.perf_counter()
+        crud_leave_accrual.accrue_month(db, months[0], chunk_size=args.chunk_size)
+        rerun = time.perf_counter() - started
+
+        close = crud_leave_accrual.close_year(db, fy, chunk_size=args.chunk_size)
+
+    per_month = sorted(accruals)[len(accruals) // 2]
+    return {
+        "employees": args.employees,
+        "leaveTypes": len(settings.LEAVE_TYPE_MONTHLY_ACCRUALS),
+        "chunkSize": args.chunk_size or settings.LEAVE_ACCRUAL_CHUNK_SIZE,
+        "accrualMedianSeconds": per_month,
+        "accrualMaxSeconds": max(accruals),
+        "accrualPostingsPerSecond": round(
+            args.employees * len(settings.LEAVE_TYPE_MONTHLY_ACCRUALS) / per_month
+        ),
+        "finishedRerunSeconds": round(rerun, 4),
+        "yearEndSeconds": close["elapsedSeconds"],
+        "yearEndPostings": close["postings"],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--employees", type=int, default=100_000)
+    parser.add_argument("--chunk-size", type=int, default=None)
+    parser.add_argument("--financial-year", type=int, default=date.today().year - 2)
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="leave-accrual-")
+    os.environ.setdefault("DATABASE_URL", f"sqlite:///{workdir}/bench.db")
+    os.environ.setdefault("SECRET_KEY", "benchmark-secret")
+
+    print(json.dumps(run(args), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+"""
+Login storm benchmark.
+
+Fires a burst of concurrent logins while probing a non-auth endpoint and
+reports the probe latency percentiles, so the effect of the bcrypt pool on
+everything else can be compared between configurations:
+
+    PASSWORD_HASH_WORKERS=0 python -m benchmarks.login_storm   # bcrypt in threadpool
+    PASSWORD_HASH_WORKERS=2 python -m benchmarks.login_storm   # bcrypt process pool
+    python -m benchmarks.login_storm --rate-limit                # login admission on
+
+The storm logs in as one account from one client, so with --rate-limit all
+but the first LOGIN_ACCOUNT_BURST attempts are answered 429 without bcrypt.
+
+Runs in-process against a throwaway SQLite database.
+"""
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import tempfile
+import time
+
+
+def percentile(values, pct):
+    if not values:
+        return None
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+async def run(args):
+    import httpx
+    from app.core.security import get_password_hash
+    from app.db.base import Base
+    from app.db.session import SessionLocal, engine
+    from app.main import app
+    from app.models.employee import Employee
+
+    Base.metadata.create_all(bind=engine)
+    with SessionLocal() as db:
+        db.add(
+            Employee(
+                email="storm@example.com",
+                hashed_password=get_password_hash("storm-password"),
+                firstName="Storm",
+                lastName="User",
+                roles=["Employee"],
+            )
+        )
+        db.commit()
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        statuses = {}
+        probe_latencies = []
+        storm_done = asyncio.Event()
+
+        async def login():
+            response = await client.post(
+                "/api/v1.0/Account/login",
+                data={"username": "storm@example.com", "password": "storm-password"},
+            )
+            statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+
+        async def storm():
+            semaphore = asyncio.Semaphore(args.concurrency)
+
+            async def bounded():
+                async with semaphore:
+                    await login()
+
+            await asyncio.gather(*(bounded() for _ in range(args.logins)))
+            storm_done.set()
+
+        async def probe():
+            while not storm_done.is_set():
+                started = time.perf_counter()
+                await client.get("/")
+                probe_latencies.append((time.perf_counter() - started) * 1000)
+                await asyncio.sleep(args.probe_interval)
+
+        started = time.perf_counter()
+        await asyncio.gather(storm(), *(probe() for _ in range(args.probes)))
+        elapsed = time.perf_counter() - started
+
+    return {
+        "passwordHashWorkers": int(os.environ.get("PASSWORD_HASH_WORKERS", "2")),
+        "logins": args.logins,
+        "concurrency": args.concurrency,
+        "elapsedSeconds": round(elapsed, 3),
+        "rateLimit": args.rate_limit,
+        "loginStatuses": statuses,
+        "probeRequests": len(probe_latencies),
+        "probeLatencyMs": {
+            "p50": round(statistics.median(probe_latencies), 2) if probe_latencies else None,
+            "p95": round(percentile(probe_latencies, 95), 2) if probe_latencies else None,
+            "p99": round(percentile(probe_latencies, 99), 2) if probe_latencies else None,
+        },
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--logins", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--probes", type=int, default=4)
+    parser.add_argument("--probe-interval", type=float, default=0.01)
+    parser.add_argument("--rate-limit", action="store_true", help="keep login admission on")
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="login-storm-")
+    os.environ.setdefault("DATABASE_URL", f"sqlite:///{workdir}/bench.db")
+    os.environ.setdefault("SECRET_KEY", "benchmark-secret")
+    os.environ["LOGIN_RATE_LIMIT_ENABLED"] = "true" if args.rate_limit else "false"
+
+    print(json.dumps(asyncio.run(run(args)), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,144 @@
+"""
+Response serialization microbenchmark.
+
+Measures the cost per 1,000 rows of turning a page of leave requests (ORM
+rows) and holidays (the calendar's HolidayBase objects) into a JSON body, the
+way the list endpoints used to and the way they do now:
+
+    python -m benchmarks.serialization [--rows 1000] [--repeat 200]
+
+- jsonableEncoder: FastAPI's generic jsonable_encoder walk + json.dumps, the
+  path taken when a route has a custom response class
+- dictResponseModel: rows validated one by one in Python, returned in a
+  dict under response_model=dict (the previous endpoints)
+- orjson: the same per-row validation, model_dump() and orjson.dumps, i.e.
+  an orjson-backed response class (needs `pip install orjson`)
+- typedResponseModel: the whole page validated by one TypeAdapter call and
+  returned as ApiPage[...] (the current endpoints)
+
+Each variant includes what FastAPI itself does with the returned value
+(validation against the response model, then JSON).
+"""
+import argparse
+import json
+import os
+import time
+import uuid
+from datetime import date, timedelta
+
+
+def leave_rows(count):
+    from app.models.leave import LeaveRequest
+
+    start = date(2026, 4, 1)
+    return [
+        LeaveRequest(
+            id=i,
+            employeeId=uuid.uuid4(),
+            leaveTypeId=i % 2 + 1,
+            fromDate=start + timedelta(days=i % 300),
+            toDate=start + timedelta(days=i % 300 + 2),
+            reason="Family function",
+            status="Pending",
+            financialYearId=2026,
+            leaveDays=3.0,
+        )
+        for i in range(count)
+    ]
+
+
+def holidays(count):
+    from app.schemas.holiday import HolidayBase
+
+    return [
+        HolidayBase(
+            hrholidayId=i,
+            holidayName=f"Holiday {i}",
+            holidayDate=date(2026, 1, 1) + timedelta(days=i % 365),
+            holidayType="Regional",
+            isActive=True,
+            centerId=i % 20 + 1,
+        )
+        for i in range(count)
+    ]
+
+
+def variants():
+    import orjson
+    from fastapi.encoders import jsonable_encoder
+    from pydantic import TypeAdapter
+    from app.schemas.auth import ApiPage
+    from app.schemas.holiday import HolidayBase
+    from app.schemas.leave import LeaveRequestRead, leave_request_list
+
+    dict_model = TypeAdapter(dict)
+    leave_page = TypeAdapter(ApiPage[LeaveRequestRead])
+    holiday_page = TypeAdapter(ApiPage[HolidayBase])
+
+    def as_dict_model(body):
+        return dict_model.dump_json(dict_model.validate_python(body))
+
+    return {
+        "leaves": {
+            "jsonableEncoder": lambda rows: json.dumps(jsonable_encoder(
+                {"data": [LeaveRequestRead.model_validate(r) for r in rows], "succeeded": True}
+            )).encode(),
+            "dictResponseModel": lambda rows: as_dict_model(
+                {"data": [LeaveRequestRead.model_validate(r) for r in rows], "succeeded": True}
+            ),
+            "orjson": lambda rows: orjson.dumps(
+                {"data": [LeaveRequestRead.model_validate(r).model_dump() for r in rows],
+                 "succeeded": True}
+            ),
+            "typedResponseModel": lambda rows: leave_page.dump_json(leave_page.validate_python(
+                ApiPage[LeaveRequestRead](
+                    data=leave_request_list.validate_python(rows, from_attributes=True)
+                )
+            )),
+        },
+        "holidays": {
+            "jsonableEncoder": lambda rows: json.dumps(
+                jsonable_encoder({"data": rows, "succeeded": True})
+            ).encode(),
+            "dictResponseModel": lambda rows: as_dict_model({"data": rows, "succeeded": True}),
+            "orjson": lambda rows: orjson.dumps(
+                {"data": [h.model_dump() for h in rows], "succeeded": True}
+            ),
+            "typedResponseModel": lambda rows: holiday_page.dump_json(
+                holiday_page.validate_python(ApiPage[HolidayBase](data=rows))
+            ),
+        },
+    }
+
+
+def measure(serialize, rows, repeat):
+    body = serialize(rows)  # warm-up, and a sanity check of the output
+    json.loads(body)
+    started = time.perf_counter()
+    for _ in range(repeat):
+        serialize(rows)
+    per_call = (time.perf_counter() - started) / repeat
+    return round(per_call * 1000 * 1000 / len(rows), 3)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    os.environ.setdefault("DATABASE_URL", "sqlite://")
+    os.environ.setdefault("SECRET_KEY", "benchmark-secret")
+
+    data = {"leaves": leave_rows(args.rows), "holidays": holidays(args.rows)}
+    report = {"rows": args.rows, "repeat": args.repeat, "msPer1000Rows": {}}
+    for kind, serializers in variants().items():
+        report["msPer1000Rows"][kind] = {
+            name: measure(serialize, data[kind], args.repeat)
+            for name, serialize in serializers.items()
+        }
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""
+Application startup benchmark.
+
+Starts a fresh interpreter per run and measures how long it takes to import
+app.main, to build the app with create_app(), to run the lifespan startup
+(engine creation and pool warm-up) and to answer the first request:
+
+    python -m benchmarks.startup [--runs 5]
+    DB_POOL_WARMUP_CONNECTIONS=0 python -m benchmarks.startup
+
+Runs against a throwaway SQLite database; reports the median of each phase
+in milliseconds.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+# Executed in a child interpreter so imports are not already cached
+PROBE = """
+import json, time
+started = time.perf_counter()
+import app.main
+imported = time.perf_counter()
+application = app.main.create_app()
+created = time.perf_counter()
+from fastapi.testclient import TestClient
+with TestClient(application) as client:
+    ready = time.perf_counter()
+    status = client.get("/").status_code
+    answered = time.perf_counter()
+print(json.dumps({
+    "importMs": (imported - started) * 1000,
+    "createAppMs": (created - imported) * 1000,
+    "lifespanStartupMs": (ready - created) * 1000,
+    "firstRequestMs": (answered - ready) * 1000,
+    "timeToFirstResponseMs": (answered - started) * 1000,
+    "status": status,
+}))
+"""
+
+
+def measure(env):
+    output = subprocess.run(
+        [sys.executable, "-c", PROBE], env=env, check=True, capture_output=True, text=True
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="startup-")
+    env = dict(os.environ)
+    env.setdefault("DATABASE_URL", f"sqlite:///{workdir}/bench.db")
+    env.setdefault("SECRET_KEY", "benchmark-secret")
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [os.getcwd(), env.get("PYTHONPATH")]))
+
+    runs = [measure(env) for _ in range(args.runs)]
+    report = {
+        "runs": args.runs,
+        "warmupConnections": int(env.get("DB_POOL_WARMUP_CONNECTIONS", "2")),
+        "asyncMode": env.get("DB_ASYNC_MODE", "false"),
+    }
+    for phase in [k for k in runs[0] if k.endswith("Ms")]:
+        report[phase] = round(statistics.median(run[phase] for run in runs), 1)
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,165 @@
+"""
+Working-day re-costing benchmark.
+
+Costs a batch of synthetic leaves with the vectorised per-center engine and,
+for comparison, a sample with the one-request-at-a-time path, then re-costs
+a seeded leave table end to end through rebuild_balances(recost=True):
+
+    python -m benchmarks.working_days [--leaves 1000000] [--db-rows 100000]
+
+Runs in-process against a throwaway SQLite database.
+"""
+import argparse
+import json
+import os
+import random
+import tempfile
+import time
+import uuid
+from datetime import date, timedelta
+
+
+def synthetic_leaves(count, centers, seed=7):
+    import numpy as np
+
+    rng = np.random.default_rng(seed)
+    start = np.datetime64("2020-04-01") + rng.integers(0, 6 * 365, count).astype("timedelta64[D]")
+    length = rng.choice([0, 0, 1, 2, 4, 9], count).astype("timedelta64[D]")
+    half_day = rng.random(count) < 0.15
+    end = np.where(half_day, start, start + length)
+    center_ids = rng.integers(1, centers + 1, count)
+    return start, end, half_day, center_ids
+
+
+def seed_holidays(db, centers, seed=7):
+    from app.models.holiday import Holiday
+
+    rnd = random.Random(seed)
+    rows = []
+    for year in range(2020, 2027):
+        for month, day in [(1, 26), (8, 15), (10, 2)]:
+            rows.append(
+                Holiday(holidayName="National", holidayDate=date(year, month, day),
+                        holidayType="National", isActive=True)
+            )
+        for center_id in range(1, centers + 1):
+            for _ in range(8):
+                rows.append(
+                    Holiday(
+                        holidayName=f"Center {center_id}",
+                        holidayDate=date(year, 1, 1) + timedelta(days=rnd.randrange(365)),
+                        holidayType="Regional",
+                        isActive=True,
+                        centerId=center_id,
+                    )
+                )
+    db.add_all(rows)
+    db.commit()
+
+
+def seed_leaves(db, rows, centers, seed=7):
+    from sqlalchemy import insert
+    from app.models.employee import Employee
+    from app.models.leave import LeaveRequest
+
+    employees = [
+        {"employeeId": uuid.uuid4(), "email": f"bench{i}@example.com",
+         "hashed_password": "x", "roles": ["Employee"], "centerId": i % centers + 1}
+        for i in range(max(1, rows // 50))
+    ]
+    db.execute(insert(Employee), employees)
+
+    start, end, half_day, _ = synthetic_leaves(rows, centers, seed)
+    rnd = random.Random(seed)
+    batch = []
+    for i in range(rows):
+        from_date = start[i].item()
+        batch.append(
+            {
+                "employeeId": employees[rnd.randrange(len(employees))]["employeeId"],
+                "leaveTypeId": rnd.choice([1, 2]),
+                "fromDate": from_date,
+                "toDate": end[i].item(),
+                "leaveSession": "FirstHalf" if half_day[i] else None,
+                "reason": "bench",
+                "status": rnd.choice(["Approved", "Approved", "Pending", "Rejected"]),
+                "financialYearId": from_date.year if from_date.month >= 4 else from_date.year - 1,
+            }
+        )
+        if len(batch) == 20000:
+            db.execute(insert(LeaveRequest), batch)
+            batch = []
+    if batch:
+        db.execute(insert(LeaveRequest), batch)
+    db.commit()
+
+
+def run(args):
+    from app.db.base import Base
+    from app.db.session import SessionLocal, engine
+
+    Base.metadata.create_all(bind=engine)
+    from app.core.working_days import count_working_days_by_center, working_days
+    from app.crud.crud_holiday import holiday_calendar
+    from app.crud.crud_leave import crud_leave
+
+    with SessionLocal() as db:
+        seed_holidays(db, args.centers)
+        holiday_calendar.ensure_loaded(db)
+
+    start, end, half_day, center_ids = synthetic_leaves(args.leaves, args.centers)
+    started = time.perf_counter()
+    days = count_working_days_by_center(
+        start, end, half_day, center_ids, holiday_calendar.busday_calendar
+    )
+    vectorised = time.perf_counter() - started
+
+    sample = min(args.scalar_sample, args.leaves)
+    started = time.perf_counter()
+    for i in range(sample):
+        scalar = working_days(
+            start[i].item(), end[i].item(), "FirstHalf" if half_day[i] else None,
+            holiday_calendar.busday_calendar(int(center_ids[i])),
+        )
+        assert scalar == days[i]
+    per_row = (time.perf_counter() - started) / sample
+
+    result = {
+        "leaves": args.leaves,
+        "centers": args.centers,
+        "vectorisedSeconds": round(vectorised, 3),
+        "perRowSecondsEstimate": round(per_row * args.leaves, 1),
+        "totalWorkingDays": float(days.sum()),
+    }
+
+    if args.db_rows:
+        with SessionLocal() as db:
+            started = time.perf_counter()
+            seed_leaves(db, args.db_rows, args.centers)
+            result["dbSeedSeconds"] = round(time.perf_counter() - started, 2)
+        with SessionLocal() as db:
+            started = time.perf_counter()
+            ledger_rows = crud_leave.rebuild_balances(db, recost=True)
+            result["dbRows"] = args.db_rows
+            result["dbRecostSeconds"] = round(time.perf_counter() - started, 2)
+            result["ledgerRows"] = ledger_rows
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--leaves", type=int, default=1_000_000)
+    parser.add_argument("--centers", type=int, default=20)
+    parser.add_argument("--scalar-sample", type=int, default=20_000)
+    parser.add_argument("--db-rows", type=int, default=100_000)
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="working-days-")
+    os.environ.setdefault("DATABASE_URL", f"sqlite:///{workdir}/bench.db")
+    os.environ.setdefault("SECRET_KEY", "benchmark-secret")
+
+    print(json.dumps(run(args), indent=2))
+
+
+if __name__ == "__main__":
+    main()
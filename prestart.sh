@@ -7,6 +7,14 @@ echo "Waiting for SQL Server..."
 echo "Running migrations..."
 alembic upgrade head
 
+# Fill the tables derived from existing rows, once, after the migrations
+# that add them (no-ops afterwards). The ledger costs leaveDays, which the
+# rollups then count, so keep this order.
+echo "Filling derived tables..."
+python -m app.commands.rebuild_employee_hierarchy --if-empty
+python -m app.commands.rebuild_leave_balances --if-empty
+python -m app.commands.reconcile_rollups --if-empty
+
 # Start the application
 echo "Starting FastAPI..."
-exec uvicorn app.main:app --host 0.0.0.0 --port 8000
\ No newline at end of file
+exec uvicorn --factory app.main:create_app --host 0.0.0.0 --port 8000
\ No newline at end of file
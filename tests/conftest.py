@@ -0,0 +1,87 @@
+import os
+import tempfile
+import uuid
+
+import pytest
+
+# Settings are read at import time, so they have to exist before any app module
+# is imported by the tests.
+os.environ.setdefault(
+    "DATABASE_URL", f"sqlite:///{tempfile.mkdtemp(prefix='leavesapp-tests-')}/test.db"
+)
+os.environ.setdefault("SECRET_KEY", "test-secret-key")
+
+
+@pytest.fixture
+def db():
+    """A session on a freshly created schema."""
+    from app.crud.crud_holiday import holiday_calendar
+    from app.db.base import Base
+    from app.db.session import SessionLocal, engine
+
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    holiday_calendar.bump_version()
+    session = SessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
+
+
+@pytest.fixture
+def make_employee(db):
+    from app.models.employee import Employee
+
+    def _make(**fields):
+        fields.setdefault("employeeId", uuid.uuid4())
+        fields.setdefault("email", f"{fields['employeeId']}@example.com")
+        fields.setdefault("hashed_password", "not-a-real-hash")
+        fields.setdefault("roles", ["Employee"])
+        employee = Employee(**fields)
+        db.add(employee)
+        db.commit()
+        return employee
+
+    return _make
+
+
+@pytest.fixture
+def client_for():
+    """A TestClient authenticated as the given employee, with their roles."""
+    from fastapi.testclient import TestClient
+
+    from app import main
+    from app.core.security import create_access_token
+
+    def _client(user, app=None, **kwargs):
+        token = create_access_token(
+            email=user.email, uid=str(user.employeeId), roles=user.roles
+        )
+        return TestClient(
+            app or main.app, headers={"Authorization": f"Bearer {token}"}, **kwargs
+        )
+
+    return _client
+
+
+@pytest.fixture
+def apply_leave(db):
+    """Submit a full-day leave through crud_leave."""
+    from app.crud.crud_leave import crud_leave
+    from app.schemas.leave import LeaveCreate
+
+    def _apply(employee, from_date, to_date, leave_type_id=1, fy=2026):
+        return crud_leave.create_full_day_leave(
+            db,
+            obj_in=LeaveCreate(
+                employeeId=employee.employeeId,
+                leaveTypeId=leave_type_id,
+                reason="test",
+                fromDate=from_date,
+                toDate=to_date,
+                financialYearId=fy,
+            ),
+        )
+
+    return _apply
@@ -0,0 +1,87 @@
+from datetime import date, timedelta
+
+import pytest
+
+
+@pytest.fixture
+def async_app(db, monkeypatch):
+    """create_app() with the leave routers served by sqlite+aiosqlite."""
+    from app.core.config import settings
+    from app.crud.crud_dashboard import invalidate_dashboard
+    from app.db import session
+    from app.main import create_app
+
+    monkeypatch.setattr(settings, "DB_ASYNC_MODE", True)
+    # Each client runs the lifespan: keep it from starting outbox workers
+    monkeypatch.setattr(settings, "OUTBOX_WORKER_ENABLED", False)
+    # Built for this test only; the lifespan disposes of it on exit
+    monkeypatch.setattr(session, "_async_engine", None)
+    monkeypatch.setattr(session, "_async_session_factory", None)
+    assert session.get_async_database_url().startswith("sqlite+aiosqlite://")
+    invalidate_dashboard()
+    return create_app()
+
+
+def test_leave_flows_in_async_mode(async_app, db, make_employee, client_for):
+    from app.models.leave_balance import LeaveBalance
+
+    manager = make_employee()
+    employee = make_employee(department="R&D", reportingOfficerId=manager.employeeId)
+    monday = date.today() - timedelta(days=date.today().weekday())
+    fy = monday.year
+
+    # One client per lifespan: the aiosqlite pool lives on its event loop
+    with client_for(employee, app=async_app) as staff, client_for(
+        manager, app=async_app
+    ) as boss:
+        applied = staff.post(
+            "/api/v1.0/LeaveDetails",
+            json={
+                "employeeId": str(employee.employeeId),
+                "leaveTypeId": 1,
+                "reason": "trip",
+                "fromDate": monday.isoformat(),
+                "toDate": (monday + timedelta(days=2)).isoformat(),
+                "financialYearId": fy,
+            },
+        )
+        assert applied.status_code == 200
+        leave_id = applied.json()["data"]["hrEmployeeFullDayLeaveDetailsId"]
+
+        listed = boss.get(
+            f"/api/v1.0/LeaveDetails/GetByReportingOfficerId/{manager.employeeId}"
+        )
+        assert [r["id"] for r in listed.json()["data"]] == [leave_id]
+        streamed = boss.get(
+            f"/api/v1.0/LeaveDetails/GetByReportingOfficerId/{manager.employeeId}",
+            params={"format": "ndjson"},
+        )
+        assert [line for line in streamed.iter_lines() if line][0].startswith(
+            f'{{"id":{leave_id},'
+        )
+
+        approved = boss.post(
+            "/api/v1.0/LeaveDetails/approve",
+            json={
+                "hrEmployeeFullDayLeaveDetailsId": leave_id,
+                "approvedBy": str(manager.employeeId),
+                "approvalComments": "ok",
+                "isApproved": True,
+            },
+        )
+        assert approved.status_code == 200
+
+        summary = staff.get(
+            f"/api/v1.0/LeaveAccounts/GetLeaveSummarybyEmployeeId/{employee.employeeId}",
+            params={"financialYearId": fy},
+        ).json()["data"]
+        assert (summary["usedLeaves"], summary["pendingLeaves"]) == (3, 0)
+
+        dashboard = boss.get("/api/v1.0/Dashboard/summary").json()["data"]
+        assert [
+            (t["month"], t["department"], t["approved"]) for t in dashboard["monthlyLeaveTrends"]
+        ] == [(monday.strftime("%Y-%m"), "R&D", 1)]
+
+    db.expire_all()
+    balance = db.get(LeaveBalance, (employee.employeeId, fy, 1))
+    assert (balance.used, balance.pending) == (3, 0)
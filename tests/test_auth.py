@@ -0,0 +1,160 @@
+import asyncio
+import threading
+import time
+import uuid
+
+import pytest
+
+from app.core import security
+from app.core.token_cache import EmployeeSnapshot, TokenCache
+
+
+def make_snapshot(employee_id=None):
+    return EmployeeSnapshot(employeeId=employee_id or uuid.uuid4(), email="a@b.com")
+
+
+def test_token_cache_hit_and_miss_counters():
+    cache = TokenCache(max_size=10, ttl_seconds=60)
+    user = make_snapshot()
+
+    assert cache.get("jti-1", "token-1") is None
+    cache.put("jti-1", "token-1", {"exp": time.time() + 60}, user)
+
+    assert cache.get("jti-1", "token-1").user is user
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+
+
+def test_token_cache_rejects_other_token_with_same_jti():
+    cache = TokenCache(max_size=10, ttl_seconds=60)
+    cache.put("jti-1", "token-1", {}, make_snapshot())
+
+    assert cache.get("jti-1", "forged-token") is None
+
+
+def test_token_cache_is_capped_at_token_exp():
+    cache = TokenCache(max_size=10, ttl_seconds=3600)
+    cache.put("jti-1", "token-1", {"exp": time.time() - 1}, make_snapshot())
+
+    assert cache.get("jti-1", "token-1") is None
+
+
+def test_token_cache_evicts_least_recently_used():
+    cache = TokenCache(max_size=2, ttl_seconds=60)
+    cache.put("a", "ta", {}, make_snapshot())
+    cache.put("b", "tb", {}, make_snapshot())
+    cache.get("a", "ta")
+    cache.put("c", "tc", {}, make_snapshot())
+
+    assert cache.get("b", "tb") is None
+    assert cache.get("a", "ta") is not None
+    assert cache.stats()["evictions"] == 1
+
+
+def test_token_cache_invalidates_all_tokens_of_an_employee():
+    cache = TokenCache(max_size=10, ttl_seconds=60)
+    employee_id = uuid.uuid4()
+    cache.put("a", "ta", {}, make_snapshot(employee_id))
+    cache.put("b", "tb", {}, make_snapshot(employee_id))
+    cache.put("c", "tc", {}, make_snapshot())
+
+    cache.invalidate_employee(employee_id)
+
+    assert cache.get("a", "ta") is None
+    assert cache.get("b", "tb") is None
+    assert cache.get("c", "tc") is not None
+
+
+def test_token_cache_drops_snapshot_loaded_before_an_invalidation():
+    cache = TokenCache(max_size=10, ttl_seconds=60)
+    user = make_snapshot()
+
+    # A miss loads the employee, an update commits, then the miss stores
+    generation = cache.generation(user.employeeId)
+    cache.invalidate_employee(user.employeeId)
+    cache.put("a", "ta", {}, user, generation=generation)
+    assert cache.get("a", "ta") is None
+
+    cache.put("a", "ta", {}, user, generation=cache.generation(user.employeeId))
+    assert cache.get("a", "ta").user is user
+
+
+def test_password_hashing_fails_fast_when_saturated(monkeypatch):
+    monkeypatch.setattr(security, "_hash_slots", threading.BoundedSemaphore(1))
+    security._hash_slots.acquire()
+
+    with pytest.raises(security.PasswordHashingBusy):
+        asyncio.run(security.verify_password_async("secret", "not-a-hash"))
+    with pytest.raises(security.PasswordHashingBusy):
+        security.get_password_hash_pooled("secret")
+
+
+@pytest.mark.parametrize("backend", ["memory", "sqlite"])
+def test_token_bucket_admits_burst_then_reports_wait(backend, tmp_path):
+    from app.core.shared_state import open_state
+
+    url = "memory://" if backend == "memory" else f"sqlite:///{tmp_path}/state.db"
+    state = open_state(url)
+
+    assert [state.take("k", 3, 1) for _ in range(3)] == [0, 0, 0]
+    assert 0.9 < state.take("k", 3, 1) <= 1
+    assert state.take("other", 3, 1) == 0
+    assert [state.bump("v"), state.bump("v"), state.counter("v")] == [1, 2, 2]
+
+
+def test_sqlite_state_is_shared_between_instances(tmp_path):
+    from app.core.shared_state import open_state
+
+    # Two workers opening the same file see one bucket
+    first = open_state(f"sqlite:///{tmp_path}/state.db")
+    second = open_state(f"sqlite:///{tmp_path}/state.db")
+    assert first.take("k", 1, 0.01) == 0
+    assert second.take("k", 1, 0.01) > 0
+
+
+def test_login_is_throttled_before_lookup_and_bcrypt(db, make_employee, monkeypatch):
+    from fastapi.testclient import TestClient
+
+    from app.core import shared_state
+    from app.core.config import settings
+    from app.core.sql_metrics import query_budget
+    from app.main import app
+
+    monkeypatch.setattr(settings, "PASSWORD_HASH_WORKERS", 0)
+    monkeypatch.setattr(settings, "LOGIN_ACCOUNT_BURST", 2)
+    monkeypatch.setattr(shared_state, "_state", shared_state.MemoryState())
+    make_employee(email="throttled@example.com", hashed_password=security.get_password_hash("x"))
+    verified = []
+    monkeypatch.setattr(
+        security, "verify_password", lambda *args: verified.append(args) or False
+    )
+    client = TestClient(app)
+    form = {"username": "throttled@example.com", "password": "wrong"}
+
+    for _ in range(2):
+        assert client.post("/api/v1.0/Account/login", data=form).status_code == 401
+    with query_budget(0):
+        response = client.post("/api/v1.0/Account/login", data=form)
+    assert response.status_code == 429
+    assert int(response.headers["Retry-After"]) >= 1
+    assert len(verified) == 2
+
+
+def test_role_change_applies_to_the_next_request_with_a_cached_token(
+    make_employee, client_for
+):
+    employee = make_employee(firstName="Ana", lastName="Lee", roles=["Employee"])
+    other = make_employee()
+    client = client_for(employee)
+    url = f"/api/v1.0/Employee/SubtreeHeadcount/{other.employeeId}"
+    assert client.get(url).status_code == 403
+
+    admin = client_for(make_employee(roles=["SuperAdmin"]))
+    response = admin.put(
+        f"/api/v1.0/Employee/UpdateEmployeeBasic/{employee.employeeId}",
+        json={"roles": ["HR Admin"]},
+    )
+    assert response.status_code == 200
+
+    # Same token, whose snapshot the first request cached
+    assert client.get(url).status_code == 200
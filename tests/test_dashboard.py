@@ -0,0 +1,168 @@
+import threading
+import time
+from datetime import date, timedelta
+
+from sqlalchemy import update
+
+from app.core.cache import CoalescingTTLCache
+from app.core.outbox import utcnow
+from app.core.sql_metrics import query_budget
+from app.crud.crud_dashboard import crud_dashboard, invalidate_dashboard
+from app.crud.crud_leave import crud_leave
+from app.crud.crud_rollup import crud_rollup
+from app.models.employee import Employee
+from app.models.rollup import ApprovalDailyRollup, DepartmentHeadcount, LeaveDailyRollup
+from app.schemas.leave import LeaveApproval, LeaveCreate
+
+
+def test_concurrent_misses_run_one_load():
+    cache = CoalescingTTLCache(ttl_seconds=60)
+    calls = []
+    results = []
+
+    def loader():
+        calls.append(1)
+        time.sleep(0.05)
+        return "value"
+
+    threads = [
+        threading.Thread(target=lambda: results.append(cache.get_or_load("k", loader)))
+        for _ in range(8)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(calls) == 1
+    assert results == ["value"] * 8
+
+
+def test_invalidation_during_load_is_not_cached():
+    cache = CoalescingTTLCache(ttl_seconds=60)
+
+    def stale_loader():
+        cache.invalidate()
+        return "stale"
+
+    assert cache.get_or_load("k", stale_loader) == "stale"
+    assert cache.get_or_load("k", lambda: "fresh") == "fresh"
+
+
+def test_overall_status_is_invalidated_by_leave_writes(db, make_employee):
+    employee = make_employee(onBoardingStatus="Completed")
+    invalidate_dashboard()
+
+    status = crud_dashboard.get_overall_status(db)
+    assert status["totalEmployees"] == 1
+    assert status["pendingLeaveRequests"] == 0
+    assert "asOf" in status
+
+    crud_leave.create_full_day_leave(
+        db,
+        obj_in=LeaveCreate(
+            employeeId=employee.employeeId,
+            leaveTypeId=1,
+            reason="test",
+            fromDate=date(2026, 5, 4),
+            toDate=date(2026, 5, 4),
+            financialYearId=2026,
+        ),
+    )
+    assert crud_dashboard.get_overall_status(db)["pendingLeaveRequests"] == 1
+
+
+def test_rollups_follow_leave_writes_and_reconcile_repairs_drift(db, make_employee, apply_leave):
+    manager = make_employee(department="HR")
+    staff = [
+        make_employee(department="Finance", reportingOfficerId=manager.employeeId)
+        for _ in range(3)
+    ]
+    monday = date.today() - timedelta(days=date.today().weekday())
+    month = monday.year * 100 + monday.month
+    leaves = [apply_leave(e, monday, monday + timedelta(days=1)) for e in staff]
+
+    def decision(leave, approve):
+        return LeaveApproval(
+            hrEmployeeFullDayLeaveDetailsId=leave.id,
+            approvedBy=manager.employeeId,
+            approvalComments="",
+            isApproved=approve,
+        )
+
+    crud_leave.approve_or_reject_leave(db, obj_in=decision(leaves[0], True))
+    crud_leave.approve_or_reject_batch(
+        db, [decision(leaves[1], False)], approver_id=manager.employeeId
+    )
+    crud_leave.cancel_leave(db, leaves[2].id, staff[2].employeeId)
+
+    finance = db.get(LeaveDailyRollup, (month, "Finance", 1, monday))
+    assert (
+        finance.pending,
+        finance.approved,
+        finance.rejected,
+        finance.cancelled,
+        finance.approvedDays,
+    ) == (0, 1, 1, 1, 2)
+    decided_on = utcnow().date()
+    decided = db.get(
+        ApprovalDailyRollup, (decided_on.year * 100 + decided_on.month, "Finance", decided_on)
+    )
+    assert (decided.decisions, decided.approvals, decided.timedDecisions) == (2, 1, 2)
+    assert decided.decidedWithinDay == 2
+
+    # The incremental rows are what a recount gives; the employees were
+    # inserted around the CRUD layer, so their headcounts are missing
+    corrected = crud_rollup.reconcile(db)
+    assert corrected == {
+        "leave_daily_rollups": 0,
+        "approval_daily_rollups": 0,
+        "department_headcounts": 2,
+    }
+    assert db.get(DepartmentHeadcount, "Finance").employees == 3
+
+    db.execute(
+        update(Employee)
+        .where(Employee.employeeId == staff[2].employeeId)
+        .values(department="Sales")
+    )
+    db.commit()
+    crud_rollup.reconcile(db, since=monday)
+    db.expire_all()
+    assert db.get(LeaveDailyRollup, (month, "Finance", 1, monday)).cancelled == 0
+    assert db.get(LeaveDailyRollup, (month, "Sales", 1, monday)).cancelled == 1
+    assert db.get(DepartmentHeadcount, "Sales").employees == 1
+
+
+def test_summary_is_served_from_rollups(db, make_employee, apply_leave, client_for):
+    admin = make_employee(roles=["SuperAdmin"], department="HR")
+    employee, colleague = [make_employee(department="Finance") for _ in range(2)]
+    monday = date.today() - timedelta(days=date.today().weekday())
+    apply_leave(employee, monday, monday)
+    crud_rollup.reconcile(db)
+    invalidate_dashboard()
+    client = client_for(admin)
+
+    with query_budget(4):  # the caller, then one query per section
+        data = client.get("/api/v1.0/Dashboard/summary").json()["data"]
+    assert data["departmentDistribution"] == {"Finance": 2, "HR": 1}
+    assert data["monthlyLeaveTrends"] == [
+        {
+            "month": monday.strftime("%Y-%m"),
+            "department": "Finance",
+            "leaveTypeId": 1,
+            "requests": 1,
+            "pending": 1,
+            "approved": 0,
+            "rejected": 0,
+            "cancelled": 0,
+            "approvedDays": 0.0,
+        }
+    ]
+    assert data["approvalTurnaround"] == []
+    assert data["message"] == "Comprehensive analytics retrieved"
+
+    # A submission invalidates the cached summary
+    apply_leave(colleague, monday, monday)
+    data = client.get("/api/v1.0/Dashboard/summary").json()["data"]
+    assert data["monthlyLeaveTrends"][0]["requests"] == 2
@@ -0,0 +1,108 @@
+import json
+
+from app.core.config import settings
+from app.core.security import password_needs_rehash
+from app.models.employee import Employee
+
+
+def test_bulk_import_reports_every_line(db, make_employee, client_for, monkeypatch):
+    monkeypatch.setattr(settings, "PASSWORD_HASH_WORKERS", 0)
+    monkeypatch.setattr(settings, "BULK_IMPORT_BATCH_SIZE", 2)
+    monkeypatch.setattr(settings, "BULK_IMPORT_BCRYPT_ROUNDS", 4)
+    make_employee(email="taken@example.com")
+    client = client_for(make_employee(roles=["SuperAdmin"]))
+
+    body = "\n".join(
+        [
+            "firstName,lastName,email,password,centerId,roles",
+            'Asha,"Rao, Jr",asha@example.com,pw-1,3,Employee;HR Admin',
+            "Ravi,Iyer,taken@example.com,pw-2,3,",
+            "Meera,Shah,not-an-email,pw-3,3,",
+            "Asha,Again,asha@example.com,pw-4,3,",
+            "Kiran,Das,kiran@example.com,pw-5,,",
+        ]
+    )
+    response = client.post(
+        "/api/v1.0/Employee/BulkImport", content=body, headers={"Content-Type": "text/csv"}
+    )
+
+    report = response.json()["data"]
+    assert [(r["line"], r["status"]) for r in report["rows"]] == [
+        (2, "created"),
+        (3, "duplicate"),
+        (4, "invalid"),
+        (5, "duplicate"),
+        (6, "created"),
+    ]
+    assert (report["created"], report["duplicates"], report["invalid"]) == (2, 2, 1)
+
+    asha = db.query(Employee).filter(Employee.email == "asha@example.com").one()
+    assert (asha.lastName, asha.centerId, asha.roles) == ("Rao, Jr", 3, ["Employee", "HR Admin"])
+    assert str(asha.employeeId) == report["rows"][0]["employeeId"]
+
+    # The cheap import hash is upgraded on first login
+    assert password_needs_rehash(asha.hashed_password)
+    login = client.post(
+        "/api/v1.0/Account/login", data={"username": "asha@example.com", "password": "pw-1"}
+    )
+    assert login.status_code == 200
+    db.expire_all()
+    assert not password_needs_rehash(db.get(Employee, asha.employeeId).hashed_password)
+
+
+def test_bulk_import_accepts_ndjson(db, make_employee, client_for, monkeypatch):
+    monkeypatch.setattr(settings, "PASSWORD_HASH_WORKERS", 0)
+    monkeypatch.setattr(settings, "BULK_IMPORT_BCRYPT_ROUNDS", 4)
+    client = client_for(make_employee(roles=["SuperAdmin"]))
+
+    lines = [
+        json.dumps({"firstName": "A", "lastName": "B", "email": "a@example.com", "password": "x"}),
+        "{not json",
+    ]
+    response = client.post(
+        "/api/v1.0/Employee/BulkImport",
+        content="\n".join(lines),
+        headers={"Content-Type": "application/x-ndjson"},
+    )
+
+    assert [r["status"] for r in response.json()["data"]["rows"]] == ["created", "invalid"]
+
+
+def test_bulk_import_reports_rows_refused_by_busy_hashing(
+    db, make_employee, client_for, monkeypatch
+):
+    from app.api.v1.endpoints import employees
+    from app.core.security import PasswordHashingBusy
+
+    monkeypatch.setattr(settings, "BULK_IMPORT_BATCH_SIZE", 2)
+    calls = []
+
+    async def hash_passwords(passwords, rounds=None):
+        calls.append(passwords)
+        if len(calls) == 2:
+            raise PasswordHashingBusy()
+        return [f"hash-{p}" for p in passwords]
+
+    monkeypatch.setattr(employees, "hash_passwords_async", hash_passwords)
+    client = client_for(make_employee(roles=["SuperAdmin"]))
+    lines = [
+        json.dumps(
+            {"firstName": "A", "lastName": "B", "email": f"e{i}@example.com", "password": "x"}
+        )
+        for i in range(5)
+    ]
+    response = client.post(
+        "/api/v1.0/Employee/BulkImport",
+        content="\n".join(lines),
+        headers={"Content-Type": "application/x-ndjson"},
+    )
+
+    assert response.status_code == 200
+    report = response.json()["data"]
+    assert [r["status"] for r in report["rows"]] == [
+        "created", "created", "retryable", "retryable", "created",
+    ]
+    assert (report["created"], report["retryable"]) == (3, 2)
+    emails = [f"e{i}@example.com" for i in range(5)]
+    imported = {e for (e,) in db.query(Employee.email).filter(Employee.email.in_(emails))}
+    assert imported == {emails[0], emails[1], emails[4]}
@@ -0,0 +1,62 @@
+import csv
+import gzip
+import io
+import json
+from datetime import date
+
+from app.core.config import settings
+
+
+def test_leave_export_is_chunked_and_filtered(
+    db, make_employee, monkeypatch, apply_leave, client_for
+):
+    monkeypatch.setattr(settings, "EXPORT_CHUNK_ROWS", 2)
+    monkeypatch.setattr(settings, "STREAM_BATCH_SIZE", 1)
+    admin = make_employee(roles=["SuperAdmin"])
+    finance = make_employee(department="Finance", firstName="Asha", centerId=1)
+    sales = make_employee(department="Sales", centerId=2)
+    leaves = [
+        apply_leave(finance, date(2026, 5, d), date(2026, 5, d)) for d in (4, 5, 6, 7)
+    ]
+    apply_leave(finance, date(2025, 5, 5), date(2025, 5, 5), fy=2025)
+    apply_leave(sales, date(2026, 5, 4), date(2026, 5, 4))
+    client = client_for(admin)
+
+    response = client.get(
+        "/api/v1.0/Admin/Export/Leaves",
+        params={"financialYearId": 2026, "department": "Finance"},
+    )
+    assert response.status_code == 200
+    assert response.headers["content-disposition"] == 'attachment; filename="leaves-2026.csv"'
+    rows = list(csv.DictReader(io.StringIO(response.text)))
+    # Four rows over three chunks, each row once, in id order
+    assert [int(r["leaveId"]) for r in rows] == [leave.id for leave in leaves]
+    assert rows[0]["firstName"] == "Asha"
+    assert rows[0]["fromDate"] == "2026-05-04"
+    assert rows[0]["toDate"] == "2026-05-04"
+    assert rows[0]["leaveSession"] == ""
+
+    response = client.get(
+        "/api/v1.0/Admin/Export/Leaves",
+        params={"centerId": 2, "format": "ndjson", "gzip": "true"},
+    )
+    assert response.headers["content-type"] == "application/gzip"
+    lines = gzip.decompress(response.content).decode().splitlines()
+    assert [json.loads(line)["employeeId"] for line in lines] == [str(sales.employeeId)]
+
+
+def test_employee_export_leaves_out_credentials(db, make_employee, client_for):
+    admin = make_employee(roles=["SuperAdmin"], department="HR")
+    make_employee(department="HR", roles=["Employee", "Manager"])
+    make_employee(department="Sales")
+
+    response = client_for(admin).get(
+        "/api/v1.0/Admin/Export/Employees", params={"department": "HR"}
+    )
+    rows = list(csv.DictReader(io.StringIO(response.text)))
+    assert len(rows) == 2
+    assert "hashed_password" not in rows[0]
+    assert sorted(r["roles"] for r in rows) == ["Employee;Manager", "SuperAdmin"]
+
+    employee = make_employee()
+    assert client_for(employee).get("/api/v1.0/Admin/Export/Employees").status_code == 403
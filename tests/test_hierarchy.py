@@ -0,0 +1,65 @@
+from datetime import date
+
+import pytest
+
+from app.crud.crud_hierarchy import ReportingCycleError, crud_hierarchy
+from app.crud.crud_leave import crud_leave
+from app.models.employee_hierarchy import EmployeeHierarchy
+from app.models.leave import LeaveRequest
+
+
+def closure(db):
+    return {
+        (row.ancestorId, row.descendantId, row.depth)
+        for row in db.query(EmployeeHierarchy).all()
+    }
+
+
+@pytest.fixture
+def org(db, make_employee):
+    """head -> (lead_a -> dev_1, dev_2), (lead_b -> dev_3)"""
+    people = {}
+    for name, manager in [
+        ("head", None), ("lead_a", "head"), ("lead_b", "head"),
+        ("dev_1", "lead_a"), ("dev_2", "lead_a"), ("dev_3", "lead_b"),
+    ]:
+        manager_id = people[manager].employeeId if manager else None
+        people[name] = make_employee(reportingOfficerId=manager_id)
+    crud_hierarchy.add_employees(
+        db, [(p.employeeId, p.reportingOfficerId) for p in people.values()]
+    )
+    db.commit()
+    return people
+
+
+def test_subtree_headcount_and_pending_leaves(db, org):
+    assert crud_hierarchy.subtree_headcount(db, org["head"].employeeId) == {
+        "total": 5,
+        "byDepth": {1: 2, 2: 3},
+    }
+    for name, status in [("dev_1", "Pending"), ("dev_3", "Pending"), ("dev_2", "Approved")]:
+        db.add(
+            LeaveRequest(
+                employeeId=org[name].employeeId, leaveTypeId=1, status=status,
+                fromDate=date(2026, 5, 4), toDate=date(2026, 5, 4),
+            )
+        )
+    db.commit()
+
+    pending = crud_leave.get_pending_in_subtree(db, manager_id=org["head"].employeeId)
+    assert {l.employeeId for l in pending} == {org["dev_1"].employeeId, org["dev_3"].employeeId}
+
+
+def test_moves_keep_the_closure_equal_to_a_rebuild(db, org):
+    # lead_a's whole team moves under lead_b
+    crud_hierarchy.move_employee(db, org["lead_a"].employeeId, org["lead_b"].employeeId)
+    org["lead_a"].reportingOfficerId = org["lead_b"].employeeId
+    db.commit()
+    maintained = closure(db)
+
+    assert (org["head"].employeeId, org["dev_1"].employeeId, 3) in maintained
+    crud_hierarchy.rebuild(db)
+    assert closure(db) == maintained
+
+    with pytest.raises(ReportingCycleError):
+        crud_hierarchy.move_employee(db, org["head"].employeeId, org["dev_2"].employeeId)
@@ -0,0 +1,69 @@
+from datetime import date
+
+from sqlalchemy import event
+
+from app.crud.crud_holiday import HolidayCalendar, crud_holiday
+from app.schemas.holiday import HolidayCreate, HolidayUpdate
+
+
+def _seed(db):
+    for name, day, kind, center in [
+        ("Republic Day", date(2026, 1, 26), "National", None),
+        ("Holi", date(2026, 3, 4), "Regional", 1),
+        ("Gudi Padwa", date(2026, 3, 19), "Regional", 2),
+        ("Independence Day", date(2026, 8, 15), "National", 1),
+    ]:
+        crud_holiday.create(
+            db, HolidayCreate(holidayName=name, holidayDate=day, holidayType=kind, centerId=center)
+        )
+
+
+def test_lookups_do_not_touch_the_db(db):
+    _seed(db)
+    calendar = HolidayCalendar(ttl_seconds=3600)
+    calendar.ensure_loaded(db)
+
+    statements = []
+    listener = lambda *args: statements.append(args[2])
+    event.listen(db.get_bind(), "before_cursor_execute", listener)
+    try:
+        calendar.ensure_loaded(db)
+        upcoming = calendar.upcoming_for_employee(1, date(2026, 2, 1))
+    finally:
+        event.remove(db.get_bind(), "before_cursor_execute", listener)
+
+    assert statements == []
+    # Center 1 holidays plus National ones, in date order, each listed once
+    assert [h.holidayName for h in upcoming] == ["Holi", "Independence Day"]
+    assert [h.holidayName for h in calendar.holidays_for(center_id=2)] == ["Gudi Padwa"]
+
+
+def test_holiday_write_reloads_the_calendar(db):
+    _seed(db)
+    from app.crud.crud_holiday import holiday_calendar
+
+    holiday_calendar.ensure_loaded(db)
+    holi = next(h for h in holiday_calendar.all_active() if h.holidayName == "Holi")
+
+    crud_holiday.update(
+        db, crud_holiday.get_by_id(db, holi.hrholidayId), HolidayUpdate(isActive=False)
+    )
+    assert holiday_calendar.is_stale()
+    holiday_calendar.ensure_loaded(db)
+    assert "Holi" not in [h.holidayName for h in holiday_calendar.all_active()]
+
+
+def test_holiday_list_etag_changes_on_write(db, make_employee, client_for):
+
+    _seed(db)
+    client = client_for(make_employee(centerId=1))
+    url = "/api/v1.0/hrholiday/GetAll"
+
+    tag = client.get(url).headers["ETag"]
+    assert client.get(url, headers={"If-None-Match": tag}).status_code == 304
+
+    holiday = crud_holiday.get_by_id(db, holiday_id=1)
+    crud_holiday.update(db, holiday, HolidayUpdate(holidayName="Republic Day (observed)"))
+    response = client.get(url, headers={"If-None-Match": tag})
+    assert response.status_code == 200
+    assert response.json()["data"][0]["holidayName"] == "Republic Day (observed)"
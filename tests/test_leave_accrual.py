@@ -0,0 +1,159 @@
+from datetime import date
+
+import pytest
+from sqlalchemy import delete, func, select
+
+from app.core.config import settings
+from app.crud.crud_leave import crud_leave
+from app.crud.crud_leave_accrual import JobNotDue, crud_leave_accrual
+from app.models.batch_checkpoint import BatchCheckpoint
+from app.models.leave_accrual import LeaveAccrual
+from app.models.leave_balance import LeaveBalance
+from app.schemas.leave import LeaveApproval
+
+
+class Interrupted(Exception):
+    pass
+
+
+@pytest.fixture
+def monthly(monkeypatch):
+    monkeypatch.setattr(settings, "LEAVE_ALLOTMENT_MODE", "monthly")
+
+
+def allotments(db, fy, leave_type_id=1):
+    db.expire_all()
+    return sorted(
+        db.scalars(
+            select(LeaveBalance.allotted).where(
+                LeaveBalance.financialYearId == fy, LeaveBalance.leaveTypeId == leave_type_id
+            )
+        )
+    )
+
+
+def test_accrual_is_idempotent_per_month(db, make_employee, monthly, apply_leave):
+    team = [make_employee() for _ in range(3)]
+    apply_leave(team[0], date(2026, 5, 4), date(2026, 5, 4))
+
+    first = crud_leave_accrual.accrue_month(db, date(2026, 4, 1), chunk_size=2)
+    crud_leave_accrual.accrue_month(db, date(2026, 5, 20), chunk_size=2)
+    assert (first["employees"], first["postings"]) == (3, 6)
+    assert allotments(db, 2026) == [1.0, 1.0, 1.0]
+
+    # Done: nothing happens, even when the checkpoint is gone
+    again = crud_leave_accrual.accrue_month(db, date(2026, 5, 1), chunk_size=2)
+    assert again["postings"] == 6
+    db.execute(delete(BatchCheckpoint))
+    db.commit()
+    rerun = crud_leave_accrual.accrue_month(db, date(2026, 5, 1), chunk_size=2)
+    assert rerun["postings"] == 0
+    assert allotments(db, 2026) == [1.0, 1.0, 1.0]
+
+    balance = db.get(LeaveBalance, (team[0].employeeId, 2026, 1))
+    assert (balance.pending, balance.available) == (1, 1)
+    assert crud_leave.rebuild_balances(db) == 6
+    assert allotments(db, 2026) == [1.0, 1.0, 1.0]
+
+
+def test_interrupted_accrual_resumes_from_its_checkpoint(db, make_employee, monthly):
+    for _ in range(5):
+        make_employee()
+
+    def stop(state):
+        raise Interrupted(state)
+
+    with pytest.raises(Interrupted):
+        crud_leave_accrual.accrue_month(db, date(2026, 6, 1), chunk_size=2, progress=stop)
+    assert db.get(BatchCheckpoint, "leave-accrual:202606").employees == 2
+
+    seen = []
+    summary = crud_leave_accrual.accrue_month(
+        db, date(2026, 6, 1), chunk_size=2, progress=seen.append
+    )
+    assert summary["resumed"] and summary["employees"] == 5
+    assert [s["employees"] for s in seen] == [4, 5]
+    postings = db.scalar(select(func.count()).select_from(LeaveAccrual))
+    assert postings == summary["postings"] == 10
+    assert allotments(db, 2026, leave_type_id=2) == [0.5] * 5
+
+
+def test_year_end_carries_forward_up_to_the_cap(db, make_employee, monkeypatch, apply_leave):
+    monkeypatch.setattr(settings, "LEAVE_TYPE_CARRY_FORWARD_CAPS", {1: 0, 2: 3})
+    manager = make_employee()
+    employee = make_employee(reportingOfficerId=manager.employeeId)
+    used = apply_leave(employee, date(2025, 6, 2), date(2025, 6, 3), 2, fy=2025)
+    apply_leave(employee, date(2025, 7, 7), date(2025, 7, 7), 2, fy=2025)
+    apply_leave(employee, date(2025, 8, 4), date(2025, 8, 4), 1, fy=2025)
+    crud_leave.approve_or_reject_leave(
+        db,
+        obj_in=LeaveApproval(
+            hrEmployeeFullDayLeaveDetailsId=used.id,
+            approvedBy=manager.employeeId,
+            approvalComments="ok",
+            isApproved=True,
+        ),
+    )
+
+    summary = crud_leave_accrual.close_year(db, 2025)
+    # Three postings per leave type, for the manager too
+    assert summary["postings"] == 12
+
+    db.expire_all()
+    # Casual: 6 - 2 used - 1 pending = 3 carried, the pending day stays covered
+    casual = db.get(LeaveBalance, (employee.employeeId, 2025, 2))
+    assert (casual.allotted, casual.available, casual.pending) == (3, 1, 1)
+    assert db.get(LeaveBalance, (employee.employeeId, 2026, 2)).allotted == 9
+    # Sick: nothing carries over, the 5 unused days lapse
+    sick = db.get(LeaveBalance, (employee.employeeId, 2025, 1))
+    assert (sick.allotted, sick.available) == (1, 1)
+    assert db.get(LeaveBalance, (employee.employeeId, 2026, 1)).allotted == 6
+
+    crud_leave.rebuild_balances(db)
+    db.expire_all()
+    assert db.get(LeaveBalance, (employee.employeeId, 2026, 2)).available == 9
+
+    with pytest.raises(JobNotDue):
+        crud_leave_accrual.close_year(db, 2026)
+
+
+def test_year_end_carries_forward_for_employees_without_bookings(
+    db, make_employee, monkeypatch
+):
+    monkeypatch.setattr(settings, "LEAVE_TYPE_CARRY_FORWARD_CAPS", {1: 0, 2: 3})
+    idle = make_employee()
+
+    crud_leave_accrual.close_year(db, 2025)
+
+    db.expire_all()
+    # No ledger row for 2025: closed at the opening allotment of 6
+    assert db.get(LeaveBalance, (idle.employeeId, 2025, 2)).allotted == 0
+    assert db.get(LeaveBalance, (idle.employeeId, 2026, 2)).allotted == 9
+    assert db.get(LeaveBalance, (idle.employeeId, 2026, 1)).allotted == 6
+
+    crud_leave.rebuild_balances(db)
+    db.expire_all()
+    assert db.get(LeaveBalance, (idle.employeeId, 2026, 2)).available == 9
+
+
+def test_jobs_refuse_a_state_store_the_api_cannot_see(db, make_employee, monkeypatch, tmp_path):
+    from app.commands import leave_accrual
+    from app.core import shared_state
+    from app.core.etag import LEAVE_SUMMARY, etag
+
+    employee = make_employee()
+    monkeypatch.setattr(shared_state, "_state", shared_state.MemoryState())
+    with pytest.raises(SystemExit):
+        leave_accrual.main(["close", "--financial-year", "2025", "--quiet"])
+    assert db.scalar(select(func.count()).select_from(LeaveAccrual)) == 0
+
+    # The API process and the job open the same file
+    url = f"sqlite:///{tmp_path}/state.db"
+    api = shared_state.open_state(url)
+    monkeypatch.setattr(settings, "SHARED_STATE_URL", url)
+    monkeypatch.setattr(shared_state, "_state", api)
+    before = etag(LEAVE_SUMMARY, employee.employeeId)
+    monkeypatch.setattr(shared_state, "_state", None)
+    leave_accrual.main(["close", "--financial-year", "2025", "--quiet"])
+    monkeypatch.setattr(shared_state, "_state", api)
+    assert etag(LEAVE_SUMMARY, employee.employeeId) != before
@@ -0,0 +1,390 @@
+from datetime import date, timedelta
+
+from app.crud.crud_leave import crud_leave
+from app.models.leave_balance import LeaveBalance
+from app.schemas.leave import HalfDayLeaveCreate, LeaveApproval
+
+
+def ledger(db, employee, leave_type_id=1, fy=2026):
+    db.expire_all()
+    return db.get(LeaveBalance, (employee.employeeId, fy, leave_type_id))
+
+
+def test_ledger_follows_the_leave_lifecycle(db, make_employee, apply_leave):
+    manager = make_employee()
+    employee = make_employee(reportingOfficerId=manager.employeeId)
+
+    leave = apply_leave(employee, date(2026, 5, 4), date(2026, 5, 6))
+    balance = ledger(db, employee)
+    assert (balance.allotted, balance.used, balance.pending) == (6, 0, 3)
+
+    crud_leave.approve_or_reject_leave(
+        db,
+        obj_in=LeaveApproval(
+            hrEmployeeFullDayLeaveDetailsId=leave.id,
+            approvedBy=manager.employeeId,
+            approvalComments="ok",
+            isApproved=True,
+        ),
+    )
+    balance = ledger(db, employee)
+    assert (balance.used, balance.pending, balance.available) == (3, 0, 3)
+
+
+def test_half_day_counts_half_and_cancel_releases_it(db, make_employee):
+    employee = make_employee()
+    leave = crud_leave.create_half_day_leave(
+        db,
+        obj_in=HalfDayLeaveCreate(
+            employeeId=employee.employeeId,
+            leaveTypeId=2,
+            reason="test",
+            leaveDate=date(2026, 6, 1),
+            leaveSession="FirstHalf",
+        ),
+    )
+    assert leave.financialYearId == 2026
+    assert ledger(db, employee, leave_type_id=2).pending == 0.5
+
+    crud_leave.cancel_leave(db, leave_id=leave.id, employee_id=employee.employeeId)
+    assert ledger(db, employee, leave_type_id=2).pending == 0
+
+
+def test_summary_reads_ledger_and_includes_untouched_types(db, make_employee, apply_leave):
+    employee = make_employee()
+    apply_leave(employee, date(2026, 5, 4), date(2026, 5, 5))
+
+    summary = crud_leave.get_leave_summary(
+        db, employee_id=employee.employeeId, financial_year=2026
+    )
+
+    assert summary["pendingLeaves"] == 2
+    assert summary["totalLeaves"] == 12
+    assert [b["leaveTypeId"] for b in summary["leaveTypeBreakdown"]] == [1, 2]
+
+
+def test_rebuild_matches_incremental_ledger(db, make_employee, apply_leave):
+    employee = make_employee()
+    apply_leave(employee, date(2026, 5, 4), date(2026, 5, 6))
+    apply_leave(employee, date(2026, 7, 1), date(2026, 7, 1), leave_type_id=2)
+    before = {
+        (b.leaveTypeId, b.used, b.pending, b.available)
+        for b in db.query(LeaveBalance).all()
+    }
+
+    db.query(LeaveBalance).delete()
+    db.commit()
+    assert crud_leave.rebuild_balances(db) == 2
+
+    after = {
+        (b.leaveTypeId, b.used, b.pending, b.available)
+        for b in db.query(LeaveBalance).all()
+    }
+    assert after == before
+
+
+def test_leave_days_skip_weekends_and_center_holidays(db, make_employee, apply_leave):
+    from app.crud.crud_holiday import crud_holiday
+    from app.models.leave import LeaveRequest
+    from app.schemas.holiday import HolidayCreate
+
+    employee = make_employee(centerId=1)
+    # Friday to the following Tuesday, with Monday a holiday of center 1 only
+    crud_holiday.create(
+        db, HolidayCreate(holidayName="Local", holidayDate=date(2026, 5, 11), centerId=1)
+    )
+    leave = apply_leave(employee, date(2026, 5, 8), date(2026, 5, 12))
+    assert leave.leaveDays == 2
+
+    other = make_employee(centerId=2)
+    assert apply_leave(other, date(2026, 5, 8), date(2026, 5, 12)).leaveDays == 3
+
+    # A new holiday re-costs stored requests through the rebuild
+    crud_holiday.create(
+        db,
+        HolidayCreate(holidayName="National", holidayDate=date(2026, 5, 12), holidayType="National"),
+    )
+    crud_leave.rebuild_balances(db, recost=True)
+    db.expire_all()
+    assert db.get(LeaveRequest, leave.id).leaveDays == 1
+    assert ledger(db, employee).pending == 1
+
+
+def test_batch_approval_reports_items_and_costs_constant_round_trips(
+    db, make_employee, apply_leave
+):
+    from sqlalchemy import event
+    from app.db.session import engine
+
+    manager = make_employee()
+    team = [make_employee(reportingOfficerId=manager.employeeId) for _ in range(3)]
+    outsider = make_employee()
+
+    def decide(leaves, **extra):
+        return [
+            LeaveApproval(
+                hrEmployeeFullDayLeaveDetailsId=leave.id,
+                approvedBy=manager.employeeId,
+                approvalComments=f"comment {leave.id}",
+                isApproved=leave.id % 2 == 0,
+                **extra,
+            )
+            for leave in leaves
+        ]
+
+    def run(items):
+        statements = []
+        capture = lambda *args: statements.append(args[2])
+        event.listen(engine, "before_cursor_execute", capture)
+        try:
+            results = crud_leave.approve_or_reject_batch(
+                db, items=items, approver_id=manager.employeeId
+            )
+        finally:
+            event.remove(engine, "before_cursor_execute", capture)
+        return results, len(statements)
+
+    small = [apply_leave(e, date(2026, 5, 4), date(2026, 5, 5)) for e in team[:2]]
+    foreign = apply_leave(outsider, date(2026, 5, 4), date(2026, 5, 5))
+    # The day's first decision opens its approval rollup row, as the first
+    # booking opens a ledger row: both runs below find theirs in place
+    earlier = apply_leave(outsider, date(2026, 4, 6), date(2026, 4, 6))
+    crud_leave.approve_or_reject_leave(db, obj_in=decide([earlier])[0])
+    results, small_trips = run(decide(small + [foreign]))
+    assert [(r.succeeded, r.status) for r in results] == [
+        (True, "Approved" if small[0].id % 2 == 0 else "Rejected"),
+        (True, "Approved" if small[1].id % 2 == 0 else "Rejected"),
+        (False, None),
+    ]
+
+    mondays = [date(2026, 6, 1) + timedelta(days=7 * i) for i in range(20)]
+    large = [apply_leave(team[2], day, day) for day in mondays]
+    results, large_trips = run(decide(large + small))
+    assert all(r.succeeded for r in results[:20])
+    assert {r.error for r in results[20:]} == {
+        f"Leave request is already {s}" for s in ("Approved", "Rejected")
+    }
+    assert large_trips == small_trips
+
+    balance = ledger(db, team[2])
+    assert (balance.used, balance.pending) == (10, 0)
+
+
+def test_batch_decision_opens_a_missing_ledger_row(db, make_employee, apply_leave):
+    from sqlalchemy import delete, update
+    from app.models.leave import LeaveRequest
+
+    manager = make_employee()
+    employee = make_employee(reportingOfficerId=manager.employeeId)
+    leave = apply_leave(employee, date(2026, 5, 4), date(2026, 5, 6))
+    # A request from before the ledger: no balance row, leaveDays not costed yet
+    db.execute(delete(LeaveBalance).where(LeaveBalance.employeeId == employee.employeeId))
+    db.execute(update(LeaveRequest).where(LeaveRequest.id == leave.id).values(leaveDays=None))
+    db.commit()
+
+    results = crud_leave.approve_or_reject_batch(
+        db,
+        items=[
+            LeaveApproval(
+                hrEmployeeFullDayLeaveDetailsId=leave.id,
+                approvedBy=manager.employeeId,
+                approvalComments="ok",
+                isApproved=True,
+            )
+        ],
+        approver_id=manager.employeeId,
+    )
+    assert results[0].succeeded
+    balance = ledger(db, employee)
+    assert (balance.allotted, balance.used, balance.available) == (6, 3, 3)
+
+
+def apply_half_day(db, employee, day, session):
+    return crud_leave.create_half_day_leave(
+        db,
+        obj_in=HalfDayLeaveCreate(
+            employeeId=employee.employeeId,
+            leaveTypeId=2,
+            reason="test",
+            leaveDate=day,
+            leaveSession=session,
+        ),
+    )
+
+
+def test_overlapping_submissions_are_rejected(db, make_employee, apply_leave):
+    import pytest
+    from app.crud.crud_leave import LeaveOverlap
+
+    employee = make_employee()
+    week = apply_leave(employee, date(2026, 5, 4), date(2026, 5, 8))
+    with pytest.raises(LeaveOverlap) as exc:
+        apply_leave(employee, date(2026, 5, 8), date(2026, 5, 11))
+    assert exc.value.leave_ids == [week.id]
+    with pytest.raises(LeaveOverlap):
+        apply_half_day(db, employee, date(2026, 5, 6), "SecondHalf")
+
+    # Both halves of one day are fine, the same half twice is not
+    apply_half_day(db, employee, date(2026, 5, 12), "FirstHalf")
+    apply_half_day(db, employee, date(2026, 5, 12), "SecondHalf")
+    with pytest.raises(LeaveOverlap):
+        apply_half_day(db, employee, date(2026, 5, 12), "FirstHalf")
+
+    # Cancelled requests free their dates; other employees are unaffected
+    crud_leave.cancel_leave(db, leave_id=week.id, employee_id=employee.employeeId)
+    apply_leave(employee, date(2026, 5, 8), date(2026, 5, 11))
+    apply_leave(make_employee(), date(2026, 5, 4), date(2026, 5, 8))
+
+
+def test_audit_finds_stored_overlaps(db, make_employee):
+    from sqlalchemy import insert
+    from app.models.leave import LeaveRequest
+
+    employee, other = make_employee(), make_employee()
+    rows = [
+        (employee, date(2026, 5, 4), date(2026, 5, 8), None, "Approved"),
+        (employee, date(2026, 5, 6), date(2026, 5, 6), "FirstHalf", "Pending"),
+        (employee, date(2026, 5, 6), date(2026, 5, 6), "SecondHalf", "Pending"),
+        (employee, date(2026, 5, 8), date(2026, 5, 9), None, "Rejected"),
+        (employee, date(2026, 5, 9), date(2026, 5, 9), None, "Pending"),
+        (other, date(2026, 5, 4), date(2026, 5, 8), None, "Pending"),
+    ]
+    db.execute(
+        insert(LeaveRequest),
+        [
+            {"employeeId": e.employeeId, "leaveTypeId": 1, "fromDate": f, "toDate": t,
+             "leaveSession": s, "status": st}
+            for e, f, t, s, st in rows
+        ],
+    )
+    db.commit()
+    ids = {
+        (r.fromDate.day, r.leaveSession): r.id
+        for r in db.query(LeaveRequest).filter(LeaveRequest.employeeId == employee.employeeId)
+    }
+
+    pairs = {(a.id, b.id) for a, b in crud_leave.audit_overlaps(db)}
+    assert pairs == {
+        (ids[(4, None)], ids[(6, "FirstHalf")]),
+        (ids[(4, None)], ids[(6, "SecondHalf")]),
+    }
+
+
+def test_team_availability_counts_half_days_per_day(db, make_employee, apply_leave):
+    manager = make_employee()
+    ana = make_employee(firstName="Ana", reportingOfficerId=manager.employeeId)
+    bo = make_employee(firstName="Bo", reportingOfficerId=manager.employeeId)
+    make_employee(firstName="Other")  # not on the team
+    long_leave = apply_leave(ana, date(2026, 4, 28), date(2026, 5, 6))
+    crud_leave.approve_or_reject_leave(
+        db,
+        obj_in=LeaveApproval(
+            hrEmployeeFullDayLeaveDetailsId=long_leave.id,
+            approvedBy=manager.employeeId,
+            approvalComments="ok",
+            isApproved=True,
+        ),
+    )
+    apply_half_day(db, bo, date(2026, 5, 5), "FirstHalf")
+    apply_half_day(db, bo, date(2026, 5, 5), "SecondHalf")
+    apply_half_day(db, bo, date(2026, 5, 7), "SecondHalf")
+
+    days = crud_leave.get_team_availability(
+        db, date(2026, 5, 4), date(2026, 5, 8), reporting_officer_id=manager.employeeId
+    )
+
+    assert [d["day"].day for d in days] == [4, 5, 6, 7, 8]
+    assert [d["approved"] for d in days] == [1, 1, 1, 0, 0]
+    assert [d["pending"] for d in days] == [0, 1, 0, 0.5, 0]
+    assert [[a["name"] for a in d["absentees"]] for d in days] == [
+        ["Ana"], ["Ana", "Bo", "Bo"], ["Ana"], ["Bo"], [],
+    ]
+
+
+def test_summary_etag_answers_304_until_a_leave_changes(
+    db, make_employee, apply_leave, client_for
+):
+    from app.core.sql_metrics import query_budget
+
+    employee = make_employee()
+    client = client_for(employee)
+    url = f"/api/v1.0/LeaveAccounts/GetLeaveSummarybyEmployeeId/{employee.employeeId}"
+
+    first = client.get(url)
+    tag = first.headers["ETag"]
+    assert first.status_code == 200 and not tag.startswith("W/")
+
+    # Cached token, matching tag: no query and no body
+    with query_budget(0):
+        cached = client.get(url, headers={"If-None-Match": tag})
+    assert (cached.status_code, cached.content, cached.headers["ETag"]) == (304, b"", tag)
+    other_year = client.get(url + "?financialYearId=2025", headers={"If-None-Match": tag})
+    assert other_year.status_code == 200
+
+    apply_leave(employee, date(2026, 5, 4), date(2026, 5, 5))
+    changed = client.get(url, headers={"If-None-Match": tag})
+    assert changed.status_code == 200
+    assert changed.headers["ETag"] != tag
+
+
+def test_deciding_a_cancelled_leave_conflicts_and_changes_nothing(
+    db, make_employee, apply_leave, client_for
+):
+    from sqlalchemy import func, select
+    from app.models.leave import LeaveRequest
+    from app.models.outbox import OutboxEvent
+    from app.models.rollup import ApprovalDailyRollup, LeaveDailyRollup
+
+    manager = make_employee()
+    employee = make_employee(reportingOfficerId=manager.employeeId)
+    leave = apply_leave(employee, date(2026, 5, 4), date(2026, 5, 6))
+    crud_leave.cancel_leave(db, leave_id=leave.id, employee_id=employee.employeeId)
+
+    def snapshot():
+        db.expire_all()
+        balance = ledger(db, employee)
+        return (
+            (balance.used, balance.pending, balance.available),
+            [
+                (r.pending, r.approved, r.rejected, r.cancelled)
+                for r in db.scalars(select(LeaveDailyRollup))
+            ],
+            db.scalar(select(func.count()).select_from(ApprovalDailyRollup)),
+            db.scalar(select(func.count()).select_from(OutboxEvent)),
+        )
+
+    before = snapshot()
+    response = client_for(manager).post(
+        "/api/v1.0/LeaveDetails/approve",
+        json={
+            "hrEmployeeFullDayLeaveDetailsId": leave.id,
+            "approvedBy": str(manager.employeeId),
+            "approvalComments": "too late",
+            "isApproved": True,
+        },
+    )
+    assert response.status_code == 409
+    assert snapshot() == before
+    assert db.get(LeaveRequest, leave.id).status == "Cancelled"
+
+
+def test_reversed_leave_range_is_rejected(db, make_employee, client_for):
+    import pytest
+    from pydantic import ValidationError
+    from app.schemas.leave import LeaveCreate
+
+    employee = make_employee()
+    payload = {
+        "employeeId": str(employee.employeeId),
+        "leaveTypeId": 1,
+        "reason": "test",
+        "fromDate": "2026-05-06",
+        "toDate": "2026-05-04",
+        "financialYearId": 2026,
+    }
+    with pytest.raises(ValidationError, match="toDate is before fromDate"):
+        LeaveCreate(**payload)
+
+    response = client_for(employee).post("/api/v1.0/LeaveDetails", json=payload)
+    assert response.status_code == 422
+    assert ledger(db, employee) is None
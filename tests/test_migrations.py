@@ -0,0 +1,76 @@
+from datetime import date
+from pathlib import Path
+
+from alembic import command
+from alembic.config import Config
+from sqlalchemy import create_engine, inspect
+
+from app.core.config import settings
+from app.db.base import Base
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def test_migrations_build_the_models_schema_from_an_empty_database(tmp_path, monkeypatch):
+    url = f"sqlite:///{tmp_path}/migrated.db"
+    # alembic/env.py connects to settings.DATABASE_URL
+    monkeypatch.setattr(settings, "DATABASE_URL", url)
+    # No ini file: env.py would reconfigure logging for the whole test run
+    config = Config()
+    config.set_main_option("script_location", str(ROOT / "alembic"))
+
+    command.upgrade(config, "head")
+    # Raises if the models and the migrated schema differ
+    command.check(config)
+
+    engine = create_engine(url)
+    try:
+        assert set(Base.metadata.tables) <= set(inspect(engine).get_table_names())
+    finally:
+        engine.dispose()
+
+
+def test_prestart_fills_derived_tables_once(db, make_employee, capsys):
+    from app.commands import (
+        rebuild_employee_hierarchy,
+        rebuild_leave_balances,
+        reconcile_rollups,
+    )
+    from app.models.employee_hierarchy import EmployeeHierarchy
+    from app.models.leave import LeaveRequest
+    from app.models.leave_balance import LeaveBalance
+    from app.models.rollup import DepartmentHeadcount, LeaveDailyRollup
+
+    # Rows from before the derived tables: no closure, ledger, rollups or leaveDays
+    manager = make_employee(department="Sales")
+    employee = make_employee(department="Sales", reportingOfficerId=manager.employeeId)
+    db.add_all(
+        [
+            LeaveRequest(
+                employeeId=employee.employeeId,
+                leaveTypeId=1,
+                fromDate=date(2026, 5, 4),
+                toDate=date(2026, 5, 6),
+                financialYearId=2026,
+                status=status,
+            )
+            for status in ("Approved", "Pending")
+        ]
+    )
+    db.commit()
+    jobs = [rebuild_employee_hierarchy, rebuild_leave_balances, reconcile_rollups]
+
+    for job in jobs:
+        job.main(["--if-empty"])
+    db.expire_all()
+    assert db.query(EmployeeHierarchy).count() == 3
+    balance = db.get(LeaveBalance, (employee.employeeId, 2026, 1))
+    assert (balance.used, balance.pending) == (3, 3)
+    assert db.get(DepartmentHeadcount, ("Sales",)).employees == 2
+    rollup = db.get(LeaveDailyRollup, (202605, "Sales", 1, date(2026, 5, 4)))
+    assert (rollup.approved, rollup.pending, float(rollup.approvedDays)) == (1, 1, 3)
+
+    capsys.readouterr()
+    for job in jobs:
+        job.main(["--if-empty"])
+    assert capsys.readouterr().out.count("nothing to do") == 3
@@ -0,0 +1,114 @@
+import json
+from datetime import date
+
+from sqlalchemy import select
+
+from app.core import outbox
+from app.core.config import settings
+from app.crud.crud_leave import crud_leave
+from app.db.session import SessionLocal
+from app.models.outbox import OutboxEvent
+from app.schemas.leave import LeaveApproval
+
+
+class BrokenSink:
+    def send(self, events):
+        raise ConnectionError("consumer down")
+
+
+def events(db):
+    db.expire_all()
+    return db.scalars(select(OutboxEvent).order_by(OutboxEvent.id)).all()
+
+
+def test_lifecycle_changes_are_recorded_with_the_leave(db, make_employee, apply_leave):
+    manager = make_employee()
+    employee = make_employee(reportingOfficerId=manager.employeeId)
+
+    first = apply_leave(employee, date(2026, 5, 4), date(2026, 5, 6))
+    second = apply_leave(employee, date(2026, 6, 1), date(2026, 6, 2))
+    third = apply_leave(employee, date(2026, 7, 1), date(2026, 7, 1))
+    crud_leave.approve_or_reject_leave(
+        db,
+        obj_in=LeaveApproval(
+            hrEmployeeFullDayLeaveDetailsId=first.id,
+            approvedBy=manager.employeeId,
+            approvalComments="ok",
+            isApproved=True,
+        ),
+    )
+    crud_leave.approve_or_reject_batch(
+        db,
+        items=[
+            LeaveApproval(
+                hrEmployeeFullDayLeaveDetailsId=second.id,
+                approvedBy=manager.employeeId,
+                approvalComments="no",
+                isApproved=False,
+            )
+        ],
+        approver_id=manager.employeeId,
+    )
+    crud_leave.cancel_leave(db, leave_id=third.id, employee_id=employee.employeeId)
+
+    recorded = [(e.eventType, e.aggregateId, e.status) for e in events(db)]
+    assert recorded == [
+        ("leave.submitted", first.id, "Pending"),
+        ("leave.submitted", second.id, "Pending"),
+        ("leave.submitted", third.id, "Pending"),
+        ("leave.approved", first.id, "Pending"),
+        ("leave.rejected", second.id, "Pending"),
+        ("leave.cancelled", third.id, "Pending"),
+    ]
+    approved = events(db)[3].payload
+    assert approved["status"] == "Approved"
+    assert approved["approvedBy"] == str(manager.employeeId)
+
+
+def test_drain_delivers_once_and_marks_sent(db, make_employee, tmp_path, apply_leave):
+    employee = make_employee()
+    leave = apply_leave(employee, date(2026, 5, 4), date(2026, 5, 6))
+    path = tmp_path / "events.jsonl"
+    sinks = outbox.open_sinks([f"file://{path}"])
+
+    assert outbox.drain_once(SessionLocal, sinks) == 1
+    assert outbox.drain_once(SessionLocal, sinks) == 0
+
+    delivered = [json.loads(line) for line in path.read_text().splitlines()]
+    assert [(e["type"], e["leaveId"], e["attempt"]) for e in delivered] == [
+        ("leave.submitted", leave.id, 1)
+    ]
+    (event,) = events(db)
+    assert (event.status, event.attempts) == ("Sent", 1)
+    assert event.sentAt is not None
+
+
+def test_failed_delivery_backs_off_then_gives_up(db, make_employee, monkeypatch, apply_leave):
+    monkeypatch.setattr(settings, "OUTBOX_MAX_ATTEMPTS", 2)
+    employee = make_employee()
+    apply_leave(employee, date(2026, 5, 4), date(2026, 5, 6))
+
+    assert outbox.drain_once(SessionLocal, [BrokenSink()]) == 1
+    (event,) = events(db)
+    assert (event.status, event.attempts) == ("Pending", 1)
+    assert "consumer down" in event.lastError
+    assert event.availableAt > outbox.utcnow()
+    # Not due again until the backoff has passed
+    assert outbox.drain_once(SessionLocal, [BrokenSink()]) == 0
+
+    event.availableAt = outbox.utcnow()
+    db.commit()
+    assert outbox.drain_once(SessionLocal, [BrokenSink()]) == 1
+    (event,) = events(db)
+    assert (event.status, event.attempts) == ("Failed", 2)
+
+
+def test_claimed_events_are_leased(db, make_employee, apply_leave):
+    employee = make_employee()
+    apply_leave(employee, date(2026, 5, 4), date(2026, 5, 6))
+
+    with SessionLocal() as worker:
+        claimed = outbox.claim(worker, 10)
+    with SessionLocal() as other:
+        assert outbox.claim(other, 10) == []
+    assert [e["id"] for e in claimed] == [events(db)[0].id]
@@ -0,0 +1,93 @@
+from datetime import date
+
+import pytest
+
+from app.core.pagination import InvalidCursor, decode_cursor, encode_cursor, split_page
+from app.crud.crud_leave import crud_leave
+from app.models.leave import LeaveRequest
+
+
+def test_cursor_round_trip_and_rejects_garbage():
+    cursor = encode_cursor([date(2026, 1, 26), 7])
+    assert decode_cursor(cursor, [date.fromisoformat, int]) == [date(2026, 1, 26), 7]
+
+    with pytest.raises(InvalidCursor):
+        decode_cursor("not-a-cursor", [int])
+    with pytest.raises(InvalidCursor):
+        decode_cursor(cursor, [int])
+
+
+def test_keyset_pages_cover_every_row_once(db, make_employee):
+    manager = make_employee()
+    employee = make_employee(reportingOfficerId=manager.employeeId)
+    for status in ["Pending"] * 7 + ["Approved"] * 3:
+        db.add(
+            LeaveRequest(
+                employeeId=employee.employeeId,
+                leaveTypeId=1,
+                fromDate=date(2026, 5, 4),
+                toDate=date(2026, 5, 4),
+                status=status,
+            )
+        )
+    db.commit()
+
+    seen, after_id = [], None
+    while True:
+        rows = crud_leave.get_pending_by_manager(
+            db, manager_id=manager.employeeId, after_id=after_id, limit=3
+        )
+        page, cursor = split_page(rows, 3, key=lambda r: [r.id])
+        seen += [r.id for r in page]
+        if cursor is None:
+            break
+        after_id = decode_cursor(cursor, [int])[0]
+
+    assert len(seen) == 7
+    assert seen == sorted(set(seen))
+
+
+def test_ndjson_list_streams_every_row_without_the_request_session(
+    db, make_employee, client_for, monkeypatch
+):
+    import json
+
+    from app.api.v1.endpoints import leaves
+    from app.core.config import settings
+    from app.db.session import engine
+
+    monkeypatch.setattr(settings, "STREAM_BATCH_SIZE", 2)
+    manager = make_employee()
+    employee = make_employee(reportingOfficerId=manager.employeeId)
+    for day in range(4, 9):
+        db.add(
+            LeaveRequest(
+                employeeId=employee.employeeId,
+                leaveTypeId=1,
+                fromDate=date(2026, 5, day),
+                toDate=date(2026, 5, day),
+                status="Pending",
+            )
+        )
+    db.commit()
+
+    # Connections checked out while each row is written: the stream's only
+    checked_out = []
+    leave_line = leaves._leave_line
+    monkeypatch.setattr(
+        leaves,
+        "_leave_line",
+        lambda leave: checked_out.append(engine.pool.checkedout()) or leave_line(leave),
+    )
+    url = f"/api/v1.0/LeaveDetails/GetByReportingOfficerId/{manager.employeeId}"
+    client = client_for(manager)
+    held = engine.pool.checkedout()  # by the test's own session
+    response = client.get(
+        url,
+        params={"format": "ndjson"},
+    )
+
+    assert response.headers["content-type"] == "application/x-ndjson"
+    rows = [json.loads(line) for line in response.iter_lines() if line]
+    assert [r["fromDate"] for r in rows] == [f"2026-05-0{day}" for day in range(4, 9)]
+    assert checked_out == [held + 1] * 5
@@ -0,0 +1,49 @@
+import pytest
+from sqlalchemy import create_engine, exc
+
+from app.db.pool_metrics import InstrumentedQueuePool, instrument
+
+
+def test_pool_stats_count_waits_overflow_and_timeouts(tmp_path):
+    engine = create_engine(
+        f"sqlite:///{tmp_path}/pool.db",
+        poolclass=InstrumentedQueuePool,
+        pool_size=1,
+        max_overflow=1,
+        pool_timeout=0.05,
+    )
+    stats = instrument(engine.pool, "test")
+
+    first = engine.connect()
+    second = engine.connect()  # past pool_size: an overflow connection
+    with pytest.raises(exc.TimeoutError):
+        engine.connect()
+    snapshot = stats.snapshot(engine.pool)
+    assert snapshot["pool"]["checkedOut"] == 2
+    assert snapshot["pool"]["overflow"] == 1
+    assert snapshot["overflowConnects"] == 1
+    assert snapshot["checkoutTimeouts"] == 1
+    assert snapshot["checkoutWait"]["count"] == 3
+    assert snapshot["checkoutWait"]["maxMs"] >= 50
+
+    second.close()
+    first.close()
+    with engine.connect():
+        pass
+    snapshot = stats.snapshot(engine.pool)
+    assert snapshot["connects"] == 2
+    assert snapshot["checkouts"] == 3
+    assert snapshot["checkins"] == 3
+    assert snapshot["pool"]["idle"] == 1
+    engine.dispose()
+
+
+def test_pool_endpoint_requires_admin(db, make_employee, client_for):
+    employee = client_for(make_employee(roles=["Employee"]))
+    assert employee.get("/api/v1.0/Admin/Pool").status_code == 403
+    response = client_for(make_employee(roles=["SuperAdmin"])).get("/api/v1.0/Admin/Pool")
+    assert response.status_code == 200
+    (sync,) = response.json()["data"]
+    assert sync["name"] == "sync"
+    assert sync["pool"]["class"] == "InstrumentedQueuePool"
+    assert sync["checkouts"] >= 1
@@ -0,0 +1,159 @@
+"""
+Query-plan regression tests for the hot leave queries.
+
+Each test runs the real code path against a seeded SQLite database, captures
+the SQL it issues and checks EXPLAIN QUERY PLAN: a line starting with
+"SCAN <table>" means the table (or a whole index of it) is read end to end.
+"""
+import random
+import uuid
+from contextlib import contextmanager
+from datetime import date, timedelta
+
+import pytest
+from sqlalchemy import event, insert
+
+from app.api.v1.endpoints import dashboard
+from app.crud.crud_dashboard import invalidate_dashboard
+from app.crud.crud_hierarchy import crud_hierarchy
+from app.crud.crud_leave import crud_leave
+from app.db.session import engine
+from app.models.employee import Employee
+from app.models.leave import LeaveRequest
+
+
+@pytest.fixture
+def seeded(db):
+    rng = random.Random(7)
+    managers = [uuid.uuid4() for _ in range(20)]
+    employees = []
+    for manager_id in managers:
+        employees.append({"employeeId": manager_id, "reportingOfficerId": None})
+        for _ in range(25):
+            employees.append({"employeeId": uuid.uuid4(), "reportingOfficerId": manager_id})
+    db.execute(
+        insert(Employee),
+        [
+            dict(e, email=f"{e['employeeId']}@example.com", hashed_password="x")
+            for e in employees
+        ],
+    )
+
+    leaves = []
+    for employee in employees:
+        for _ in range(8):
+            start = date(2024, 1, 1) + timedelta(days=rng.randrange(900))
+            leaves.append(
+                {
+                    "employeeId": employee["employeeId"],
+                    "leaveTypeId": rng.choice([1, 2]),
+                    "fromDate": start,
+                    "toDate": start + timedelta(days=rng.randrange(3)),
+                    "status": rng.choice(["Pending", "Approved", "Rejected", "Cancelled"]),
+                }
+            )
+    db.execute(insert(LeaveRequest), leaves)
+    db.commit()
+    crud_hierarchy.rebuild(db)
+    db.connection().exec_driver_sql("ANALYZE")
+    return managers
+
+
+@contextmanager
+def captured_statements():
+    statements = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            statements.append((statement, parameters))
+
+    event.listen(engine, "before_cursor_execute", capture)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", capture)
+
+
+def full_scans(db, statements, tables):
+    scans = []
+    for statement, parameters in statements:
+        plan = db.connection().exec_driver_sql(
+            "EXPLAIN QUERY PLAN " + statement, parameters
+        ).all()
+        for row in plan:
+            detail = row[-1]
+            if any(detail.startswith(f"SCAN {table}") for table in tables):
+                scans.append((detail, statement))
+    return scans
+
+
+def test_pending_by_manager_uses_indexes(db, seeded):
+    with captured_statements() as statements:
+        crud_leave.get_pending_by_manager(db, manager_id=seeded[0])
+
+    assert statements
+    assert full_scans(db, statements, ["leaves", "employees"]) == []
+
+
+def test_cancel_leave_uses_indexes(db, seeded):
+    leave = db.query(LeaveRequest).filter(LeaveRequest.status == "Pending").first()
+    with captured_statements() as statements:
+        crud_leave.cancel_leave(db, leave_id=leave.id, employee_id=leave.employeeId)
+
+    assert statements
+    assert full_scans(db, statements, ["leaves"]) == []
+
+
+def test_dashboard_leave_counts_use_indexes(db, seeded):
+    invalidate_dashboard()
+    with captured_statements() as statements:
+        dashboard.get_overall_status(db=db, current_user=None)
+
+    leave_statements = [s for s in statements if "FROM leaves" in s[0]]
+    assert leave_statements
+    assert full_scans(db, leave_statements, ["leaves"]) == []
+
+
+def test_pending_in_subtree_uses_indexes(db, seeded):
+    with captured_statements() as statements:
+        crud_leave.get_pending_in_subtree(db, manager_id=seeded[0], limit=50)
+
+    assert statements
+    assert full_scans(db, statements, ["leaves", "employee_hierarchy"]) == []
+
+
+def test_overlap_check_uses_indexes(db, seeded):
+    with captured_statements() as statements:
+        crud_leave.check_overlap(db, seeded[0], date(2025, 3, 1), date(2025, 3, 5))
+
+    assert statements
+    assert full_scans(db, statements, ["leaves"]) == []
+
+
+def test_team_availability_seeks_members_first(db, seeded):
+    for index, manager_id in enumerate(seeded):
+        db.query(Employee).filter(Employee.reportingOfficerId == manager_id).update(
+            {"department": f"Dept {index}"}
+        )
+    db.commit()
+    db.connection().exec_driver_sql("ANALYZE")
+
+    with captured_statements() as statements:
+        crud_leave.get_team_availability(
+            db, date(2025, 3, 1), date(2025, 5, 31), reporting_officer_id=seeded[0]
+        )
+        crud_leave.get_team_availability(
+            db, date(2025, 3, 1), date(2025, 5, 31), department="Dept 1"
+        )
+
+    assert len(statements) == 2
+    for statement, parameters in statements:
+        plan = [
+            row[-1]
+            for row in db.connection().exec_driver_sql(
+                "EXPLAIN QUERY PLAN " + statement, parameters
+            )
+        ]
+        # The team's employees, then each one's requests by (employeeId, status)
+        assert plan[0].startswith("SEARCH employees USING INDEX ix_employees_")
+        assert "ix_leaves_employeeId_status_fromDate" in plan[1]
@@ -0,0 +1,77 @@
+from datetime import date
+
+from fastapi.testclient import TestClient
+from sqlalchemy import select
+
+from app.core.config import settings
+from app.core.security import get_password_hash
+from app.core.sql_metrics import query_budget, statement_shape
+from app.models.employee import Employee
+
+
+def test_login_query_budget(db, make_employee, monkeypatch):
+    from app.main import app
+
+    monkeypatch.setattr(settings, "PASSWORD_HASH_WORKERS", 0)
+    make_employee(email="budget@example.com", hashed_password=get_password_hash("secret"))
+
+    with query_budget(1):
+        response = TestClient(app).post(
+            "/api/v1.0/Account/login",
+            data={"username": "budget@example.com", "password": "secret"},
+        )
+    assert response.status_code == 200
+    assert response.headers["Server-Timing"].endswith('desc="1 query"')
+
+
+def test_pending_by_manager_query_budget(db, make_employee, apply_leave, client_for):
+    manager = make_employee()
+    for _ in range(5):
+        employee = make_employee(reportingOfficerId=manager.employeeId)
+        apply_leave(employee, date(2026, 5, 4), date(2026, 5, 5))
+
+    client = client_for(manager)
+    url = f"/api/v1.0/LeaveDetails/GetByReportingOfficerId/{manager.employeeId}"
+
+    # The caller lookup plus the page itself, however many rows it holds
+    with query_budget(2, max_repeats=1):
+        response = client.get(url)
+    assert response.status_code == 200
+    assert len(response.json()["data"]) == 5
+
+
+def test_team_availability_query_budget(db, make_employee, apply_leave, client_for):
+    manager = make_employee()
+    for day in range(4, 9):
+        employee = make_employee(reportingOfficerId=manager.employeeId)
+        apply_leave(employee, date(2026, 5, day), date(2026, 5, day + 2))
+
+    client = client_for(manager)
+    url = (
+        "/api/v1.0/LeaveDetails/TeamAvailability"
+        f"?reportingOfficerId={manager.employeeId}&fromDate=2026-05-01&toDate=2026-05-31"
+    )
+
+    # The caller lookup plus one range query for the whole window
+    with query_budget(2):
+        response = client.get(url)
+    assert response.status_code == 200
+    days = response.json()["data"]
+    assert len(days) == 31
+    assert [d["pending"] for d in days[3:11]] == [1, 2, 3, 3, 3, 2, 1, 0]
+
+    assert client.get(url.replace("reportingOfficerId", "department")).status_code == 403
+    assert client.get(url + "&department=x").status_code == 400
+
+
+def test_repeated_statement_shapes_are_flagged(db, make_employee):
+    ids = [make_employee().employeeId for _ in range(5)]
+    with query_budget(10) as stats:
+        # N+1: one lookup per id instead of one IN query
+        for employee_id in ids:
+            db.scalar(select(Employee).where(Employee.employeeId == employee_id))
+        db.scalars(select(Employee).where(Employee.employeeId.in_(ids))).all()
+    assert stats.count == 6
+    (repeated,) = stats.repeated(threshold=3)
+    assert repeated["count"] == 5
+    assert statement_shape("id IN (?, ?,\n ?)") == "id IN (?)"